@@ -0,0 +1,91 @@
+"""
+This module contains code used for benchmarking the conversion of the data
+of a run, as loaded by ``get_parameter_data``, to pandas and xarray objects.
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from qcodes.dataset.data_conversion import (parameter_data_to_dataframes,
+                                            parameter_data_to_xarray_dataset)
+
+
+class ConvertingParameterData:
+    """
+    This benchmark measures how much time and memory it takes to convert the
+    data of a run to pandas DataFrames and to an xarray Dataset. Besides the
+    peak memory of the process, the memory that is allocated by the
+    conversion itself is tracked. Parametrization is used to alter the shape
+    of the data and the order in which the grid of setpoints was measured.
+    """
+
+    params = [
+        {'nx': 1000, 'ny': 1000, 'array_length': 1, 'order': 'sweep'},
+        {'nx': 1000, 'ny': 1000, 'array_length': 1, 'order': 'shuffled'},
+        {'nx': 10000, 'ny': 1, 'array_length': 100, 'order': 'sweep'},
+    ]
+
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.datadict = None
+
+    def setup(self, bench_param):
+        nx, ny = bench_param['nx'], bench_param['ny']
+        array_length = bench_param['array_length']
+        rng = np.random.default_rng(0)
+        x, y, a = np.meshgrid(np.arange(nx, dtype=float),
+                              np.linspace(-1, 1, ny),
+                              np.arange(array_length, dtype=float),
+                              indexing='ij')
+        z = rng.random(x.shape)
+        if bench_param['order'] == 'shuffled':
+            order = rng.permutation(nx * ny)
+            x, y, z = (values.reshape(nx * ny, array_length)[order]
+                       for values in (x, y, z))
+
+        if array_length == 1:
+            subdict = {'z': z.ravel(), 'x': x.ravel(), 'y': y.ravel()}
+        else:
+            # an 'array' parameter with array setpoints measured as a
+            # function of a numeric setpoint, as loaded from the database
+            shape = (nx * ny, array_length)
+            subdict = {'z': z.reshape(shape), 'x': x.reshape(shape),
+                       'a': a.reshape(shape)}
+        self.datadict = {'z': subdict}
+
+    def teardown(self, bench_param):
+        self.datadict = None
+
+    def time_to_dataframes(self, bench_param):
+        parameter_data_to_dataframes(self.datadict)
+
+    def peakmem_to_dataframes(self, bench_param):
+        parameter_data_to_dataframes(self.datadict)
+
+    def track_allocated_to_dataframes(self, bench_param):
+        """Memory allocated while converting to DataFrames"""
+        return self._allocated(parameter_data_to_dataframes)
+
+    track_allocated_to_dataframes.unit = 'bytes'
+
+    def time_to_xarray_dataset(self, bench_param):
+        parameter_data_to_xarray_dataset(self.datadict)
+
+    def peakmem_to_xarray_dataset(self, bench_param):
+        parameter_data_to_xarray_dataset(self.datadict)
+
+    def track_allocated_to_xarray_dataset(self, bench_param):
+        """Memory allocated while converting to an xarray Dataset"""
+        return self._allocated(parameter_data_to_xarray_dataset)
+
+    track_allocated_to_xarray_dataset.unit = 'bytes'
+
+    def _allocated(self, convert):
+        tracemalloc.start()
+        try:
+            convert(self.datadict)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,77 @@
+"""
+This module contains code used for benchmarking the inference of the grid
+that 2D data lie on, which is done before the data are plotted.
+"""
+import time
+
+import numpy as np
+
+from qcodes.dataset.data_export import infer_2D_grid, reshape_2D_data
+
+
+class GridInference:
+    """
+    This benchmark measures how much time it takes to classify 2D data and
+    put them on their grid. Parametrization is used to alter the shape of
+    the grid and how completely and in which order it is filled.
+    """
+
+    params = [
+        {'nx': 200, 'ny': 200, 'layout': 'full'},
+        {'nx': 2000, 'ny': 2000, 'layout': 'full'},
+        {'nx': 2000, 'ny': 2000, 'layout': 'interrupted'},
+        {'nx': 2000, 'ny': 2000, 'layout': 'shuffled'},
+        {'nx': 1000, 'ny': 1000, 'layout': 'holes'},
+        {'nx': 100000, 'ny': 40, 'layout': 'full'},
+    ]
+
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.x = None
+        self.y = None
+        self.z = None
+
+    def setup(self, bench_param):
+        nx, ny = bench_param['nx'], bench_param['ny']
+        rng = np.random.default_rng(0)
+        # steps that are not multiples of each other, such that only the
+        # grid checks can classify the data
+        xs = np.cumsum(rng.choice([1.0, 1.7], nx))
+        ys = np.linspace(-1, 1, ny)
+        x, y = (a.ravel() for a in np.meshgrid(xs, ys))
+
+        layout = bench_param['layout']
+        if layout == 'interrupted':
+            stop = nx * ny - nx // 3
+            x, y = x[:stop], y[:stop]
+        elif layout == 'shuffled':
+            order = rng.permutation(len(x))
+            x, y = x[order], y[order]
+        elif layout == 'holes':
+            keep = rng.random(len(x)) > 0.1
+            x, y = x[keep], y[keep]
+
+        self.x, self.y = x, y
+        self.z = rng.random(len(x))
+
+    def teardown(self, bench_param):
+        self.x = None
+        self.y = None
+        self.z = None
+
+    def time_infer_2D_grid(self, bench_param):
+        infer_2D_grid(self.x, self.y)
+
+    def time_infer_and_reshape(self, bench_param):
+        grid = infer_2D_grid(self.x, self.y)
+        reshape_2D_data(self.x, self.y, self.z, grid)
+
+    def track_points_per_second(self, bench_param):
+        """Number of data points classified and reshaped per second"""
+        t_start = time.perf_counter()
+        self.time_infer_and_reshape(bench_param)
+        t_stop = time.perf_counter()
+        return len(self.x) / (t_stop - t_start)
+
+    track_points_per_second.unit = 'points/s'
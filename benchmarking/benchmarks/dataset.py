@@ -1,6 +1,6 @@
 """
-This module contains code used for benchmarking data saving speed of the
-database used under the QCoDeS dataset.
+This module contains code used for benchmarking data saving and loading
+speed of the database used under the QCoDeS dataset.
 """
 import shutil
 import tempfile
@@ -11,9 +11,14 @@ import numpy as np
 
 import qcodes
 from qcodes import ManualParameter
+from qcodes.dataset.data_set import load_by_id, load_many, new_data_set
+from qcodes.dataset.database_extract_runs import extract_runs_into_db
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.measurements import Measurement
 from qcodes.dataset.experiment_container import new_experiment
-from qcodes.dataset.sqlite.database import initialise_database
+from qcodes.dataset.sqlite.database import (close_pooled_connections,
+                                            initialise_database)
 
 
 class Adding5Params:
@@ -129,3 +134,381 @@ class Adding5Params:
         # force writing to database so that it is written before we exit
         # the datasaver context manager
         self.datasaver.flush_data_to_database()
+
+    def track_points_per_second(self, bench_param):
+        """Number of points per parameter written per second"""
+        t_start = time.perf_counter()
+        self.time_test(bench_param)
+        t_stop = time.perf_counter()
+        n_points = bench_param['n_values'] * bench_param['n_times']
+        return n_points / (t_stop - t_start)
+
+    track_points_per_second.unit = 'points/s'
+
+
+class LoadingParameterData:
+    """
+    This benchmark measures how much time and memory it takes to load the
+    data of a run from the experiment database with ``get_parameter_data``,
+    and to iterate over it in chunks with ``iter_parameter_data``.
+    Parametrization is used to alter the amount and type of the data.
+    """
+
+    params = [
+        {'n_rows': 1000000, 'array_length': 1, 'paramtype': 'numeric'},
+        {'n_rows': 10000, 'array_length': 100, 'paramtype': 'array'},
+        {'n_rows': 10000, 'array_length': 100, 'paramtype': 'mixed'},
+    ]
+
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, bench_param):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        new_experiment("test-experiment", sample_name="test-sample")
+
+        paramtype = bench_param['paramtype']
+        setpoint_type = 'numeric' if paramtype == 'mixed' else paramtype
+        data_type = 'array' if paramtype == 'mixed' else paramtype
+        x = ParamSpecBase('x', setpoint_type)
+        y = ParamSpecBase('y', data_type)
+        self.dataset = new_data_set('load-benchmark')
+        self.dataset.set_interdependencies(
+            InterDependencies_(dependencies={y: (x,)}))
+        self.dataset.mark_started()
+
+        n_rows = bench_param['n_rows']
+        shape = (n_rows, bench_param['array_length'])
+        if paramtype == 'numeric':
+            columns = {'x': np.random.rand(n_rows),
+                       'y': np.random.rand(n_rows)}
+        elif paramtype == 'array':
+            columns = {'x': list(np.random.rand(*shape)),
+                       'y': list(np.random.rand(*shape))}
+        else:
+            columns = {'x': np.random.rand(n_rows),
+                       'y': list(np.random.rand(*shape))}
+        self.dataset.add_results_from_columns([columns])
+        self.dataset.mark_completed()
+
+    def teardown(self, bench_param):
+        if self.dataset:
+            self.dataset.conn.close()
+            self.dataset = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_get_parameter_data(self, bench_param):
+        self.dataset.get_parameter_data()
+
+    def peakmem_get_parameter_data(self, bench_param):
+        self.dataset.get_parameter_data()
+
+    def time_iter_parameter_data(self, bench_param):
+        for _ in self.dataset.iter_parameter_data():
+            pass
+
+    def peakmem_iter_parameter_data(self, bench_param):
+        for _ in self.dataset.iter_parameter_data():
+            pass
+
+
+class SmallFrequentFlushes:
+    """
+    This benchmark measures the overhead of flushing data to the experiment
+    database when only a few results are written per flush, as happens for
+    a very short write period. Parametrization is used to alter the number
+    of results per flush.
+    """
+
+    number = 1
+    repeat = 8
+
+    params = [
+        {'n_rows': 1, 'n_flushes': 2000},
+        {'n_rows': 10, 'n_flushes': 2000},
+        {'n_rows': 100, 'n_flushes': 200},
+    ]
+
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.parameters = list()
+        self.experiment = None
+        self.runner = None
+        self.datasaver = None
+        self.tmpdir = None
+
+    def setup(self, bench_param):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        # the shortest possible write period
+        meas.write_period = 1e-3
+
+        x = ManualParameter('x')
+        y1 = ManualParameter('y1')
+        y2 = ManualParameter('y2')
+        meas.register_parameter(x)
+        meas.register_parameter(y1, setpoints=[x])
+        meas.register_parameter(y2, setpoints=[x])
+        self.parameters = [x, y1, y2]
+
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+
+    def teardown(self, bench_param):
+        if self.runner:
+            self.runner.__exit__(None, None, None)
+            self.runner = None
+            self.datasaver = None
+
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.parameters = list()
+
+    def time_flushes(self, bench_param):
+        """Flushing a few results for 3 parameters at a time"""
+        x, y1, y2 = self.parameters
+        for i in range(bench_param['n_flushes']):
+            for j in range(bench_param['n_rows']):
+                self.datasaver.add_result((x, j), (y1, i), (y2, 2 * j))
+            self.datasaver.flush_data_to_database()
+
+    def track_flushes_per_second(self, bench_param):
+        """Number of flushes to the database per second"""
+        t_start = time.perf_counter()
+        self.time_flushes(bench_param)
+        t_stop = time.perf_counter()
+        return bench_param['n_flushes'] / (t_stop - t_start)
+
+    track_flushes_per_second.unit = 'flushes/s'
+
+
+class ExtractRuns:
+    """
+    This benchmark measures how much time it takes to copy runs from one
+    experiment database into another with ``extract_runs_into_db``.
+    Parametrization is used to alter the number and size of the runs.
+    """
+
+    # every extraction needs a new target database, hence the number of
+    # iterations is limited to 1
+    number = 1
+    repeat = 8
+
+    params = [
+        {'n_runs': 1, 'n_rows': 100000, 'paramtype': 'numeric'},
+        {'n_runs': 100, 'n_rows': 1000, 'paramtype': 'numeric'},
+        {'n_runs': 10, 'n_rows': 1000, 'paramtype': 'array'},
+    ]
+
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.run_ids = list()
+        self.tmpdir = None
+        self.source_path = None
+        self.target_path = None
+
+    def setup(self, bench_param):
+        self.tmpdir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.tmpdir, 'source.db')
+        self.target_path = os.path.join(self.tmpdir, 'target.db')
+        qcodes.config["core"]["db_location"] = self.source_path
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        experiment = new_experiment("test-experiment",
+                                    sample_name="test-sample")
+
+        paramtype = bench_param['paramtype']
+        x = ParamSpecBase('x', paramtype)
+        y = ParamSpecBase('y', paramtype)
+        n_rows = bench_param['n_rows']
+        if paramtype == 'numeric':
+            columns = {'x': np.arange(n_rows), 'y': np.random.rand(n_rows)}
+        else:
+            columns = {'x': list(np.random.rand(n_rows, 10)),
+                       'y': list(np.random.rand(n_rows, 10))}
+
+        for _ in range(bench_param['n_runs']):
+            dataset = new_data_set('extract-benchmark')
+            dataset.set_interdependencies(
+                InterDependencies_(dependencies={y: (x,)}))
+            dataset.mark_started()
+            dataset.add_results_from_columns([columns])
+            dataset.mark_completed()
+            self.run_ids.append(dataset.run_id)
+        experiment.conn.close()
+
+    def teardown(self, bench_param):
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.run_ids = list()
+
+    def time_extract_runs_into_db(self, bench_param):
+        extract_runs_into_db(self.source_path, self.target_path,
+                             *self.run_ids)
+
+    def track_rows_per_second(self, bench_param):
+        """Number of rows of results copied per second"""
+        t_start = time.perf_counter()
+        self.time_extract_runs_into_db(bench_param)
+        t_stop = time.perf_counter()
+        n_rows = bench_param['n_runs'] * bench_param['n_rows']
+        return n_rows / (t_stop - t_start)
+
+    track_rows_per_second.unit = 'rows/s'
+
+
+class PollingGrowingRun:
+    """
+    This benchmark measures how much time it takes to poll the data of a
+    run that is being measured, as live plotting does, by loading all of
+    the data with ``get_parameter_data`` or only the new results through
+    ``DataSet.cache``. Parametrization is used to alter the number of
+    results that are already in the run and that are added per poll.
+    """
+
+    params = [
+        {'n_rows': 10000, 'n_new_rows': 100},
+        {'n_rows': 100000, 'n_new_rows': 100},
+        {'n_rows': 100000, 'n_new_rows': 10000},
+    ]
+
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.dataset = None
+        self.new_columns = None
+        self.tmpdir = None
+
+    def setup(self, bench_param):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        new_experiment("test-experiment", sample_name="test-sample")
+
+        x = ParamSpecBase('x', 'numeric')
+        y = ParamSpecBase('y', 'numeric')
+        self.dataset = new_data_set('poll-benchmark')
+        self.dataset.set_interdependencies(
+            InterDependencies_(dependencies={y: (x,)}))
+        self.dataset.mark_started()
+
+        n_rows = bench_param['n_rows']
+        self.dataset.add_results_from_columns(
+            [{'x': np.arange(n_rows), 'y': np.random.rand(n_rows)}])
+        self.dataset.cache.data()
+
+        n_new_rows = bench_param['n_new_rows']
+        self.new_columns = {'x': np.arange(n_new_rows),
+                            'y': np.random.rand(n_new_rows)}
+
+    def teardown(self, bench_param):
+        if self.dataset:
+            self.dataset.conn.close()
+            self.dataset = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_poll_get_parameter_data(self, bench_param):
+        self.dataset.add_results_from_columns([self.new_columns])
+        self.dataset.get_parameter_data()
+
+    def time_poll_cache(self, bench_param):
+        self.dataset.add_results_from_columns([self.new_columns])
+        self.dataset.cache.data()
+
+
+class LoadingManyRuns:
+    """
+    This benchmark measures how much time it takes to load the data of many
+    runs one after the other with ``load_by_id`` and concurrently with
+    ``load_many``. Parametrization is used to alter the number of runs, the
+    number of workers and whether the workers are threads or processes.
+    """
+
+    params = [
+        {'n_runs': 16, 'workers': 4, 'use_processes': False},
+        {'n_runs': 16, 'workers': 4, 'use_processes': True},
+        {'n_runs': 64, 'workers': 8, 'use_processes': False},
+    ]
+
+    timer = time.perf_counter
+
+    n_rows = 10000
+
+    def __init__(self):
+        self.run_ids = None
+        self.tmpdir = None
+
+    def setup(self, bench_param):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        new_experiment("test-experiment", sample_name="test-sample")
+
+        x = ParamSpecBase('x', 'numeric')
+        y = ParamSpecBase('y', 'numeric')
+        self.run_ids = []
+        for _ in range(bench_param['n_runs']):
+            dataset = new_data_set('load-benchmark')
+            dataset.set_interdependencies(
+                InterDependencies_(dependencies={y: (x,)}))
+            dataset.mark_started()
+            dataset.add_results_from_columns(
+                [{'x': np.arange(self.n_rows),
+                  'y': np.random.rand(self.n_rows)}])
+            dataset.mark_completed()
+            dataset.conn.close()
+            self.run_ids.append(dataset.run_id)
+
+    def teardown(self, bench_param):
+        close_pooled_connections()
+        self.run_ids = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_load_by_id(self, bench_param):
+        for run_id in self.run_ids:
+            dataset = load_by_id(run_id)
+            dataset.get_parameter_data()
+            dataset.conn.close()
+
+    def time_load_many(self, bench_param):
+        for _ in load_many(self.run_ids, workers=bench_param['workers'],
+                           use_processes=bench_param['use_processes']):
+            pass
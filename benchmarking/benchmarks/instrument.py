@@ -0,0 +1,56 @@
+"""
+This module contains code used for benchmarking the communication with
+instruments.
+"""
+import time
+
+import qcodes.instrument.sims as sims
+from qcodes.instrument.visa import VisaInstrument
+
+
+class PipelinedQueries:
+    """
+    This benchmark measures how many queries per second are asked to a
+    simulated VISA instrument with ``ask_many``, one by one and pipelined.
+    Parametrization is used to alter the number of queries that are
+    pipelined. The simulated instrument responds without delay, so this
+    measures the overhead of QCoDeS and PyVISA; on a real instrument,
+    pipelining also saves the round trip of all but one query per batch.
+    """
+
+    params = [
+        {'max_pipelined_queries': 1},
+        {'max_pipelined_queries': 10},
+        {'max_pipelined_queries': 100},
+    ]
+
+    timer = time.perf_counter
+
+    n_queries = 1000
+
+    def __init__(self):
+        self.instrument = None
+
+    def setup(self, bench_param):
+        visalib = sims.__file__.replace('__init__.py', 'dummy.yaml@sim')
+        self.instrument = VisaInstrument('sim_visa', address='GPIB::8::INSTR',
+                                         visalib=visalib, terminator='\n',
+                                         device_clear=False)
+        self.instrument.max_pipelined_queries = \
+            bench_param['max_pipelined_queries']
+
+    def teardown(self, bench_param):
+        if self.instrument is not None:
+            self.instrument.close()
+            self.instrument = None
+
+    def time_ask_many(self, bench_param):
+        self.instrument.ask_many(['FREQ?'] * self.n_queries)
+
+    def track_queries_per_second(self, bench_param):
+        """Number of queries asked per second"""
+        start = time.perf_counter()
+        self.instrument.ask_many(['FREQ?'] * self.n_queries)
+        return self.n_queries / (time.perf_counter() - start)
+
+    track_queries_per_second.unit = 'queries/s'
@@ -78,7 +78,8 @@ from qcodes.utils.zmq_helpers import Publisher
 from qcodes.instrument_drivers.test import test_instruments, test_instrument
 
 from qcodes.dataset.measurements import Measurement
-from qcodes.dataset.data_set import new_data_set, load_by_counter, load_by_id, load_by_run_spec, load_by_guid
+from qcodes.dataset.data_set import new_data_set, load_by_counter, load_by_id, load_by_run_spec, load_by_guid, load_many
+from qcodes.dataset.export import load_from_export
 from qcodes.dataset.experiment_container import new_experiment, load_experiment, load_experiment_by_name, \
     load_last_experiment, experiments, load_or_create_experiment
 from qcodes.dataset.sqlite.settings import SQLiteSettings
@@ -0,0 +1,287 @@
+"""
+This module contains the conversion of the data of runs, in the format that
+:meth:`.DataSet.get_parameter_data` returns, to :py:mod:`pandas` and
+:py:mod:`xarray` objects, and the inference of the grids that setpoints
+lie on that these conversions are based on.
+
+The arrays of the data are passed on to pandas and xarray as they are
+wherever possible, i.e. the data are not copied unless they have to be
+rearranged onto a grid.
+"""
+from typing import (Any, Dict, List, Mapping, Optional, Sequence, Tuple,
+                    TYPE_CHECKING)
+
+import numpy as np
+
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import xarray as xr
+
+
+# the minimal fraction of the cells of a grid that have to hold a point for
+# setpoints with holes in arbitrary places to be put on the grid
+_MIN_GRID_FILL_FRACTION = 0.5
+
+
+def _distinct_values(points: np.ndarray
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The sorted distinct values of the points, the index of each point in
+    those, and the number of times each distinct value occurs
+    """
+    strided = _distinct_values_of_sweep(points)
+    if strided is not None:
+        return strided
+    row, index, counts = np.unique(points, return_inverse=True,
+                                   return_counts=True)
+    return row, index.reshape(-1), counts
+
+
+def _distinct_values_of_sweep(points: np.ndarray
+                              ) -> Optional[Tuple[np.ndarray, np.ndarray,
+                                                  np.ndarray]]:
+    """
+    Find the distinct values of setpoints that were swept over in order,
+    without sorting all of them. The setpoints of an inner sweep repeat
+    with a fixed stride, and the setpoints of an outer sweep are constant
+    over long runs, so in both cases only the values of one period or of
+    one point per run have to be sorted. Returns None if the setpoints are
+    neither periodic nor made of long runs.
+    """
+    npoints = len(points)
+    if npoints < 4:
+        return None
+
+    # the stride of an inner sweep is the distance to the first repetition
+    # of the first setpoint
+    repetitions = np.flatnonzero(points[1:npoints // 2 + 1] == points[0])
+    if len(repetitions):
+        stride = repetitions[0] + 1
+        if np.array_equal(points[stride:], points[:-stride]):
+            row, period_index = np.unique(points[:stride],
+                                          return_inverse=True)
+            index = np.resize(period_index.reshape(-1), npoints)
+            counts = np.bincount(index, minlength=len(row))
+            return row, index, counts
+
+    starts = np.flatnonzero(points[1:] != points[:-1]) + 1
+    if len(starts) + 1 > npoints // 2:
+        return None
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.append(starts, npoints))
+    row, run_index = np.unique(points[starts], return_inverse=True)
+    run_index = run_index.reshape(-1)
+    index = np.repeat(run_index, lengths)
+    counts = np.bincount(run_index, weights=lengths,
+                         minlength=len(row)).astype(np.int64)
+    return row, index, counts
+
+
+def _has_nan(values: np.ndarray) -> bool:
+    return values.dtype.kind in 'fc' and bool(np.isnan(values).any())
+
+
+def infer_grid(setpoints: Sequence[np.ndarray],
+               allow_holes: bool = True
+               ) -> Optional[Tuple[List[np.ndarray], np.ndarray]]:
+    """
+    Infer the grid that points lie on from the values of their setpoints,
+    i.e. the sorted distinct values of each of the setpoints, which span
+    the grid, and the (C order) flat index of the cell of each point in the
+    grid.
+
+    Args:
+        setpoints: the values of each of the setpoints of the points, as
+            1D arrays of the same length
+        allow_holes: whether the points may leave cells of the grid empty,
+            as long as they fill at least half of it. If False, every cell
+            must hold a point.
+
+    Returns:
+        The distinct values of each of the setpoints and the flat index of
+        each point, or None if the points do not lie on a grid, i.e. if
+        several points are in the same cell, if too many cells are empty
+        or if any of the setpoints is NaN.
+    """
+    import pandas as pd
+    npoints = len(setpoints[0])
+    if npoints == 0:
+        return None
+    rows = []
+    indices = []
+    for points in setpoints:
+        distinct = _distinct_values_of_sweep(points)
+        if distinct is not None:
+            row, index, _ = distinct
+            if _has_nan(row):
+                return None
+        else:
+            # hashing is faster than sorting all the points
+            index, row = pd.factorize(points, sort=True)
+            if (index < 0).any():
+                # NaN
+                return None
+        rows.append(row)
+        indices.append(index)
+
+    shape = tuple(len(row) for row in rows)
+    ncells = int(np.prod(shape, dtype=np.float64))
+    if ncells < npoints:
+        return None
+    if ncells > npoints and (
+            not allow_holes or npoints < _MIN_GRID_FILL_FRACTION * ncells):
+        return None
+
+    flat_index = np.ravel_multi_index(indices, shape)
+    occupied = np.zeros(ncells, dtype=bool)
+    occupied[flat_index] = True
+    if np.count_nonzero(occupied) != npoints:
+        return None
+    return rows, flat_index
+
+
+def _flatten(values: np.ndarray) -> np.ndarray:
+    """
+    Flatten the values of a parameter into a 1D array; without copying them,
+    unless they are arrays of different lengths
+    """
+    if values.dtype == np.dtype('O') and len(values) and \
+            isinstance(values[0], np.ndarray):
+        # ravel will not fully unpack a numpy array of arrays of "object"
+        # dtype, which is what variable length arrays are loaded as
+        return np.concatenate(values)
+    return values.reshape(-1)
+
+
+def _to_pandas_index(setpoints: Sequence[np.ndarray],
+                     names: Sequence[str]) -> 'pd.Index':
+    """
+    Make the index of a :py:class:`pandas.DataFrame` from the values of the
+    setpoints. If the setpoints were swept over in order, the levels and
+    codes of the :py:class:`pandas.MultiIndex` are found from the periods
+    and runs of the sweeps rather than by hashing every point.
+    """
+    import pandas as pd
+    if len(names) == 1:
+        return pd.Index(setpoints[0], name=names[0])
+
+    levels = []
+    codes = []
+    for points in setpoints:
+        distinct = _distinct_values_of_sweep(points)
+        if distinct is None or _has_nan(distinct[0]):
+            return pd.MultiIndex.from_arrays(setpoints, names=names)
+        levels.append(distinct[0])
+        codes.append(distinct[1])
+    return pd.MultiIndex(levels=levels, codes=codes, names=names,
+                         verify_integrity=False)
+
+
+def parameter_data_to_dataframes(
+        datadict: Mapping[str, Mapping[str, np.ndarray]]
+) -> Dict[str, 'pd.DataFrame']:
+    """
+    Convert the output of :meth:`.DataSet.get_parameter_data` to a dict of
+    :py:class:`pandas.DataFrame` s, see
+    :meth:`.DataSet.get_data_as_pandas_dataframe`.
+    """
+    import pandas as pd
+    dfs = {}
+    for name, subdict in datadict.items():
+        keys = list(subdict.keys())
+        if len(keys) == 0:
+            dfs[name] = pd.DataFrame()
+            continue
+        index = None
+        if len(keys) > 1:
+            index = _to_pandas_index([_flatten(subdict[key])
+                                      for key in keys[1:]], keys[1:])
+        dfs[name] = pd.DataFrame({keys[0]: _flatten(subdict[keys[0]])},
+                                 index=index, copy=False)
+    return dfs
+
+
+def _on_grid(values: np.ndarray,
+             shape: Tuple[int, ...],
+             flat_index: np.ndarray) -> np.ndarray:
+    """
+    Put values onto a grid of the given shape, leaving empty cells NaN. If
+    the values fill the grid in order, they are reshaped without a copy.
+    """
+    npoints = len(values)
+    if npoints == int(np.prod(shape)) and flat_index[0] == 0 and \
+            bool((flat_index[1:] - flat_index[:-1] == 1).all()):
+        return values.reshape(shape)
+    if values.dtype.kind in 'fc':
+        dtype = values.dtype
+        fill_value: Any = np.nan
+    elif values.dtype.kind in 'iub':
+        dtype = np.dtype(np.float64)
+        fill_value = np.nan
+    else:
+        dtype = np.dtype('O')
+        fill_value = None
+    grid = np.full(int(np.prod(shape)), fill_value, dtype=dtype)
+    grid[flat_index] = values
+    return grid.reshape(shape)
+
+
+def _attributes(paramspec: Optional[ParamSpecBase]) -> Dict[str, str]:
+    if paramspec is None:
+        return {}
+    return {'long_name': paramspec.label, 'units': paramspec.unit}
+
+
+def parameter_data_to_xarray_dataset(
+        datadict: Mapping[str, Mapping[str, np.ndarray]],
+        paramspecs: Optional[Mapping[str, ParamSpecBase]] = None
+) -> 'xr.Dataset':
+    """
+    Convert the output of :meth:`.DataSet.get_parameter_data` to an
+    :py:class:`xarray.Dataset`, see
+    :meth:`.DataSet.get_data_as_xarray_dataset`.
+
+    Args:
+        datadict: the data to convert
+        paramspecs: the paramspecs of the parameters by name, whose labels
+            and units are stored as the 'long_name' and 'units' attributes
+            of the variables
+
+    Returns:
+        A dataset with a data variable for each of the top level parameters
+        of the ``datadict``. If the setpoints of a parameter lie on a grid,
+        the setpoints are the dimensions of the variable; otherwise the
+        variable has a single dimension named ``<parameter>_index`` along
+        which the setpoints are coordinates. Parameters without any data
+        are left out.
+    """
+    import xarray as xr
+    paramspecs = paramspecs or {}
+
+    data_arrays = {}
+    for name, subdict in datadict.items():
+        keys = list(subdict.keys())
+        if len(keys) == 0:
+            continue
+        values = _flatten(subdict[keys[0]])
+        setpoints = [_flatten(subdict[key]) for key in keys[1:]]
+        grid = infer_grid(setpoints) if setpoints else None
+        if grid is not None:
+            rows, flat_index = grid
+            shape = tuple(len(row) for row in rows)
+            coords = {key: (key, row, _attributes(paramspecs.get(key)))
+                      for key, row in zip(keys[1:], rows)}
+            data_array = xr.DataArray(_on_grid(values, shape, flat_index),
+                                      dims=keys[1:], coords=coords,
+                                      name=name)
+        else:
+            dim = f'{name}_index'
+            coords = {key: (dim, points, _attributes(paramspecs.get(key)))
+                      for key, points in zip(keys[1:], setpoints)}
+            data_array = xr.DataArray(values, dims=(dim,), coords=coords,
+                                      name=name)
+        data_array.attrs.update(_attributes(paramspecs.get(name)))
+        data_arrays[name] = data_array
+    return xr.Dataset(data_arrays)
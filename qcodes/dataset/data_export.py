@@ -1,12 +1,18 @@
-from typing import List, Any, Sequence, Tuple, Dict, Union
+from typing import (List, Any, Sequence, Tuple, Dict, Union, Iterator,
+                    Optional, NamedTuple)
 import logging
 
 import numpy as np
 
+from qcodes.dataset.data_conversion import (_distinct_values,
+                                            _MIN_GRID_FILL_FRACTION)
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.sqlite.queries import (get_dependencies, get_dependents,
-                                           get_layout)
-from qcodes.dataset.data_set import load_by_id
+                                           get_layout, get_column_range,
+                                           get_distinct_values,
+                                           get_binned_extrema,
+                                           get_binned_means, BinSpec)
+from qcodes.dataset.data_set import load_by_id, DataSet
 
 log = logging.getLogger(__name__)
 
@@ -109,73 +115,330 @@ def get_data_by_id(run_id: int) -> List:
     return output
 
 
-def _all_steps_multiples_of_min_step(rows: Sequence[np.ndarray]) -> bool:
+# number of results per parameter read from the database at a time when
+# decimating data that the database cannot aggregate; bounds the memory used
+# to decimate a run of any size
+_DECIMATION_CHUNK_ROWS = 100000
+
+
+def get_decimated_data(dataset: DataSet,
+                       resolution: Union[int, Tuple[int, int]]) -> List:
     """
-    Are all steps integer multiples of the smallest step?
-    This is used in determining whether the setpoints correspond
-    to a regular grid
+    Load the data of a dataset reduced to a given resolution, in the same
+    format as :func:`get_data_by_id`. The data are decimated while they are
+    loaded, such that runs that are too large to be loaded (or plotted) at
+    once can be displayed.
+
+    The data of dependent parameters with one setpoint are reduced to the
+    minimum and the maximum of the dependent parameter within each of
+    ``resolution[0]`` equally wide bins along the setpoint axis, such that
+    a line plot of the decimated data has the same envelope as the full
+    data. The data of dependent parameters with two setpoints are averaged
+    within each cell of a grid of ``resolution[0]`` by ``resolution[1]``
+    cells. Along an axis with no more distinct setpoint values than bins,
+    every distinct value is a bin of its own.
+
+    Numeric parameters are aggregated by the database, array parameters
+    are read and decimated in chunks. Data that already fit the resolution,
+    data of non-numeric parameters, and data with more than two setpoints
+    are returned as they are.
 
     Args:
-        rows: the output of _rows_from_datapoints
+        dataset: The dataset to load the data of
+        resolution: The number of pixels (bins) along the x-axis and along
+            the y-axis. An integer is used for both axes.
 
     Returns:
-        The answer to the question
+        a list of lists of dictionaries as described in
+        :func:`get_data_by_id`
     """
+    if isinstance(resolution, int):
+        resolution = (resolution, resolution)
+    if len(resolution) != 2 or min(resolution) < 1:
+        raise ValueError(f'Invalid resolution {resolution}, the resolution '
+                         f'must be a positive integer or a pair of positive '
+                         f'integers.')
 
-    steps: List[np.ndarray] = []
-    for row in rows:
-        # TODO: What is an appropriate precision?
-        steps += list(np.unique(np.diff(row).round(decimals=15)))
-
-    steps = np.unique((steps))
-    remainders = np.mod(steps[1:]/steps[0], 1)
+    output = []
 
-    # TODO: What are reasonable tolerances for allclose?
-    asmoms = bool(np.allclose(remainders, np.zeros_like(remainders)))
+    for dep in dataset.dependent_parameters:
+        setpoints = dataset.description.interdeps.dependencies[dep]
+        names = [ps.name for ps in setpoints] + [dep.name]
+        paramtypes = {ps.type for ps in (*setpoints, dep)}
 
-    return asmoms
+        data = None
+        if len(setpoints) in (1, 2) and paramtypes == {'numeric'}:
+            data = _decimate_in_database(dataset, names, resolution)
+        elif len(setpoints) in (1, 2) and paramtypes == {'array'}:
+            data = _decimate_in_chunks(dataset, names, resolution)
+        if data is None:
+            param_data = dataset.get_parameter_data(dep.name)[dep.name]
+            data = [param_data[name].flatten() for name in names]
 
+        data_dicts_list = []
+        for name, values in zip(names, data):
+            ps = dataset.paramspecs[name]
+            data_dicts_list.append({'name': name,
+                                    'data': values,
+                                    'unit': ps.unit,
+                                    'label': ps.label})
+        output.append(data_dicts_list)
 
-def _rows_from_datapoints(inputsetpoints: np.ndarray) -> np.ndarray:
-    """
-    Cast the (potentially) unordered setpoints into rows
-    of sorted, unique setpoint values. Because of the way they are ordered,
-    these rows do not necessarily correspond to actual rows of the scan,
-    but they can nonetheless be used to identify certain scan types
+    return output
 
-    Args:
-        setpoints: The raw setpoints as a one-dimensional array
 
-    Returns:
-        A ndarray of the rows
+class _AxisBins:
+    """
+    The bins that the values along one axis are decimated in. Each
+    distinct value is a bin of its own if there are no more distinct values
+    than bins, otherwise the bins are equally wide.
     """
 
-    rows = []
-    setpoints = inputsetpoints.copy()
+    def __init__(self, nbins: int) -> None:
+        self.nbins = nbins
+        self.min = np.inf
+        self.max = -np.inf
+        self.distinct: Optional[np.ndarray] = np.array([])
+
+    def update(self, values: np.ndarray) -> None:
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self.distinct is not None:
+            self.distinct = np.union1d(self.distinct, values)
+            if len(self.distinct) > self.nbins:
+                self.distinct = None
+
+    @property
+    def empty(self) -> bool:
+        return not self.max >= self.min
+
+    @property
+    def spec(self) -> BinSpec:
+        if self.distinct is not None:
+            return None
+        return self.min, self.max, self.nbins
+
+    @property
+    def centers(self) -> np.ndarray:
+        if self.distinct is not None:
+            return self.distinct
+        edges = np.linspace(self.min, self.max, self.nbins + 1)
+        return (edges[:-1] + edges[1:]) / 2
+
+    def index(self, values: np.ndarray) -> np.ndarray:
+        """
+        The bin index of each of the values; -1 for non-finite values.
+        """
+        if self.distinct is not None:
+            index = np.searchsorted(self.distinct, values)
+            index[index == len(self.distinct)] = 0
+        else:
+            scaled = (values - self.min) / (self.max - self.min) * self.nbins
+            with np.errstate(invalid='ignore'):
+                index = np.clip(scaled, 0, self.nbins - 1).astype(int)
+        index[~np.isfinite(values)] = -1
+        return index
+
+    def key_index(self, keys: np.ndarray) -> np.ndarray:
+        """
+        The bin index of each of the bin keys returned by the database
+        """
+        if self.distinct is not None:
+            return np.searchsorted(self.distinct, keys)
+        return keys.astype(int)
+
+
+def _decimate_in_database(dataset: DataSet,
+                          names: Sequence[str],
+                          resolution: Tuple[int, int]
+                          ) -> Optional[List[np.ndarray]]:
+    """
+    Decimate the data of a numeric dependent parameter with one or two
+    numeric setpoints by aggregating them in the database. Returns None if
+    the data already fit the resolution.
+    """
+    conn, table_name = dataset.conn, dataset.table_name
+    dep_name = names[-1]
+    axes = []
+    for name, nbins in zip(names[:-1], resolution):
+        npoints, low, high = get_column_range(conn, table_name, name,
+                                              dep_name)
+        if low is None or high is None:
+            return None
+        axis = _AxisBins(nbins)
+        axis.min, axis.max = low, high
+        distinct = get_distinct_values(conn, table_name, name, dep_name,
+                                       nbins + 1)
+        axis.distinct = distinct if len(distinct) <= nbins else None
+        axes.append(axis)
+
+    if len(axes) == 1:
+        if npoints <= 2 * resolution[0]:
+            return None
+        keys, x_at_min, ymin, x_at_max, ymax = get_binned_extrema(
+            conn, table_name, dep_name, names[0], axes[0].spec)
+        return _min_max_to_points(x_at_min, ymin, x_at_max, ymax)
+
+    xaxis, yaxis = axes
+    if npoints <= resolution[0] * resolution[1]:
+        return None
+    xkeys, ykeys, means = get_binned_means(
+        conn, table_name, dep_name, (names[0], names[1]),
+        (xaxis.spec, yaxis.spec))
+    return _means_to_grid(xaxis, yaxis, xaxis.key_index(xkeys),
+                          yaxis.key_index(ykeys), means)
+
+
+def _decimate_in_chunks(dataset: DataSet,
+                        names: Sequence[str],
+                        resolution: Tuple[int, int]
+                        ) -> Optional[List[np.ndarray]]:
+    """
+    Decimate the data of a dependent parameter with one or two setpoints
+    by reading them in chunks. The first pass over the data finds the bins,
+    the second one decimates. Returns None if the data already fit the
+    resolution or are not numeric.
+    """
+    dep_name = names[-1]
+
+    def chunks() -> Iterator[List[np.ndarray]]:
+        for chunk in dataset.iter_parameter_data(
+                dep_name, chunk_rows=_DECIMATION_CHUNK_ROWS):
+            yield [chunk[dep_name][name].flatten() for name in names]
+
+    axes = [_AxisBins(nbins) for nbins in resolution[:len(names) - 1]]
+    npoints = 0
+    for chunk in chunks():
+        if any(values.dtype.kind not in 'biuf' for values in chunk):
+            return None
+        npoints += len(chunk[-1])
+        for axis, values in zip(axes, chunk):
+            axis.update(values)
+    if any(axis.empty for axis in axes):
+        return None
+
+    if len(axes) == 1:
+        if npoints <= 2 * resolution[0]:
+            return None
+        return _min_max_decimate(chunks(), axes[0])
+
+    if npoints <= resolution[0] * resolution[1]:
+        return None
+    return _block_average(chunks(), axes[0], axes[1])
+
+
+def _min_max_decimate(chunks: Iterator[List[np.ndarray]],
+                      xaxis: _AxisBins) -> List[np.ndarray]:
+    nbins = len(xaxis.centers)
+    ymin = np.full(nbins, np.inf)
+    ymax = np.full(nbins, -np.inf)
+    x_at_min = np.full(nbins, np.nan)
+    x_at_max = np.full(nbins, np.nan)
+
+    for x, y in chunks:
+        index = xaxis.index(x)
+        keep = (index >= 0) & np.isfinite(y)
+        x, y, index = x[keep], y[keep], index[keep]
+        if len(index) == 0:
+            continue
 
-    # first check if there is only one unique array in which case we can avoid the
-    # potentially slow loop below
-    temp, inds, count = np.unique(setpoints, return_index=True,
-                                  return_counts=True)
-    num_repeats_array = np.unique(count)
-    if len(num_repeats_array) == 1 and count.sum() == len(inputsetpoints):
-        return np.tile(temp, (num_repeats_array[0], 1))
+        # after sorting by bin and value the first point of each bin is the
+        # minimum of the bin and the last point is the maximum
+        order = np.lexsort((y, index))
+        x, y, index = x[order], y[order], index[order]
+        starts = np.flatnonzero(np.diff(index, prepend=-1))
+        ends = np.append(starts[1:], len(index)) - 1
+        bins = index[starts]
+
+        lower = y[starts] < ymin[bins]
+        ymin[bins[lower]] = y[starts][lower]
+        x_at_min[bins[lower]] = x[starts][lower]
+        higher = y[ends] > ymax[bins]
+        ymax[bins[higher]] = y[ends][higher]
+        x_at_max[bins[higher]] = x[ends][higher]
+
+    filled = np.isfinite(ymin)
+    return _min_max_to_points(x_at_min[filled], ymin[filled],
+                              x_at_max[filled], ymax[filled])
+
+
+def _min_max_to_points(x_at_min: np.ndarray, ymin: np.ndarray,
+                       x_at_max: np.ndarray, ymax: np.ndarray
+                       ) -> List[np.ndarray]:
+    x = np.stack((x_at_min, x_at_max), axis=1)
+    y = np.stack((ymin, ymax), axis=1)
+    # keep the minimum and the maximum of each bin in the order of x
+    order = np.argsort(x, axis=1, kind='stable')
+    x = np.take_along_axis(x, order, axis=1).ravel()
+    y = np.take_along_axis(y, order, axis=1).ravel()
+    return [x, y]
+
+
+def _block_average(chunks: Iterator[List[np.ndarray]],
+                   xaxis: _AxisBins,
+                   yaxis: _AxisBins) -> List[np.ndarray]:
+    ncells = len(xaxis.centers) * len(yaxis.centers)
+    sums = np.zeros(ncells)
+    counts = np.zeros(ncells)
+
+    for x, y, z in chunks:
+        xindex = xaxis.index(x)
+        yindex = yaxis.index(y)
+        keep = (xindex >= 0) & (yindex >= 0) & np.isfinite(z)
+        cells = yindex[keep] * len(xaxis.centers) + xindex[keep]
+        sums += np.bincount(cells, weights=z[keep], minlength=ncells)
+        counts += np.bincount(cells, minlength=ncells)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return _means_to_grid(xaxis, yaxis, None, None, means)
+
+
+def _means_to_grid(xaxis: _AxisBins,
+                   yaxis: _AxisBins,
+                   xindex: Optional[np.ndarray],
+                   yindex: Optional[np.ndarray],
+                   means: np.ndarray) -> List[np.ndarray]:
+    """
+    Return the flattened grid of the bin centers of both axes and the means
+    in its cells, which are NaN for cells without data. The means are
+    either given for all cells, or for the cells of the given indices.
+    """
+    x, y = np.meshgrid(xaxis.centers, yaxis.centers)
+    if xindex is None or yindex is None:
+        z = means
     else:
-        rows.append(temp)
-        setpoints = np.delete(setpoints, inds)
-
-    while len(setpoints) > 0:
-        temp, inds = np.unique(setpoints, return_index=True)
-        rows.append(temp)
-        setpoints = np.delete(setpoints, inds)
+        z = np.full(x.shape, np.nan)
+        z[yindex, xindex] = means
+    return [x.ravel(), y.ravel(), z.ravel()]
 
-    return np.array(rows)
 
-
-def _all_in_group_or_subgroup(rows: np.ndarray) -> bool:
+class Grid2D(NamedTuple):
+    """
+    The grid of distinct setpoint values that 2D data lie on, as inferred by
+    :func:`infer_2D_grid`, with the mapping of each data point onto the
+    grid.
     """
-    Detects whether the setpoints correspond to two groups of
-    of identical rows, one being contained in the other.
+    #: The plot type of the data, see :func:`datatype_from_setpoints_2d`
+    plottype: str
+    #: The sorted distinct values of the x setpoints
+    xrow: np.ndarray
+    #: The sorted distinct values of the y setpoints
+    yrow: np.ndarray
+    #: The index of the x setpoint of each data point in ``xrow``
+    x_index: np.ndarray
+    #: The index of the y setpoint of each data point in ``yrow``
+    y_index: np.ndarray
+
+
+def _all_in_group_or_subgroup(counts: np.ndarray) -> bool:
+    """
+    Detects whether the setpoints correspond to two groups of identical
+    rows, one being contained in the other, i.e. whether the distinct
+    values occur one of at most two numbers of times.
 
     This is the test for whether the setpoints correspond to a
     rectangular sweep. It allows for a single rectangular hole
@@ -183,39 +446,120 @@ def _all_in_group_or_subgroup(rows: np.ndarray) -> bool:
     Note that each axis needs NOT be equidistantly spaced.
 
     Args:
-        rows: The output from _rows_from_datapoints
+        counts: The number of times each distinct setpoint value occurs
 
     Returns:
         A boolean indicating whether the setpoints meet the
             criterion
     """
+    return len(np.unique(counts)) <= 2
 
-    groups = 1
-    comp_to = rows[0]
 
-    aigos = True
-    switchindex = 0
+def _all_steps_multiples_of_min_step(row: np.ndarray,
+                                     counts: np.ndarray) -> bool:
+    """
+    Are all steps integer multiples of the smallest step?
+    This is used in determining whether the setpoints correspond
+    to a regular grid
 
-    for rowind, row in enumerate(rows[1:]):
-        if np.array_equal(row, comp_to):
-            continue
-        else:
-            groups += 1
-            comp_to = row
-            switchindex = rowind
-            if groups > 2:
-                aigos = False
-                break
+    The steps are taken within each row of setpoints, where the k-th row
+    holds the distinct values that occur more than k times. Rows only
+    differ where k is one of the numbers of occurrences, so only those
+    rows are inspected.
+
+    Args:
+        row: The sorted distinct setpoint values
+        counts: The number of times each of the values occurs
 
-    # if there are two groups, check that the rows of one group
-    # are all contained in the rows of the other
-    if aigos and switchindex > 0:
-        for row in rows[1+switchindex:]:
-            if sum([r in rows[0] for r in row]) != len(row):
-                aigos = False
-                break
+    Returns:
+        The answer to the question
+    """
+    thresholds = np.unique(counts)[:-1]
+    rows = [row] + [row[counts > k] for k in thresholds]
+    # TODO: What is an appropriate precision?
+    steps = np.unique(np.concatenate(
+        [np.diff(r).round(decimals=15) for r in rows]))
 
-    return aigos
+    remainders = np.mod(steps[1:]/steps[0], 1)
+
+    # TODO: What are reasonable tolerances for allclose?
+    asmoms = bool(np.allclose(remainders, np.zeros_like(remainders)))
+
+    return asmoms
+
+
+def infer_2D_grid(xpoints: np.ndarray, ypoints: np.ndarray) -> Grid2D:
+    """
+    Infer the grid that 2D data lie on from their setpoints, and figure out
+    the plot type of the data (see :func:`datatype_from_setpoints_2d`).
+    The returned mapping of the data points onto the grid can be passed on
+    to :func:`reshape_2D_data` to put data on the grid without inferring it
+    again.
+
+    The data are on a (simple) grid if the distinct values of each setpoint
+    occur one of at most two numbers of times, and the number of distinct
+    values of each setpoint is the largest number of occurrences of the
+    other, which allows for a sweep that was interrupted. They are also
+    plotted on a grid if the steps between the setpoint values are
+    multiples of the smallest step (an equidistant grid), or if no point
+    of the grid holds more than one data point and at least half of the
+    points of the grid hold one.
+
+    Args:
+        xpoints: The x-axis values
+        ypoints: The y-axis values
+
+    Returns:
+        The inferred grid
+    """
+    xrow, x_index, x_counts = _distinct_values(xpoints)
+    yrow, y_index, y_counts = _distinct_values(ypoints)
+
+    def grid(plottype: str) -> Grid2D:
+        return Grid2D(plottype, xrow, yrow, x_index, y_index)
+
+    # We represent categorical data as integer-valued data
+    x_is_stringy = isinstance(xrow[0], str)
+    y_is_stringy = isinstance(yrow[0], str)
+    xvalues = np.arange(len(xrow)) if x_is_stringy else xrow
+    yvalues = np.arange(len(yrow)) if y_is_stringy else yrow
+
+    # First check whether all setpoints are identical along
+    # any dimension; comparing the distinct values suffices
+    x_all_the_same = np.allclose(xvalues, xvalues[x_index[0]])
+    y_all_the_same = np.allclose(yvalues, yvalues[y_index[0]])
+
+    if x_all_the_same or y_all_the_same:
+        return grid('2D_point')
+
+    # Now check if this is a simple rectangular sweep,
+    # possibly interrupted in the middle of one row
+
+    x_check = _all_in_group_or_subgroup(x_counts)
+    y_check = _all_in_group_or_subgroup(y_counts)
+
+    x_check = x_check and (len(xrow) == y_counts.max())
+    y_check = y_check and (len(yrow) == x_counts.max())
+
+    # this is the check that we are on a "simple" grid
+    if y_check and x_check:
+        return grid('2D_grid')
+
+    x_check = _all_steps_multiples_of_min_step(xvalues, x_counts)
+    y_check = _all_steps_multiples_of_min_step(yvalues, y_counts)
+
+    # this is the check that we are on an equidistant grid
+    if y_check and x_check:
+        return grid('2D_equidistant')
+
+    # finally check for a grid with holes in arbitrary places
+    ncells = len(xrow) * len(yrow)
+    if len(x_index) >= _MIN_GRID_FILL_FRACTION * ncells:
+        cells = y_index.astype(np.int64) * len(xrow) + x_index
+        if len(np.unique(cells)) == len(cells):
+            return grid('2D_grid')
+
+    return grid('2D_unknown')
 
 
 def _strings_as_ints(inputarray: np.ndarray) -> np.ndarray:
@@ -227,10 +571,7 @@ def _strings_as_ints(inputarray: np.ndarray) -> np.ndarray:
     Args:
         inputarray: A 1D array of strings
     """
-    newdata = np.zeros(len(inputarray))
-    for n, word in enumerate(np.unique(inputarray)):
-        newdata += ((inputarray == word).astype(int)*n)
-    return newdata
+    return _distinct_values(inputarray)[1].astype(float)
 
 
 def get_1D_plottype(xpoints: np.ndarray, ypoints: np.ndarray) -> str:
@@ -330,66 +671,41 @@ def datatype_from_setpoints_2d(xpoints: np.ndarray,
     Returns:
         A string with the name of the determined plot type
     """
-    # We represent categorical data as integer-valued data
-    if isinstance(xpoints[0], str):
-        xpoints = _strings_as_ints(xpoints)
-    if isinstance(ypoints[0], str):
-        ypoints = _strings_as_ints(ypoints)
+    return infer_2D_grid(xpoints, ypoints).plottype
 
-    # First check whether all setpoints are identical along
-    # any dimension
-    x_all_the_same = np.allclose(xpoints, xpoints[0])
-    y_all_the_same = np.allclose(ypoints, ypoints[0])
 
-    if x_all_the_same or y_all_the_same:
-        return '2D_point'
-
-    # Now check if this is a simple rectangular sweep,
-    # possibly interrupted in the middle of one row
-
-    xrows = _rows_from_datapoints(xpoints)
-    yrows = _rows_from_datapoints(ypoints)
-
-    x_check = _all_in_group_or_subgroup(xrows)
-    y_check = _all_in_group_or_subgroup(yrows)
-
-    x_check = x_check and (len(xrows[0]) == len(yrows))
-    y_check = y_check and (len(yrows[0]) == len(xrows))
-
-    # this is the check that we are on a "simple" grid
-    if y_check and x_check:
-        return '2D_grid'
-
-    x_check = _all_steps_multiples_of_min_step(xrows)
-    y_check = _all_steps_multiples_of_min_step(yrows)
-
-    # this is the check that we are on an equidistant grid
-    if y_check and x_check:
-        return '2D_equidistant'
-
-    return '2D_unknown'
+def reshape_2D_data(x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                    grid: Optional[Grid2D] = None
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Put 2D data on the grid of the distinct values of their setpoints
 
+    Args:
+        x: The x values
+        y: The y values
+        z: The z values
+        grid: The grid inferred by :func:`infer_2D_grid` for ``x`` and
+            ``y``, such that it need not be inferred again
 
-def reshape_2D_data(x: np.ndarray, y: np.ndarray, z: np.ndarray
-                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    xrow = np.array(_rows_from_datapoints(x)[0])
-    yrow = np.array(_rows_from_datapoints(y)[0])
+    Returns:
+        The sorted distinct x values and y values, and the z values on the
+        grid of those, NaN (or an empty string) where there is no data point
+    """
+    if grid is None:
+        xrow, x_index, _ = _distinct_values(x)
+        yrow, y_index, _ = _distinct_values(y)
+    else:
+        xrow, yrow = grid.xrow, grid.yrow
+        x_index, y_index = grid.x_index, grid.y_index
     nx = len(xrow)
     ny = len(yrow)
 
-    # potentially slow method of filling in the data, should be optimised
     log.debug('Sorting 2D data onto grid')
 
     if isinstance(z[0], str):
         z_to_plot = np.full((ny, nx), '', dtype=z.dtype)
     else:
         z_to_plot = np.full((ny, nx), np.nan)
-    x_index = np.zeros_like(x, dtype=np.int)
-    y_index = np.zeros_like(y, dtype=np.int)
-    for i, xval in enumerate(xrow):
-        x_index[np.where(x == xval)[0]] = i
-    for i, yval in enumerate(yrow):
-        y_index[np.where(y == yval)[0]] = i
 
     z_to_plot[y_index, x_index] = z
 
@@ -422,13 +738,14 @@ def get_shaped_data_by_runid(run_id: int) -> List:
             independet[1]['data'] = flatten_1D_data_for_plot(
                 independet[1]['data'])
 
-            datatype = datatype_from_setpoints_2d(independet[0]['data'],
-                                                  independet[1]['data'])
-            if datatype in ('2D_grid', '2D_equidistant'):
+            grid = infer_2D_grid(independet[0]['data'],
+                                 independet[1]['data'])
+            if grid.plottype in ('2D_grid', '2D_equidistant'):
                 independet[0]['data'], \
                 independet[1]['data'], \
                 independet[2]['data'] = reshape_2D_data(independet[0]['data'],
                                                         independet[1]['data'],
-                                                        independet[2]['data'])
+                                                        independet[2]['data'],
+                                                        grid)
 
     return mydata
@@ -5,18 +5,25 @@ import logging
 import os
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed)
 from queue import Empty, Queue
-from threading import Thread
-from typing import (Any, Callable, Dict, List, Optional, Sequence, Sized,
-                    Tuple, Union, TYPE_CHECKING)
+from threading import Event, Lock, Thread
+from typing import (Any, Callable, Dict, FrozenSet, Iterator, List, Mapping,
+                    Optional, Sequence, Sized, Tuple, Union, TYPE_CHECKING)
 
 if TYPE_CHECKING:
     import pandas as pd
+    import xarray as xr
 
 import numpy
 
 import qcodes.config
 import qcodes.dataset.descriptions.versioning.serialization as serial
+from qcodes.dataset.data_conversion import (
+    parameter_data_to_dataframes, parameter_data_to_xarray_dataset)
+from qcodes.dataset.data_set_cache import DataSetCache
 from qcodes.dataset.descriptions.dependencies import (DependencyError,
                                                       InterDependencies_)
 from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
@@ -25,31 +32,35 @@ from qcodes.dataset.descriptions.versioning.converters import (new_to_old,
                                                                old_to_new,
                                                                v1_to_v0)
 from qcodes.dataset.descriptions.versioning.v0 import InterDependencies
-from qcodes.dataset.guids import (
-    filter_guids_by_parts, generate_guid, parse_guid)
+from qcodes.dataset.export import export_to_hdf5
+from qcodes.dataset.guids import generate_guid, parse_guid
 from qcodes.dataset.linked_datasets.links import (Link, links_to_str,
                                                   str_to_links)
 from qcodes.dataset.sqlite.connection import (ConnectionPlus, atomic,
                                               atomic_transaction,
                                               transaction)
 from qcodes.dataset.sqlite.database import (
-    connect, get_DB_location, conn_from_dbpath_or_conn)
+    connect, connect_read_only, get_DB_debug, get_DB_location,
+    conn_from_dbpath_or_conn, get_pooled_read_only_connection)
 from qcodes.dataset.sqlite.queries import (
-    add_meta_data, add_parameter, completed, create_run,
-    get_completed_timestamp_from_run_id, get_data,
+    add_meta_data, add_parameter, completed, create_column_indexes,
+    create_run, get_completed_timestamp_from_run_id, get_data,
     get_experiment_name_from_experiment_id, get_experiments,
-    get_guid_from_run_id, get_guids_from_run_spec,
-    get_last_experiment, get_metadata, get_metadata_from_run_id,
-    get_parameter_data, get_parent_dataset_links, get_run_description,
-    get_run_timestamp_from_run_id, get_runid_from_guid,
-    get_sample_name_from_experiment_id, get_setpoints, get_values,
-    mark_run_complete, remove_trigger, run_exists, set_run_timestamp,
-    update_parent_datasets, update_run_description)
-from qcodes.dataset.sqlite.query_helpers import (VALUE, insert_many_values,
+    get_guids_from_run_spec, get_last_experiment, get_metadata_from_run_id,
+    add_snapshot_base, get_last_snapshot_base_id, get_parameter_data,
+    get_parent_dataset_links, get_result_tables_and_run_descriptions,
+    get_run_description, get_run_timestamp_from_run_id, get_runid_from_guid,
+    get_sample_name_from_experiment_id, get_setpoints, get_snapshot_base,
+    get_values, iter_parameter_data, mark_run_complete, remove_trigger,
+    run_exists, set_run_snapshot, set_run_timestamp, update_parent_datasets,
+    update_run_description)
+from qcodes.dataset.sqlite.query_helpers import (VALUE, INSERT_QUERY_CACHE,
+                                                 insert_many_columns,
                                                  insert_values, length, one,
                                                  select_one_where, VALUES)
 from qcodes.instrument.parameter import _BaseParameter
 from qcodes.utils.deprecate import deprecate
+from qcodes.utils.metadata import apply_snapshot_diff, diff_snapshots
 
 log = logging.getLogger(__name__)
 
@@ -77,6 +88,43 @@ SPECS = List[ParamSpec]
 SpecsOrInterDeps = Union[SPECS, InterDependencies_]
 
 
+# if qcodes.config.dataset.store_snapshot_diffs is set, the snapshot of a
+# run is stored as the difference to the last base snapshot, unless the
+# difference is larger than this fraction of the snapshot, in which case the
+# snapshot becomes the new base snapshot
+_MAX_SNAPSHOT_DIFF_FRACTION = 0.5
+
+# the number of parsed base snapshots that are kept in memory
+_SNAPSHOT_BASE_CACHE_SIZE = 8
+_snapshot_base_cache: 'OrderedDict[Tuple[str, int], Tuple[str, dict]]' = \
+    OrderedDict()
+_snapshot_base_cache_lock = Lock()
+
+
+def _load_snapshot_base(conn: ConnectionPlus, base_id: int) -> dict:
+    """
+    Load a base snapshot. The parsed base snapshots are cached, since many
+    runs share the same base snapshot; a cached base snapshot is only used
+    if its JSON is the same as in the database, such that a database file
+    that is replaced by another one does not return stale base snapshots.
+    The returned dictionary is shared and must not be modified.
+    """
+    snapshot_json = get_snapshot_base(conn, base_id)
+    key = (conn.path_to_dbfile, base_id)
+    with _snapshot_base_cache_lock:
+        cached = _snapshot_base_cache.get(key)
+        if cached is not None and cached[0] == snapshot_json:
+            _snapshot_base_cache.move_to_end(key)
+            return cached[1]
+    base = json.loads(snapshot_json)
+    with _snapshot_base_cache_lock:
+        _snapshot_base_cache[key] = (snapshot_json, base)
+        _snapshot_base_cache.move_to_end(key)
+        while len(_snapshot_base_cache) > _SNAPSHOT_BASE_CACHE_SIZE:
+            _snapshot_base_cache.popitem(last=False)
+    return base
+
+
 class CompletedError(RuntimeError):
     pass
 
@@ -90,7 +138,11 @@ class DataPathException(Exception):
 class _Subscriber(Thread):
     """
     Class to add a subscriber to a :class:`.DataSet`. The subscriber gets called every
-    time an insert is made to the results_table.
+    time results are added to the :class:`.DataSet`.
+
+    The results are handed to the subscriber by the :class:`.DataSet` in
+    batches, as they are added, and the subscriber thread wakes up as soon
+    as there are new results instead of polling for them.
 
     The _Subscriber is not meant to be instantiated directly, but rather used
     via the 'subscribe' method of the :class:`.DataSet`.
@@ -100,6 +152,11 @@ class _Subscriber(Thread):
     NOTE: Special care shall be taken when using the *state* object: it is the
     user's responsibility to operate with it in a thread-safe way.
     """
+    # put on the queue to wake up the subscriber thread when the dataset
+    # has been completed or the subscriber has been asked to stop
+    _DONE = object()
+    _STOP = object()
+
     def __init__(self,
                  dataSet: 'DataSet',
                  id_: str,
@@ -120,8 +177,8 @@ class _Subscriber(Thread):
         self.state = state
 
         self.data_queue: Queue = Queue()
-        self._queue_length: int = 0
-        self._stop_signal: bool = False
+        self._result_list: List[Tuple[Any, ...]] = []
+        self._stop_event = Event()
         # convert milliseconds to seconds
         self._loop_sleep_time = loop_sleep_time / 1000
         self.min_queue_length = min_queue_length
@@ -131,30 +188,16 @@ class _Subscriber(Thread):
         else:
             self.callback = functools.partial(callback, **callback_kwargs)
 
-        self.callback_id = f"callback{self._id}"
-        self.trigger_id = f"sub{self._id}"
-
-        conn = dataSet.conn
-
-        conn.create_function(self.callback_id, -1, self._cache_data_to_queue)
-
-        parameters = dataSet.get_parameters()
-        sql_param_list = ",".join([f"NEW.{p.name}" for p in parameters])
-        sql_create_trigger_for_callback = f"""
-        CREATE TRIGGER {self.trigger_id}
-            AFTER INSERT ON '{self.table_name}'
-        BEGIN
-            SELECT {self.callback_id}({sql_param_list});
-        END;"""
-        atomic_transaction(conn, sql_create_trigger_for_callback)
-
         self.log = logging.getLogger(f"_Subscriber {self._id}")
 
-    def _cache_data_to_queue(self, *args: Any) -> None:
-        self.log.debug(f"Args:{args} put into queue for {self.callback_id}")
-        self.data_queue.put(args)
-        self._data_set_len += 1
-        self._queue_length += 1
+    def publish(self, results: List[Tuple[Any, ...]]) -> None:
+        """
+        Hand a batch of results that have been added to the dataset over to
+        the subscriber thread. Each result is a tuple of the values of all
+        the parameters of the dataset.
+        """
+        self.log.debug(f"{len(results)} results put into queue")
+        self.data_queue.put(results)
 
     def run(self) -> None:
         self.log.debug("Starting subscriber")
@@ -171,35 +214,45 @@ class _Subscriber(Thread):
         return result_list
 
     def _call_callback_on_queue_data(self) -> None:
-        result_list = self._exhaust_queue(self.data_queue)
+        result_list, self._result_list = self._result_list, []
         self.callback(result_list, self._data_set_len, self.state)
         self.log.debug(f"{self.callback} called with "
                        f"result_list: {result_list}.")
 
     def _loop(self) -> None:
         while True:
-            if self._stop_signal:
-                self._clean_up()
-                break
-
-            if self._queue_length >= self.min_queue_length:
+            # block until something is published, then take everything
+            # that is queued up such that the callback is called once
+            items = [self.data_queue.get()]
+            items += self._exhaust_queue(self.data_queue)
+
+            for item in items:
+                if item is self._STOP:
+                    self._clean_up()
+                    return
+                if item is self._DONE:
+                    self._call_callback_on_queue_data()
+                    return
+                self._result_list += item
+                self._data_set_len += len(item)
+
+            if len(self._result_list) >= self.min_queue_length:
                 self._call_callback_on_queue_data()
-                self._queue_length = 0
-
-            time.sleep(self._loop_sleep_time)
-
-            if self.dataSet.completed:
-                self._call_callback_on_queue_data()
-                break
+                # honour the minimal time between callbacks, but do not
+                # keep a stopped subscriber waiting
+                self._stop_event.wait(self._loop_sleep_time)
 
     def done_callback(self) -> None:
         self.log.debug("Done callback")
-        self._call_callback_on_queue_data()
+        self.data_queue.put(self._DONE)
+        # the callback is called with the last results before returning
+        self.join()
 
     def schedule_stop(self) -> None:
-        if not self._stop_signal:
+        if not self._stop_event.is_set():
             self.log.debug("Scheduling stop")
-            self._stop_signal = True
+            self._stop_event.set()
+            self.data_queue.put(self._STOP)
 
     def _clean_up(self) -> None:
         self.log.debug("Stopped subscriber")
@@ -253,8 +306,22 @@ class DataSet(Sized):
 
         self._debug = False
         self.subscribers: Dict[str, _Subscriber] = {}
+        # insert plans that are reused by all writes to this dataset, see
+        # `insert_many_columns`
+        self._insert_query_cache: INSERT_QUERY_CACHE = {}
+        self._insert_columns: Dict[FrozenSet[str], List[str]] = {}
         self._interdeps: InterDependencies_
         self._parent_dataset_links: List[Link]
+        # look-ups that are cached on this object; the run description and
+        # the parameters are derived from the interdependencies and cleared
+        # by `set_interdependencies`, the values of the runs table are only
+        # cached once the run is completed and cleared when metadata is
+        # added, see `_get_run_value`
+        self._description: Optional[RunDescriber] = None
+        self._parameters: Optional[SPECS] = None
+        self._table_name: Optional[str] = None
+        self._run_values: Dict[str, Any] = {}
+        self._cache = DataSetCache(self)
 
         if run_id is not None:
             if not run_exists(self.conn, run_id):
@@ -263,6 +330,7 @@ class DataSet(Sized):
             self._run_id = run_id
             self._completed = completed(self.conn, self.run_id)
             run_desc = self._get_run_description_from_db()
+            self._description = run_desc
             self._interdeps = run_desc.interdeps
             self._metadata = get_metadata_from_run_id(self.conn, self.run_id)
             self._started = self.run_timestamp_raw is not None
@@ -304,8 +372,7 @@ class DataSet(Sized):
 
     @property
     def captured_run_id(self) -> int:
-        return select_one_where(self.conn, "runs",
-                                "captured_run_id", "run_id", self.run_id)
+        return self._get_run_value('captured_run_id')
 
     @property
     def path_to_db(self) -> str:
@@ -313,17 +380,20 @@ class DataSet(Sized):
 
     @property
     def name(self) -> str:
-        return select_one_where(self.conn, "runs",
-                                "name", "run_id", self.run_id)
+        return self._get_run_value('name')
 
     @property
     def table_name(self) -> str:
-        return select_one_where(self.conn, "runs",
-                                "result_table_name", "run_id", self.run_id)
+        # the results table of a run never changes
+        if self._table_name is None:
+            self._table_name = select_one_where(self.conn, "runs",
+                                                "result_table_name",
+                                                "run_id", self.run_id)
+        return self._table_name
 
     @property
     def guid(self) -> str:
-        return get_guid_from_run_id(self.conn, self.run_id)
+        return self._get_run_value('guid')
 
     @property
     def snapshot(self) -> Optional[dict]:
@@ -337,8 +407,16 @@ class DataSet(Sized):
     @property
     def snapshot_raw(self) -> Optional[str]:
         """Snapshot of the run as a JSON-formatted string (or None)"""
-        return select_one_where(self.conn, "runs", "snapshot",
-                                "run_id", self.run_id)
+        snapshot_json = self._get_run_value('snapshot')
+        if snapshot_json is None:
+            return None
+        base_id = self._get_run_value('snapshot_base_id')
+        if base_id is None:
+            return snapshot_json
+        # the snapshot is stored as the difference to a base snapshot
+        base = _load_snapshot_base(self.conn, base_id)
+        return json.dumps(apply_snapshot_diff(base,
+                                              json.loads(snapshot_json)))
 
     @property
     def number_of_results(self) -> int:
@@ -348,13 +426,11 @@ class DataSet(Sized):
 
     @property
     def counter(self) -> int:
-        return select_one_where(self.conn, "runs",
-                                "result_counter", "run_id", self.run_id)
+        return self._get_run_value('result_counter')
 
     @property
     def captured_counter(self) -> int:
-        return select_one_where(self.conn, "runs",
-                                "captured_counter", "run_id", self.run_id)
+        return self._get_run_value('captured_counter')
 
     @property
     def parameters(self) -> str:
@@ -379,8 +455,7 @@ class DataSet(Sized):
 
     @property
     def exp_id(self) -> int:
-        return select_one_where(self.conn, "runs",
-                                "exp_id", "run_id", self.run_id)
+        return self._get_run_value('exp_id')
 
     @property
     def exp_name(self) -> str:
@@ -402,12 +477,25 @@ class DataSet(Sized):
 
     @property
     def description(self) -> RunDescriber:
-        return RunDescriber(interdeps=self._interdeps)
+        if self._description is None:
+            self._description = RunDescriber(interdeps=self._interdeps)
+        return self._description
 
     @property
     def metadata(self) -> Dict:
         return self._metadata
 
+    @property
+    def cache(self) -> DataSetCache:
+        """
+        The data of the :class:`.DataSet` in memory. Calling ``data()`` on
+        the cache returns the same data as :meth:`get_parameter_data` does
+        without arguments, but only loads the results that have been added
+        since the previous call from the database, which makes polling the
+        data of a run that is being measured cheap.
+        """
+        return self._cache
+
     @property
     def parent_dataset_links(self) -> List[Link]:
         """
@@ -524,6 +612,23 @@ class DataSet(Sized):
         desc_str = get_run_description(self.conn, self.run_id)
         return serial.from_json_to_current(desc_str)
 
+    def _get_run_value(self, column: str) -> Any:
+        """
+        Look up the value of a column of the runs table for this run. Once
+        the run is completed, the values are cached on this object, which
+        notably speeds up repeatedly loading the data of a completed run.
+        Adding metadata (or a snapshot) via this object clears the cached
+        value of that column, but changes made to the run through other
+        connections or objects are not picked up.
+        """
+        if column in self._run_values:
+            return self._run_values[column]
+        value = select_one_where(self.conn, "runs", column,
+                                 "run_id", self.run_id)
+        if self.completed:
+            self._run_values[column] = value
+        return value
+
     def toggle_debug(self) -> None:
         """
         Toggle debug mode, if debug mode is on all the queries made are
@@ -556,16 +661,22 @@ class DataSet(Sized):
             raise RuntimeError(mssg)
 
         self._interdeps = interdeps
+        self._description = None
+        self._parameters = None
 
     def get_parameters(self) -> SPECS:
-        rd_v0 = v1_to_v0(self.description)
-        old_interdeps = rd_v0.interdeps
-        return list(old_interdeps.paramspecs)
+        if self._parameters is None:
+            rd_v0 = v1_to_v0(self.description)
+            old_interdeps = rd_v0.interdeps
+            self._parameters = list(old_interdeps.paramspecs)
+        return list(self._parameters)
 
     def add_metadata(self, tag: str, metadata: Any) -> None:
         """
         Adds metadata to the :class:`.DataSet`. The metadata is stored under the
         provided tag. Note that None is not allowed as a metadata value.
+        The 'snapshot' tag replaces the snapshot of the run, see
+        :meth:`add_snapshot`.
 
         Args:
             tag: represents the key in the metadata dictionary
@@ -573,6 +684,11 @@ class DataSet(Sized):
         """
 
         self._metadata[tag] = metadata
+        self._run_values.pop(tag, None)
+        if tag == 'snapshot':
+            # the snapshot may be stored as the difference to a base snapshot
+            self.add_snapshot(metadata, overwrite=True)
+            return
         # `add_meta_data` is not atomic by itself, hence using `atomic`
         with atomic(self.conn) as conn:
             add_meta_data(conn, self.run_id, {tag: metadata})
@@ -581,16 +697,46 @@ class DataSet(Sized):
         """
         Adds a snapshot to this run
 
+        If ``qcodes.config.dataset.store_snapshot_diffs`` is set, the
+        snapshot is stored as the difference to the last base snapshot in
+        the database, or as a new base snapshot if it differs too much from
+        that. Either way, :attr:`snapshot` returns the full snapshot.
+
         Args:
             snapshot: the raw JSON dump of the snapshot
             overwrite: force overwrite an existing snapshot
         """
-        if self.snapshot is None or overwrite:
-            add_meta_data(self.conn, self.run_id, {'snapshot': snapshot})
-        elif self.snapshot is not None and not overwrite:
+        if self._get_run_value('snapshot') is None or overwrite:
+            self._run_values.pop('snapshot', None)
+            self._run_values.pop('snapshot_base_id', None)
+            if qcodes.config.dataset.store_snapshot_diffs:
+                self._add_snapshot_as_diff(snapshot)
+            else:
+                set_run_snapshot(self.conn, self.run_id, snapshot)
+        else:
             log.warning('This dataset already has a snapshot. Use overwrite'
                         '=True to overwrite that')
 
+    def _add_snapshot_as_diff(self, snapshot: str) -> None:
+        """
+        Store the snapshot as the difference to the last base snapshot, or
+        as a new base snapshot if the difference is too large
+        """
+        parsed = json.loads(snapshot)
+        if not isinstance(parsed, dict):
+            set_run_snapshot(self.conn, self.run_id, snapshot)
+            return
+        with atomic(self.conn) as conn:
+            base_id = get_last_snapshot_base_id(conn)
+            if base_id is not None:
+                base = _load_snapshot_base(conn, base_id)
+                diff = json.dumps(diff_snapshots(base, parsed))
+                if len(diff) <= _MAX_SNAPSHOT_DIFF_FRACTION * len(snapshot):
+                    set_run_snapshot(conn, self.run_id, diff, base_id)
+                    return
+            base_id = add_snapshot_base(conn, snapshot)
+            set_run_snapshot(conn, self.run_id, json.dumps({}), base_id)
+
     @property
     def pristine(self) -> bool:
         """
@@ -669,6 +815,20 @@ class DataSet(Sized):
         self.completed = True
         for sub in self.subscribers.values():
             sub.done_callback()
+        if qcodes.config.dataset.index_setpoints:
+            self._create_setpoint_indexes()
+
+    def _create_setpoint_indexes(self) -> None:
+        """
+        Index the columns of all setpoints (that are not of type 'array') in
+        the results table, see :func:`.create_column_indexes`
+        """
+        setpoint_names = {setpoint.name: None
+                          for setpoints in self._interdeps.dependencies.values()
+                          for setpoint in setpoints
+                          if setpoint.type != 'array'}
+        create_column_indexes(self.conn, self.table_name,
+                              list(setpoint_names))
 
     @deprecate(alternative='mark_completed')
     def mark_complete(self) -> None:
@@ -714,6 +874,7 @@ class DataSet(Sized):
                               list(results.keys()),
                               list(results.values())
                               )
+        self._publish_results([results])
         return index
 
     def add_results(self, results: List[Dict[str, VALUE]]) -> int:
@@ -745,13 +906,110 @@ class DataSet(Sized):
                                  'results can be added to it.')
 
         expected_keys = frozenset.union(*[frozenset(d) for d in results])
-        values = [[d.get(k, None) for k in expected_keys] for d in results]
+        names = self._insert_column_order(expected_keys)
+        columns: List[Sequence[Optional[VALUE]]] = [
+            [d.get(k, None) for d in results] for k in names]
+
+        first_rowid = insert_many_columns(self.conn, self.table_name, names,
+                                          columns, self._insert_query_cache)
+        assert first_rowid is not None
+        self._publish_results(results)
+        return first_rowid - 1
+
+    def add_results_from_columns(
+            self, blocks: Sequence[Dict[str, Union[numpy.ndarray,
+                                                   Sequence[VALUE]]]]
+            ) -> int:
+        """
+        Adds a sequence of column-wise results to the :class:`.DataSet`.
+        This is the bulk counterpart of :meth:`add_results` and avoids
+        creating one dictionary per row; it is used by the
+        :class:`.DataSaver` when flushing data to the database.
+
+        Args:
+            blocks: sequence of blocks of results. Each block is a dictionary
+                from parameter name to a column of values (typically a 1D
+                numpy array) and all columns within a block must have the
+                same length. Parameters missing from a block are assumed to
+                be None. Consecutive blocks with the same parameters are
+                written together.
+
+        Returns:
+            the index in the :class:`.DataSet` that the **first** result was
+            stored at
+
+        It is an error to provide a value for a key or keyword that is not
+        the name of a parameter in this :class:`.DataSet`.
+
+        It is an error to add results to a completed :class:`.DataSet`.
+        """
+
+        if self.pristine:
+            raise RuntimeError('This DataSet has not been marked as started. '
+                               'Please mark the DataSet as started before '
+                               'adding results to it.')
 
-        len_before_add = length(self.conn, self.table_name)
+        if self.completed:
+            raise CompletedError('This DataSet is complete, no further '
+                                 'results can be added to it.')
 
-        insert_many_values(self.conn, self.table_name, list(expected_keys),
-                           values)
-        return len_before_add
+        first_rowid: Optional[int] = None
+
+        with atomic(self.conn) as conn:
+            for names, columns in _merge_column_blocks(blocks):
+                rowid = insert_many_columns(conn, self.table_name, names,
+                                            columns, self._insert_query_cache)
+                if first_rowid is None:
+                    first_rowid = rowid
+        self._publish_results_from_columns(blocks)
+        if first_rowid is None:
+            return length(self.conn, self.table_name)
+        return first_rowid - 1
+
+    def _insert_column_order(self, names: FrozenSet[str]) -> List[str]:
+        """
+        Return the columns to insert values of the given parameters into, in
+        the same order for every call such that the insert statements can be
+        reused
+        """
+        if names not in self._insert_columns:
+            self._insert_columns[names] = sorted(names)
+        return self._insert_columns[names]
+
+    def _publish_results(self, results: Sequence[Dict[str, VALUE]]) -> None:
+        """
+        Hand results that have been added to the :class:`.DataSet` over to
+        the subscribers, as tuples of the values of all parameters
+        """
+        if not self.subscribers:
+            return
+        names = [ps.name for ps in self.get_parameters()]
+        rows = [tuple(result.get(name) for name in names)
+                for result in results]
+        for sub in list(self.subscribers.values()):
+            sub.publish(rows)
+
+    def _publish_results_from_columns(
+            self, blocks: Sequence[Dict[str, Union[numpy.ndarray,
+                                                   Sequence[VALUE]]]]
+            ) -> None:
+        """
+        Hand column-wise results that have been added to the
+        :class:`.DataSet` over to the subscribers, see
+        :meth:`_publish_results`
+        """
+        if not self.subscribers:
+            return
+        names = [ps.name for ps in self.get_parameters()]
+        rows: List[Tuple[Any, ...]] = []
+        for block in blocks:
+            n_rows = len(next(iter(block.values())))
+            columns = [_column_to_list(block[name]) if name in block
+                       else [None] * n_rows
+                       for name in names]
+            rows += zip(*columns)
+        for sub in list(self.subscribers.values()):
+            sub.publish(rows)
 
     @staticmethod
     def _validate_parameters(*params: Union[str, ParamSpec, _BaseParameter]
@@ -820,7 +1078,9 @@ class DataSet(Sized):
             self,
             *params: Union[str, ParamSpec, _BaseParameter],
             start: Optional[int] = None,
-            end: Optional[int] = None) -> Dict[str, Dict[str, numpy.ndarray]]:
+            end: Optional[int] = None,
+            where: Optional[Dict[str, Tuple[Any, Any]]] = None
+    ) -> Dict[str, Dict[str, numpy.ndarray]]:
         """
         Returns the values stored in the :class:`.DataSet` for the specified parameters
         and their dependencies. If no paramerers are supplied the values will
@@ -839,6 +1099,14 @@ class DataSet(Sized):
         less than or equal to the start, or if start is after the current end
         of the :class:`.DataSet` – then a list of empty arrays is returned.
 
+        If provided, the where argument selects the results by ranges of
+        values of (typically setpoint) parameters, e.g.
+        ``where={'x': (0, 1)}`` returns the results for which ``0 <= x <= 1``.
+        The start and end arguments are applied to the selected results.
+        If the ``dataset.index_setpoints`` config option is enabled, the
+        setpoints are indexed in the database when the run is completed,
+        which speeds up filtering by them.
+
         Args:
             *params: string parameter names, QCoDeS Parameter objects, and
                 ParamSpec objects. If no parameters are supplied data for
@@ -848,6 +1116,11 @@ class DataSet(Sized):
                 if None
             end: end value of selection range (by results count); ignored if
                 None
+            where: dict from parameter name to a (low, high) tuple of the
+                range of values of that parameter to select results by, both
+                ends included. A bound that is None is ignored. The
+                parameters must be part of the data of every requested
+                parameter and can not be of type 'array'.
 
         Returns:
             Dictionary from requested parameters to Dict of parameter names
@@ -860,7 +1133,8 @@ class DataSet(Sized):
         else:
             valid_param_names = self._validate_parameters(*params)
         return get_parameter_data(self.conn, self.table_name,
-                                  valid_param_names, start, end)
+                                  valid_param_names, start, end, where=where,
+                                  interdeps=self._interdeps)
 
     def get_data_as_pandas_dataframe(self,
                                      *params: Union[str,
@@ -905,41 +1179,128 @@ class DataSet(Sized):
             a column and a indexed by a :py:class:`pandas.MultiIndex` formed
             by the dependencies.
         """
-        import pandas as pd
-        dfs = {}
         datadict = self.get_parameter_data(*params,
                                            start=start,
                                            end=end)
-        for name, subdict in datadict.items():
-            keys = list(subdict.keys())
-            if len(keys) == 0:
-                dfs[name] = pd.DataFrame()
-                continue
-            if len(keys) == 1:
-                index = None
-            elif len(keys) == 2:
-                index = pd.Index(subdict[keys[1]].ravel(), name=keys[1])
-            else:
-                indexdata = tuple(numpy.concatenate(subdict[key])
-                                  if subdict[key].dtype == numpy.dtype('O')
-                                  else subdict[key].ravel()
-                                  for key in keys[1:])
-                index = pd.MultiIndex.from_arrays(
-                    indexdata,
-                    names=keys[1:])
-
-            if subdict[keys[0]].dtype == numpy.dtype('O'):
-                # ravel will not fully unpack a numpy array of arrays
-                # which are of "object" dtype. This can happen if a variable
-                # length array is stored in the db. We use concatenate to
-                # flatten these
-                mydata = numpy.concatenate(subdict[keys[0]])
-            else:
-                mydata = subdict[keys[0]].ravel()
-            df = pd.DataFrame(mydata, index=index,
-                              columns=[keys[0]])
-            dfs[name] = df
-        return dfs
+        return parameter_data_to_dataframes(datadict)
+
+    def get_data_as_xarray_dataset(
+            self,
+            *params: Union[str, ParamSpec, _BaseParameter],
+            start: Optional[int] = None,
+            end: Optional[int] = None
+    ) -> "xr.Dataset":
+        """
+        Returns the values stored in the :class:`.DataSet` for the specified
+        parameters and their dependencies as an :py:class:`xarray.Dataset`
+        with a data variable for each of the requested parameters. This
+        requires :py:mod:`xarray` to be installed.
+
+        If the setpoints of a parameter lie on a (possibly incomplete) grid,
+        the variable of the parameter has the setpoints as dimensions. The
+        data are then put onto the grid directly, and if they were measured
+        in the order of the grid, the arrays that are loaded from the
+        database are only reshaped and not copied. Otherwise, the variable
+        has a single dimension named ``<parameter>_index`` along which the
+        setpoints are coordinates. The labels and units of the parameters
+        are stored as the 'long_name' and 'units' attributes of the
+        variables, and the GUID and other properties of the run as
+        attributes of the dataset.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects. If no parameters are supplied data for
+                all parameters that are not a dependency of another
+                parameter will be returned.
+            start: start value of selection range (by result count); ignored
+                if None
+            end: end value of selection range (by results count); ignored if
+                None
+
+        Returns:
+            :py:class:`xarray.Dataset` with the requested parameters as data
+            variables
+        """
+        datadict = self.get_parameter_data(*params, start=start, end=end)
+        paramspecs = {ps.name: ps for ps in self._interdeps.paramspecs}
+        xrdataset = parameter_data_to_xarray_dataset(datadict, paramspecs)
+        for attribute in ('guid', 'run_id', 'captured_run_id', 'name',
+                          'exp_name', 'sample_name', 'run_timestamp_raw',
+                          'completed_timestamp_raw'):
+            value = getattr(self, attribute)
+            if value is not None:
+                xrdataset.attrs[attribute] = value
+        return xrdataset
+
+    def iter_parameter_data(
+            self,
+            *params: Union[str, ParamSpec, _BaseParameter],
+            chunk_rows: int = 10000
+    ) -> Iterator[Dict[str, Dict[str, numpy.ndarray]]]:
+        """
+        Iterates over the values stored in the :class:`.DataSet` for the
+        specified parameters and their dependencies in chunks of at most
+        ``chunk_rows`` results per parameter, such that runs that are too
+        large to load at once can be processed in bounded memory.
+
+        Each chunk has the same format as the output of
+        :meth:`get_parameter_data`, and concatenating the arrays of all the
+        chunks gives the output of :meth:`get_parameter_data`. Independent
+        parameters may have a different number of results; a parameter
+        whose results have all been returned is left out of the subsequent
+        chunks. Results that are added to the :class:`.DataSet` while
+        iterating are returned as well.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects. If no parameters are supplied data for
+                all parameters that are not a dependency of another
+                parameter will be returned.
+            chunk_rows: the maximal number of results per parameter in each
+                chunk
+
+        Returns:
+            Iterator over dictionaries from requested parameters to Dict of
+            parameter names to numpy arrays containing the data points of
+            the chunk.
+        """
+        if len(params) == 0:
+            valid_param_names = [ps.name
+                                 for ps in self._interdeps.non_dependencies]
+        else:
+            valid_param_names = self._validate_parameters(*params)
+        return iter_parameter_data(self.conn, self.table_name,
+                                   valid_param_names, chunk_rows,
+                                   interdeps=self._interdeps)
+
+    def iter_data_as_pandas_dataframe(
+            self,
+            *params: Union[str, ParamSpec, _BaseParameter],
+            chunk_rows: int = 10000
+    ) -> Iterator[Dict[str, "pd.DataFrame"]]:
+        """
+        Iterates over the values stored in the :class:`.DataSet` for the
+        specified parameters and their dependencies in chunks of at most
+        ``chunk_rows`` results per parameter. Each chunk is a dict of
+        :py:class:`pandas.DataFrame` s in the format of
+        :meth:`get_data_as_pandas_dataframe`. See
+        :meth:`iter_parameter_data` for how the chunks are formed.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects. If no parameters are supplied data for
+                all parameters that are not a dependency of another
+                parameter will be returned.
+            chunk_rows: the maximal number of results per parameter in each
+                chunk
+
+        Returns:
+            Iterator over dictionaries from requested parameter names to
+            :py:class:`pandas.DataFrame` s of the chunk.
+        """
+        for datadict in self.iter_parameter_data(*params,
+                                                 chunk_rows=chunk_rows):
+            yield parameter_data_to_dataframes(datadict)
 
     def write_data_to_text_file(self, path: str,
                                 single_file: bool = False,
@@ -1000,6 +1361,28 @@ class DataSet(Sized):
                 df_to_save = pd.concat(dfs_to_save, axis=1)
                 df_to_save.to_csv(path_or_buf=dst, header=False, sep='\t')
 
+    def export(self, path: str, format: str = 'hdf5', **kwargs: Any) -> None:
+        """
+        Export the data and metadata of the :class:`.DataSet` to a
+        standalone file, which can be loaded for analysis without the
+        database with :func:`~qcodes.dataset.export.load_from_export`.
+        The data are exported in chunks, such that this works for runs that
+        do not fit into memory as well.
+
+        Args:
+            path: the path of the file to write
+            format: the format of the file; currently only 'hdf5' is
+                supported
+            **kwargs: options of the exporter of the format, see
+                :func:`~qcodes.dataset.export.export_to_hdf5`, e.g. the
+                compression of the data
+        """
+        exporters = {'hdf5': export_to_hdf5}
+        if format not in exporters:
+            raise ValueError(f'Unknown export format {format!r}, the '
+                             f'supported formats are {list(exporters)}.')
+        exporters[format](self, path, **kwargs)
+
     def get_values(self, param_name: str) -> List[List[Any]]:
         """
         Get the values (i.e. not NULLs) of the specified parameter
@@ -1082,29 +1465,33 @@ class DataSet(Sized):
         """
         Remove subscriber with the provided uuid
         """
-        with atomic(self.conn) as conn:
-            sub = self.subscribers[uuid]
-            remove_trigger(conn, sub.trigger_id)
-            sub.schedule_stop()
-            sub.join()
-            del self.subscribers[uuid]
+        sub = self.subscribers[uuid]
+        sub.schedule_stop()
+        sub.join()
+        del self.subscribers[uuid]
 
     def unsubscribe_all(self) -> None:
         """
         Remove all subscribers
         """
+        # older versions of QCoDeS implemented subscribers with triggers that
+        # call a function of the connection; remove any such triggers that
+        # were left behind, since inserting fails without the function
         sql = "select * from sqlite_master where type = 'trigger';"
         triggers = atomic_transaction(self.conn, sql).fetchall()
         with atomic(self.conn) as conn:
             for trigger in triggers:
                 remove_trigger(conn, trigger['name'])
-            for sub in self.subscribers.values():
-                sub.schedule_stop()
-                sub.join()
-            self.subscribers.clear()
+        for sub in self.subscribers.values():
+            sub.schedule_stop()
+            sub.join()
+        self.subscribers.clear()
 
-    def get_metadata(self, tag: str) -> str:
-        return get_metadata(self.conn, tag, self.table_name)
+    def get_metadata(self, tag: str) -> Optional[str]:
+        if tag == 'snapshot':
+            # the snapshot may be stored as the difference to a base snapshot
+            return self.snapshot_raw
+        return self._get_run_value(tag)
 
     def __len__(self) -> int:
         return length(self.conn, self.table_name)
@@ -1122,13 +1509,90 @@ class DataSet(Sized):
         return "\n".join(out)
 
 
+def _merge_column_blocks(
+        blocks: Sequence[Dict[str, Union[numpy.ndarray, Sequence[VALUE]]]]
+        ) -> List[Tuple[List[str], List[Union[numpy.ndarray,
+                                              Sequence[VALUE]]]]]:
+    """
+    Merge consecutive blocks of column-wise results that hold the same
+    parameters, such that each merged block can be written to the database
+    in one go. The order of the results is preserved.
+
+    Args:
+        blocks: sequence of dictionaries from parameter name to column of
+            values
+
+    Returns:
+        list of tuples of parameter names and the matching list of columns
+    """
+    merged: List[Tuple[List[str], List[List[Any]]]] = []
+    for block in blocks:
+        names = list(block.keys())
+        if merged and merged[-1][0] == names:
+            for parts, column in zip(merged[-1][1], block.values()):
+                parts.append(column)
+        else:
+            merged.append((names, [[column] for column in block.values()]))
+
+    output = []
+    for names, parts_per_column in merged:
+        columns = [_concatenate_column_parts(parts)
+                   for parts in parts_per_column]
+        output.append((names, columns))
+    return output
+
+
+def _concatenate_column_parts(
+        parts: List[Union[numpy.ndarray, Sequence[VALUE]]]
+        ) -> Union[numpy.ndarray, Sequence[VALUE]]:
+    """
+    Concatenate parts of a column into one column. Numpy arrays are
+    concatenated as arrays, anything else (e.g. lists of arrays for 'array'
+    type parameters) as lists.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    arrays = [part for part in parts if isinstance(part, numpy.ndarray)]
+    if len(arrays) == len(parts):
+        return numpy.concatenate(arrays)
+    column: List[VALUE] = []
+    for part in parts:
+        column.extend(part)
+    return column
+
+
+def _column_to_list(column: Union[numpy.ndarray, Sequence[VALUE]]
+                    ) -> Sequence[VALUE]:
+    """
+    Convert a column of values as passed to
+    :meth:`DataSet.add_results_from_columns` to a sequence of python
+    objects. For numpy arrays of scalars this gives python scalars, just
+    like reading them back from the database would.
+    """
+    if isinstance(column, numpy.ndarray):
+        return column.tolist()
+    return column
+
+
 # public api
+def _connect_for_loading() -> ConnectionPlus:
+    """
+    Connect to the database file that the config points to for loading runs
+    from it, through the pool of read-only connections if the
+    ``dataset.pool_read_only_connections`` config option is enabled
+    """
+    if qcodes.config.dataset.pool_read_only_connections:
+        return get_pooled_read_only_connection(get_DB_location())
+    return connect(get_DB_location())
+
+
 def load_by_id(run_id: int, conn: Optional[ConnectionPlus] = None) -> DataSet:
     """
     Load a dataset by run id
 
     If no connection is provided, lookup is performed in the database file that
-    is specified in the config.
+    is specified in the config, via a pooled read-only connection if the
+    ``dataset.pool_read_only_connections`` config option is enabled.
 
     Note that the ``run_id`` used in this function in not preserved when copying
     data to another db file. We recommend using :func:`.load_by_run_spec` which
@@ -1144,7 +1608,7 @@ def load_by_id(run_id: int, conn: Optional[ConnectionPlus] = None) -> DataSet:
     if run_id is None:
         raise ValueError('run_id has to be a positive integer, not None.')
 
-    conn = conn or connect(get_DB_location())
+    conn = conn or _connect_for_loading()
 
     d = DataSet(conn=conn, run_id=run_id)
     return d
@@ -1159,6 +1623,8 @@ def load_by_run_spec(*,
                      sample_id: Optional[int] = None,
                      location: Optional[int] = None,
                      work_station: Optional[int] = None,
+                     start_time: Optional[float] = None,
+                     end_time: Optional[float] = None,
                      conn: Optional[ConnectionPlus] = None) -> DataSet:
     """
     Load a run from one or more pieces of runs specification. All
@@ -1176,6 +1642,10 @@ def load_by_run_spec(*,
         sample_id: The sample_id assigned as part of the GUID.
         location: The location code assigned as part of GUID.
         work_station: The workstation assigned as part of the GUID.
+        start_time: The earliest time (in seconds since the Epoch) at which
+          the run may have been started.
+        end_time: The latest time (in seconds since the Epoch) at which the
+          run may have been started.
         conn: An optional connection to the database. If no connection is
           supplied a connection to the default database will be opened.
 
@@ -1186,15 +1656,17 @@ def load_by_run_spec(*,
     Returns:
         :class:`.DataSet` matching the provided specification.
     """
-    conn = conn or connect(get_DB_location())
-    guids = get_guids_from_run_spec(conn,
-                                    captured_run_id=captured_run_id,
-                                    captured_counter=captured_counter,
-                                    experiment_name=experiment_name,
-                                    sample_name=sample_name)
-
-    matched_guids = filter_guids_by_parts(guids, location, sample_id,
-                                          work_station)
+    conn = conn or _connect_for_loading()
+    matched_guids = get_guids_from_run_spec(conn,
+                                            captured_run_id=captured_run_id,
+                                            captured_counter=captured_counter,
+                                            experiment_name=experiment_name,
+                                            sample_name=sample_name,
+                                            sample_id=sample_id,
+                                            location=location,
+                                            work_station=work_station,
+                                            start_time=start_time,
+                                            end_time=end_time)
 
     if len(matched_guids) == 1:
         return load_by_guid(matched_guids[0], conn)
@@ -1213,7 +1685,8 @@ def load_by_guid(guid: str, conn: Optional[ConnectionPlus] = None) -> DataSet:
     Load a dataset by its GUID
 
     If no connection is provided, lookup is performed in the database file that
-    is specified in the config.
+    is specified in the config, via a pooled read-only connection if the
+    ``dataset.pool_read_only_connections`` config option is enabled.
 
     Args:
         guid: guid of the dataset
@@ -1226,7 +1699,7 @@ def load_by_guid(guid: str, conn: Optional[ConnectionPlus] = None) -> DataSet:
         NameError: if no run with the given GUID exists in the database
         RuntimeError: if several runs with the given GUID are found
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or _connect_for_loading()
 
     # this function raises a RuntimeError if more than one run matches the GUID
     run_id = get_runid_from_guid(conn, guid)
@@ -1257,7 +1730,7 @@ def load_by_counter(counter: int, exp_id: int,
     Returns:
         :class:`.DataSet` of the given counter in the given experiment
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or _connect_for_loading()
     sql = """
     SELECT run_id
     FROM
@@ -1273,6 +1746,118 @@ def load_by_counter(counter: int, exp_id: int,
     return d
 
 
+def load_many(run_ids: Sequence[int],
+              params: Sequence[str] = (),
+              workers: Optional[int] = None,
+              use_processes: bool = False,
+              path_to_db: Optional[str] = None
+              ) -> Iterator[Tuple[int, Dict[str, Dict[str, numpy.ndarray]]]]:
+    """
+    Load the data of many runs concurrently, as
+    ``load_by_id(run_id).get_parameter_data(*params)`` would for each of
+    them. The result tables and run descriptions of all the runs are looked
+    up with a single query, and the data of the runs are then loaded by a
+    pool of workers with a read-only connection each. The runs are yielded
+    as soon as their data have been loaded, i.e. not necessarily in the
+    order of ``run_ids``.
+
+    Threads are usually enough to speed up loading, since SQLite does not
+    hold the GIL while it reads. Processes may be faster for runs with many
+    small results, whose conversion to arrays is done in python, but their
+    data have to be sent back to this process.
+
+    The runs are looked up, and the arguments are checked, when this
+    function is called, but the runs are only loaded as they are iterated
+    over.
+
+    Args:
+        run_ids: the run ids of the runs to load
+        params: the names of the parameters to load the data of, see
+            :meth:`DataSet.get_parameter_data`; these must be parameters of
+            all of the runs. If empty, all parameters that are not a
+            dependency of another parameter are loaded.
+        workers: the number of threads or processes to load the runs with;
+            if None, the default of :py:mod:`concurrent.futures` is used
+        use_processes: whether to load the runs in processes rather than
+            in threads
+        path_to_db: the database file to load the runs from; if None, the
+            database file that the config points to
+
+    Returns:
+        An iterator over the run id and the data of each of the runs, in
+        the format of :meth:`DataSet.get_parameter_data`
+
+    Raises:
+        ValueError: if any of the runs does not exist or lacks any of the
+            parameters
+    """
+    path_to_db = path_to_db or get_DB_location()
+    conn = get_pooled_read_only_connection(path_to_db)
+    runs = get_result_tables_and_run_descriptions(conn, run_ids)
+    missing = [run_id for run_id in run_ids if run_id not in runs]
+    if missing:
+        raise ValueError(f'Runs {missing} do not exist in the database '
+                         f'{path_to_db}')
+    for run_id, (_, run_description) in runs.items():
+        interdeps = serial.from_json_to_current(run_description).interdeps
+        unknown = [name for name in params
+                   if name not in interdeps._id_to_paramspec]
+        if unknown:
+            raise ValueError(f'Run {run_id} has no parameters named '
+                             f'{unknown}')
+
+    return _iter_run_data(runs, list(params), workers, use_processes,
+                          path_to_db)
+
+
+def _iter_run_data(runs: Mapping[int, Tuple[str, str]],
+                   params: List[str],
+                   workers: Optional[int],
+                   use_processes: bool,
+                   path_to_db: str) -> \
+        Iterator[Tuple[int, Dict[str, Dict[str, numpy.ndarray]]]]:
+    """
+    Load the data of the runs of :func:`load_many` in a pool of workers and
+    yield them as they have been loaded
+    """
+    executor_class = ProcessPoolExecutor if use_processes \
+        else ThreadPoolExecutor
+    executor = executor_class(max_workers=workers)
+    futures = {executor.submit(_load_run_data, path_to_db, table_name,
+                               run_description, params): run_id
+               for run_id, (table_name, run_description) in runs.items()}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # the runs that have not been loaded yet are not needed if the
+        # caller stops iterating early
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+
+
+def _load_run_data(path_to_db: str,
+                   table_name: str,
+                   run_description: str,
+                   columns: List[str]
+                   ) -> Dict[str, Dict[str, numpy.ndarray]]:
+    """
+    Load the data of a run in a worker of :func:`load_many`, through a
+    read-only connection of its own. The connection is not taken from the
+    pool, since the workers may be forked processes, which must not use the
+    connections of their parent process, and since the threads of the
+    workers end after loading.
+    """
+    conn = connect_read_only(path_to_db, get_DB_debug())
+    try:
+        interdeps = serial.from_json_to_current(run_description).interdeps
+        return get_parameter_data(conn, table_name, columns,
+                                  interdeps=interdeps)
+    finally:
+        conn.close()
+
+
 def new_data_set(name: str,
                  exp_id: Optional[int] = None,
                  specs: Optional[SPECS] = None,
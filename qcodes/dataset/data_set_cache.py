@@ -0,0 +1,156 @@
+"""
+This module contains the in-memory cache of the data of a run, which allows
+to poll the data of a run that is being measured, e.g. for live plotting,
+by loading only the results that have been added since the last poll.
+"""
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.sqlite.queries import (completed,
+                                           get_parameter_tree_arrays_after)
+
+if TYPE_CHECKING:
+    from qcodes.dataset.data_set import DataSet
+
+
+class _GrowingColumn:
+    """
+    The values of a parameter in a buffer that grows geometrically, such
+    that appending values takes time proportional to the number of values
+    that are appended, on average
+    """
+
+    def __init__(self) -> None:
+        self._buffer: Optional[np.ndarray] = None
+        self._length = 0
+
+    @property
+    def values(self) -> np.ndarray:
+        assert self._buffer is not None
+        return self._buffer[:self._length]
+
+    def append(self, values: np.ndarray) -> None:
+        if self._buffer is None:
+            self._buffer = values
+            self._length = len(values)
+            return
+        buffer = self._buffer
+        stop = self._length + len(values)
+        if buffer.shape[1:] != values.shape[1:] or \
+                (buffer.dtype == np.dtype('O')) != \
+                (values.dtype == np.dtype('O')):
+            # arrays that differ in shape are held as an array of arrays,
+            # just like get_parameter_data returns them
+            buffer = _as_array_of_arrays(buffer[:self._length],
+                                         len(buffer))
+            values = _as_array_of_arrays(values, len(values))
+        elif not np.can_cast(values.dtype, buffer.dtype):
+            buffer = buffer.astype(np.result_type(buffer, values))
+        if stop > len(buffer):
+            grown = np.empty((max(stop, 2 * len(buffer)),)
+                             + buffer.shape[1:], dtype=buffer.dtype)
+            grown[:self._length] = buffer[:self._length]
+            buffer = grown
+        buffer[self._length:stop] = values
+        self._buffer = buffer
+        self._length = stop
+
+
+def _as_array_of_arrays(values: np.ndarray, size: int) -> np.ndarray:
+    if values.dtype == np.dtype('O') and values.ndim == 1:
+        if len(values) == size:
+            return values
+        array_of_arrays = np.empty(size, dtype=object)
+        array_of_arrays[:len(values)] = values
+        return array_of_arrays
+    array_of_arrays = np.empty(size, dtype=object)
+    for row, value in enumerate(values):
+        array_of_arrays[row] = value
+    return array_of_arrays
+
+
+class DataSetCache:
+    """
+    The data of a :class:`.DataSet` that has been loaded into memory, see
+    :attr:`.DataSet.cache`. Every call to :meth:`data` only loads the
+    results that have been added to the run since the previous call from
+    the database, so polling the data of a run that is being measured costs
+    time proportional to the number of new results rather than to the size
+    of the run. Once the run is completed, the database is not read
+    anymore.
+
+    The cache holds the data of all the parameters that are not a dependency
+    of another parameter, i.e. the data that
+    :meth:`.DataSet.get_parameter_data` returns if called without
+    parameters.
+    """
+
+    def __init__(self, dataset: 'DataSet'):
+        self._dataset = dataset
+        self._columns: Dict[str, Dict[str, _GrowingColumn]] = {}
+        self._last_rowids: Dict[str, int] = {}
+        self._completed = False
+
+    @property
+    def completed(self) -> bool:
+        """
+        Whether all the data of the run have been loaded, i.e. whether the
+        run was completed when the data were last loaded
+        """
+        return self._completed
+
+    def data(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Load the results that have been added to the run since the
+        previous call, and return all of the data of the run.
+
+        Returns:
+            The data in the format of :meth:`.DataSet.get_parameter_data`.
+            The arrays are views of the buffers of the cache and must not
+            be modified.
+        """
+        if not self._completed:
+            self.load_data_from_db()
+        return {tree: {name: column.values
+                       for name, column in columns.items()}
+                for tree, columns in self._columns.items()}
+
+    def load_data_from_db(self) -> None:
+        """
+        Load the results that have been added to the run since the data
+        were last loaded into the cache
+        """
+        dataset = self._dataset
+        if dataset.pristine:
+            return
+        # whether the run is complete is checked before the results are
+        # loaded, such that no results added in between can be missed
+        run_completed = dataset.completed or completed(dataset.conn,
+                                                       dataset.run_id)
+        for tree, paramspecs in self._parameter_trees().items():
+            arrays, self._last_rowids[tree] = \
+                get_parameter_tree_arrays_after(dataset.conn,
+                                                dataset.table_name,
+                                                paramspecs,
+                                                self._last_rowids.get(tree,
+                                                                      0))
+            columns = self._columns.setdefault(tree, {})
+            for name, values in arrays.items():
+                columns.setdefault(name, _GrowingColumn()).append(values)
+        self._completed = run_completed
+
+    def clear(self) -> None:
+        """
+        Drop all the data from the cache, such that the next call of
+        :meth:`data` loads all of the data again
+        """
+        self._columns = {}
+        self._last_rowids = {}
+        self._completed = False
+
+    def _parameter_trees(self) -> Dict[str, List[ParamSpecBase]]:
+        interdeps = self._dataset.description.interdeps
+        return {ps.name: [ps] + list(interdeps.dependencies.get(ps, ()))
+                for ps in interdeps.non_dependencies}
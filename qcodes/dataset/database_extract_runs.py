@@ -7,16 +7,20 @@ import numpy as np
 from qcodes.dataset.descriptions.versioning.converters import new_to_old
 from qcodes.dataset.data_set import DataSet
 from qcodes.dataset.experiment_container import load_or_create_experiment
-from qcodes.dataset.sqlite.connection import atomic, ConnectionPlus
+from qcodes.dataset.sqlite.connection import atomic, ConnectionPlus, \
+    transaction
 from qcodes.dataset.sqlite.database import connect, \
     get_db_version_and_newest_available_version
 from qcodes.dataset.sqlite.queries import add_meta_data, create_run, \
     get_exp_ids_from_run_ids, get_matching_exp_ids, get_runid_from_guid, \
     is_run_id_in_database, mark_run_complete, new_experiment
-from qcodes.dataset.sqlite.query_helpers import select_many_where, \
-    sql_placeholder_string
+from qcodes.dataset.sqlite.query_helpers import select_many_where
 from qcodes.dataset.linked_datasets.links import links_to_str
 
+# the name under which the source DB file is attached to the connection to
+# the target DB file, such that results can be copied between them in SQL
+SOURCE_SCHEMA = 'extract_source'
+
 
 def extract_runs_into_db(source_db_path: str,
                          target_db_path: str, *run_ids: int,
@@ -28,6 +32,12 @@ def extract_runs_into_db(source_db_path: str,
     and ``sample_name`` in the target db. If such an experiment does not exist, it
     will be created.
 
+    All runs are copied in one transaction, and the results of each run are
+    copied with a single ``INSERT INTO ... SELECT`` statement between the
+    source DB file (which is attached to the target DB file for this) and
+    the target DB file, such that the results never have to be loaded into
+    python.
+
     Args:
         source_db_path: Path to the source DB file
         target_db_path: Path to the target DB file. The target DB file will be
@@ -97,6 +107,12 @@ def extract_runs_into_db(source_db_path: str,
     # matching both the name and sample_name
 
     try:
+        # ATTACH can not be executed within a transaction, so attach the
+        # source DB file before the atomic block; it is detached when the
+        # connection is closed
+        transaction(target_conn, f'ATTACH DATABASE ? AS "{SOURCE_SCHEMA}"',
+                    source_db_path)
+
         with atomic(target_conn) as target_conn:
 
             target_exp_id = _create_exp_if_needed(target_conn,
@@ -162,7 +178,8 @@ def _extract_single_dataset_into_db(dataset: DataSet,
     meth:`extract_runs_into_db`
 
     Insert the given dataset into the specified database file as the latest
-    run.
+    run. The DB file of the dataset must be attached to the target
+    connection as ``SOURCE_SCHEMA``.
 
     Trying to insert a run already in the DB is a NOOP.
 
@@ -209,8 +226,7 @@ def _extract_single_dataset_into_db(dataset: DataSet,
             captured_counter=captured_counter,
             parent_dataset_links=parent_dataset_links)
 
-    _populate_results_table(source_conn,
-                            target_conn,
+    _populate_results_table(target_conn,
                             dataset.table_name,
                             target_table_name)
     mark_run_complete(target_conn, target_run_id)
@@ -223,31 +239,32 @@ def _extract_single_dataset_into_db(dataset: DataSet,
         add_meta_data(target_conn, target_run_id, {'snapshot': snapshot_raw})
 
 
-def _populate_results_table(source_conn: ConnectionPlus,
-                            target_conn: ConnectionPlus,
+def _populate_results_table(target_conn: ConnectionPlus,
                             source_table_name: str,
                             target_table_name: str) -> None:
     """
-    Copy over all the entries of the results table
+    Copy over all the entries of the results table from the source DB file,
+    which must be attached to the target connection as ``SOURCE_SCHEMA``.
+    The values are copied as they are stored, without converting them to
+    python objects and back.
     """
-    get_data_query = f"""
-                     SELECT *
-                     FROM "{source_table_name}"
-                     """
-
-    source_cursor = source_conn.cursor()
-    target_cursor = target_conn.cursor()
-
-    for row in source_cursor.execute(get_data_query):
-        column_names = ','.join(row.keys()[1:])  # the first key is "id"
-        values = tuple(val for val in row[1:])
-        value_placeholders = sql_placeholder_string(len(values))
-        insert_data_query = f"""
-                             INSERT INTO "{target_table_name}"
-                             ({column_names})
-                             values {value_placeholders}
-                             """
-        target_cursor.execute(insert_data_query, values)
+    cursor = transaction(target_conn,
+                         f'PRAGMA "{SOURCE_SCHEMA}".table_info'
+                         f'("{source_table_name}")')
+    # the first column is "id"
+    column_names = ','.join(f'"{row["name"]}"'
+                            for row in cursor.fetchall()[1:])
+    if not column_names:
+        return
+
+    copy_data_query = f"""
+                      INSERT INTO "{target_table_name}"
+                      ({column_names})
+                      SELECT {column_names}
+                      FROM "{SOURCE_SCHEMA}"."{source_table_name}"
+                      ORDER BY id
+                      """
+    transaction(target_conn, copy_data_query)
 
 
 def _rewrite_timestamps(target_conn: ConnectionPlus, target_run_id: int,
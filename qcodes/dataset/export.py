@@ -0,0 +1,444 @@
+"""
+This module contains the export of a run to a standalone HDF5 file, which
+can be opened for analysis without the database the run was measured into,
+and the loading of the data of a run back from such a file.
+
+The file holds one group per parameter that is not a dependency of other
+parameters (the same trees as :meth:`.DataSet.get_parameter_data` returns)
+with one dataset per parameter of the tree::
+
+    /data/<parameter>/<parameter>
+    /data/<parameter>/<setpoint>
+    ...
+
+The leading dimension of the datasets of a tree is the result index. The
+run description, metadata and snapshot of the run are stored as JSON
+strings next to the ``data`` group, and the remaining properties of the
+run, e.g. its GUID and timestamps, as attributes of the file. Every
+dataset also carries the label, unit and type of its parameter as
+attributes, such that the file is self-describing to generic HDF5 tools.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, \
+    TYPE_CHECKING
+
+import h5py
+import numpy as np
+
+import qcodes.dataset.descriptions.versioning.serialization as serial
+from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
+from qcodes.dataset.descriptions.rundescriber import RunDescriber
+from qcodes.dataset.descriptions.versioning.converters import v1_to_v0
+from qcodes.dataset.linked_datasets.links import (Link, links_to_str,
+                                                  str_to_links)
+from qcodes.dataset.sqlite.queries import get_parameter_tree_length
+
+if TYPE_CHECKING:
+    from qcodes.dataset.data_set import DataSet
+
+
+# the version of the layout of the exported files, to be bumped whenever
+# the layout changes in a way that older versions of load_from_export can
+# not read
+EXPORT_FORMAT_VERSION = 1
+
+# the size of the chunks of compressed datasets; HDF5 reads and decompresses
+# whole chunks, so these should be small enough to make reading a few
+# results cheap and large enough to compress well
+_TARGET_CHUNK_BYTES = 2**20
+
+_STRING_DTYPE = h5py.string_dtype()
+
+# the dtypes of the datasets of parameters without any results
+_PARAMTYPE_TO_DTYPE = {'numeric': np.dtype(np.float64),
+                       'complex': np.dtype(np.complex128),
+                       'array': np.dtype(np.float64),
+                       'text': _STRING_DTYPE}
+
+_RUN_ATTRIBUTES = ('guid', 'run_id', 'captured_run_id', 'counter',
+                   'captured_counter', 'name', 'exp_name', 'sample_name',
+                   'run_timestamp_raw', 'completed_timestamp_raw')
+
+
+def export_to_hdf5(dataset: 'DataSet',
+                   path: str,
+                   compression: Optional[str] = 'gzip',
+                   compression_opts: Any = None,
+                   chunk_rows: int = 10000) -> None:
+    """
+    Export the data and metadata of a run to an HDF5 file, which can be
+    loaded with :func:`load_from_export`. The data are read from the
+    database and written to the file in chunks of results, such that runs
+    that are too large to load into memory at once can be exported as well.
+    Results that are added to the run while it is being exported are not
+    exported.
+
+    Args:
+        dataset: the run to export
+        path: the path of the file to write; an existing file is overwritten
+        compression: the HDF5 compression filter of the datasets, e.g.
+            'gzip' or 'lzf'. If None, the data are stored uncompressed and
+            contiguously, which makes the file larger, but allows
+            :func:`load_from_export` to memory map the numeric data instead
+            of reading them.
+        compression_opts: options of the compression filter, e.g. the
+            compression level of 'gzip'
+        chunk_rows: the maximal number of results per parameter to read
+            from the database at a time
+
+    Raises:
+        ValueError: if the arrays of an 'array' parameter differ in shape
+            between results, which can not be stored in a single dataset
+    """
+    interdeps = dataset.description.interdeps
+    trees = {ps.name: [ps] + list(interdeps.dependencies.get(ps, ()))
+             for ps in interdeps.non_dependencies}
+    # the number of results is counted up front such that the datasets can
+    # be allocated at their final size, which is required for contiguous
+    # storage
+    lengths = {name: get_parameter_tree_length(dataset.conn,
+                                               dataset.table_name,
+                                               paramspecs)
+               for name, paramspecs in trees.items()}
+
+    with h5py.File(path, 'w') as file:
+        _write_run(file, dataset)
+        data = file.create_group('data', track_order=True)
+        for name in trees:
+            data.create_group(name, track_order=True)
+
+        offsets = dict.fromkeys(trees, 0)
+        for chunk in dataset.iter_parameter_data(chunk_rows=chunk_rows):
+            for tree_name, arrays in chunk.items():
+                if not arrays:
+                    continue
+                start = offsets[tree_name]
+                n_rows = min(len(next(iter(arrays.values()))),
+                             lengths[tree_name] - start)
+                if n_rows <= 0:
+                    continue
+                group = data[tree_name]
+                for name, values in arrays.items():
+                    values = _to_storable(name, values[:n_rows])
+                    if name not in group:
+                        _create_dataset(group, name, values.dtype,
+                                        (lengths[tree_name],)
+                                        + values.shape[1:],
+                                        compression, compression_opts)
+                    h5_dataset = _fit_dataset(group, name, values, start)
+                    h5_dataset[start:start + n_rows] = values
+                offsets[tree_name] = start + n_rows
+
+        for tree_name, paramspecs in trees.items():
+            group = data[tree_name]
+            for ps in paramspecs:
+                if ps.name not in group:
+                    _create_dataset(group, ps.name,
+                                    _PARAMTYPE_TO_DTYPE[ps.type], (0,),
+                                    None, None)
+                _write_paramspec(group[ps.name], ps,
+                                 interdeps.dependencies.get(ps, ()))
+
+
+def _write_run(file: h5py.File, dataset: 'DataSet') -> None:
+    """
+    Write the description and properties of a run to the root of a file
+    """
+    file.attrs['export_format_version'] = EXPORT_FORMAT_VERSION
+    for attribute in _RUN_ATTRIBUTES:
+        value = getattr(dataset, attribute)
+        # HDF5 attributes can not be None, a missing attribute means None
+        if value is not None:
+            file.attrs[attribute] = value
+    file.attrs['parent_dataset_links'] = links_to_str(
+        dataset.parent_dataset_links)
+
+    # these may be larger than the 64 kB that fit in an HDF5 attribute
+    file.create_dataset('run_description', dtype=_STRING_DTYPE,
+                        data=serial.to_json_for_storage(dataset.description))
+    file.create_dataset('metadata', dtype=_STRING_DTYPE,
+                        data=json.dumps(dataset.metadata))
+    if dataset.snapshot_raw is not None:
+        file.create_dataset('snapshot', dtype=_STRING_DTYPE,
+                            data=dataset.snapshot_raw)
+
+
+def _write_paramspec(h5_dataset: h5py.Dataset,
+                     paramspec: ParamSpecBase,
+                     depends_on: Sequence[ParamSpecBase]) -> None:
+    h5_dataset.attrs['paramtype'] = paramspec.type
+    h5_dataset.attrs['label'] = paramspec.label
+    h5_dataset.attrs['unit'] = paramspec.unit
+    if depends_on:
+        h5_dataset.attrs['depends_on'] = ', '.join(ps.name
+                                                   for ps in depends_on)
+
+
+def _to_storable(name: str, values: np.ndarray) -> np.ndarray:
+    """
+    Convert the values of a parameter to an array that h5py can write, i.e.
+    strings to an object array of python strings
+    """
+    if values.dtype.kind == 'U':
+        return values.astype(object)
+    if values.dtype.kind == 'O':
+        if all(isinstance(value, str) for value in values.flat):
+            return values
+        raise ValueError(f'Can not export {name}, its values are not all '
+                         f'strings or arrays of the same shape.')
+    return values
+
+
+def _create_dataset(group: h5py.Group,
+                    name: str,
+                    dtype: np.dtype,
+                    shape: Tuple[int, ...],
+                    compression: Optional[str],
+                    compression_opts: Any) -> h5py.Dataset:
+    if dtype.kind == 'O':
+        dtype = _STRING_DTYPE
+    chunks: Optional[Tuple[int, ...]] = None
+    # the byte shuffle filter makes numbers compress better
+    shuffle = compression is not None and dtype.kind != 'O'
+    if compression is not None and shape[0] > 0:
+        row_bytes = max(1, int(np.prod(shape[1:], dtype=np.int64))
+                        * dtype.itemsize)
+        chunk_rows = max(1, min(shape[0], _TARGET_CHUNK_BYTES // row_bytes))
+        chunks = (chunk_rows,) + shape[1:]
+    else:
+        compression = compression_opts = None
+        shuffle = False
+    return group.create_dataset(name, shape=shape, dtype=dtype,
+                                chunks=chunks, compression=compression,
+                                compression_opts=compression_opts,
+                                shuffle=shuffle)
+
+
+def _fit_dataset(group: h5py.Group,
+                 name: str,
+                 values: np.ndarray,
+                 n_written: int) -> h5py.Dataset:
+    """
+    Return the dataset of a parameter, recreated with a wider dtype if the
+    values to write to it do not fit its dtype. The dtype of the values of
+    a 'numeric' parameter, for instance, becomes float when the first
+    non-integer value is read, which may happen after the first chunk. The
+    ``n_written`` rows that were written already are copied over in blocks,
+    such that they are never all in memory at once.
+    """
+    h5_dataset = group[name]
+    if h5_dataset.shape[1:] != values.shape[1:]:
+        raise ValueError(f'Can not export {name}, its arrays differ in '
+                         f'shape between results.')
+    if np.can_cast(values.dtype, h5_dataset.dtype):
+        return h5_dataset
+
+    dtype = np.result_type(h5_dataset.dtype, values.dtype)
+    options = dict(shape=h5_dataset.shape, chunks=h5_dataset.chunks,
+                   compression=h5_dataset.compression,
+                   compression_opts=h5_dataset.compression_opts,
+                   shuffle=h5_dataset.shuffle)
+    widened = group.create_dataset(f'{name}__widened', dtype=dtype,
+                                   **options)
+    row_bytes = max(1, int(np.prod(h5_dataset.shape[1:], dtype=np.int64))
+                    * dtype.itemsize)
+    block_rows = max(1, _TARGET_CHUNK_BYTES // row_bytes)
+    for block_start in range(0, n_written, block_rows):
+        block_stop = min(block_start + block_rows, n_written)
+        widened[block_start:block_stop] = h5_dataset[block_start:block_stop]
+    del group[name]
+    group.move(widened.name, name)
+    return group[name]
+
+
+class ExportedDataSet:
+    """
+    A run that is loaded from a file written by :func:`export_to_hdf5`,
+    see :func:`load_from_export`. It gives read-only access to the data and
+    metadata of the run, in the same format as the :class:`.DataSet` that
+    was exported, without a database.
+    """
+
+    def __init__(self, path: str, memmap: bool = True):
+        """
+        Args:
+            path: the path of the exported file
+            memmap: whether to memory map the numeric data of uncompressed
+                files instead of reading them into memory
+        """
+        self.path = path
+        self._memmap = memmap
+        with h5py.File(path, 'r') as file:
+            version = file.attrs.get('export_format_version')
+            if version is None:
+                raise ValueError(f'{path} is not an exported QCoDeS run.')
+            if version > EXPORT_FORMAT_VERSION:
+                raise ValueError(f'{path} was exported by a newer version '
+                                 f'of QCoDeS (format version {version}), '
+                                 f'please upgrade QCoDeS to load it.')
+            self._attrs = dict(file.attrs)
+            self._description = serial.from_json_to_current(
+                file['run_description'].asstr()[()])
+            self._metadata = json.loads(file['metadata'].asstr()[()])
+            self._snapshot_raw: Optional[str] = None
+            if 'snapshot' in file:
+                self._snapshot_raw = file['snapshot'].asstr()[()]
+
+    def _get_attribute(self, name: str) -> Any:
+        value = self._attrs.get(name)
+        # h5py returns numbers as numpy scalars
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    @property
+    def guid(self) -> str:
+        return self._get_attribute('guid')
+
+    @property
+    def run_id(self) -> int:
+        return self._get_attribute('run_id')
+
+    @property
+    def captured_run_id(self) -> int:
+        return self._get_attribute('captured_run_id')
+
+    @property
+    def counter(self) -> int:
+        return self._get_attribute('counter')
+
+    @property
+    def captured_counter(self) -> int:
+        return self._get_attribute('captured_counter')
+
+    @property
+    def name(self) -> str:
+        return self._get_attribute('name')
+
+    @property
+    def exp_name(self) -> str:
+        return self._get_attribute('exp_name')
+
+    @property
+    def sample_name(self) -> str:
+        return self._get_attribute('sample_name')
+
+    @property
+    def run_timestamp_raw(self) -> Optional[float]:
+        return self._get_attribute('run_timestamp_raw')
+
+    @property
+    def completed_timestamp_raw(self) -> Optional[float]:
+        return self._get_attribute('completed_timestamp_raw')
+
+    @property
+    def parent_dataset_links(self) -> List[Link]:
+        return str_to_links(self._get_attribute('parent_dataset_links'))
+
+    @property
+    def description(self) -> RunDescriber:
+        return self._description
+
+    @property
+    def paramspecs(self) -> Dict[str, ParamSpec]:
+        old_interdeps = v1_to_v0(self._description).interdeps
+        return {ps.name: ps for ps in old_interdeps.paramspecs}
+
+    @property
+    def dependent_parameters(self) -> Tuple[ParamSpecBase, ...]:
+        return tuple(self._description.interdeps.dependencies.keys())
+
+    @property
+    def metadata(self) -> Dict:
+        return self._metadata
+
+    @property
+    def snapshot(self) -> Optional[dict]:
+        """Snapshot of the run as dictionary (or None)"""
+        if self._snapshot_raw is None:
+            return None
+        return json.loads(self._snapshot_raw)
+
+    @property
+    def snapshot_raw(self) -> Optional[str]:
+        """Snapshot of the run as a JSON-formatted string (or None)"""
+        return self._snapshot_raw
+
+    def get_parameter_data(
+            self,
+            *params: Union[str, ParamSpecBase]
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Returns the exported values of the specified parameters and their
+        dependencies in the format of :meth:`.DataSet.get_parameter_data`.
+        The numeric data of files that were exported without compression
+        are memory mapped, unless this was disabled when loading the file,
+        i.e. they are only read from disk as they are accessed.
+
+        Args:
+            *params: string parameter names and ParamSpec objects of
+                parameters that are not dependencies of other parameters.
+                If no parameters are supplied, the data of all of those are
+                returned.
+
+        Returns:
+            Dictionary from requested parameters to Dict of parameter names
+            to numpy arrays containing the data points
+        """
+        interdeps = self._description.interdeps
+        top_level = [ps.name for ps in interdeps.non_dependencies]
+        names = [param if isinstance(param, str) else param.name
+                 for param in params] or top_level
+        for name in names:
+            if name not in top_level:
+                raise ValueError(f'Unknown parameter {name}, the exported '
+                                 f'parameters are {top_level}. Parameters '
+                                 f'that are a dependency of another '
+                                 f'parameter are exported along with that '
+                                 f'parameter.')
+
+        output: Dict[str, Dict[str, np.ndarray]] = {}
+        with h5py.File(self.path, 'r') as file:
+            for name in names:
+                group = file['data'][name]
+                if group[name].shape[0] == 0:
+                    output[name] = {}
+                    continue
+                paramspec = interdeps._id_to_paramspec[name]
+                tree = [name] + [ps.name for ps in
+                                 interdeps.dependencies.get(paramspec, ())]
+                output[name] = {param: self._read(group[param])
+                                for param in tree}
+        return output
+
+    def _read(self, h5_dataset: h5py.Dataset) -> np.ndarray:
+        if h5_dataset.dtype.kind == 'O':
+            return h5_dataset.asstr()[...].astype(str)
+        offset = h5_dataset.id.get_offset()
+        if (self._memmap and h5_dataset.chunks is None
+                and offset is not None):
+            return np.memmap(self.path, mode='r', dtype=h5_dataset.dtype,
+                             offset=offset, shape=h5_dataset.shape)
+        return h5_dataset[...]
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}({self.path!r}): '
+                f'{self.name}, run {self.captured_run_id} of '
+                f'{self.exp_name} ({self.sample_name})')
+
+
+def load_from_export(path: str, memmap: bool = True) -> ExportedDataSet:
+    """
+    Load a run from a file written by :meth:`.DataSet.export`. Only the
+    metadata of the run are read when loading, the data are read from the
+    file when they are requested.
+
+    Args:
+        path: the path of the exported file
+        memmap: whether to memory map the numeric data of files that were
+            exported without compression instead of reading them into memory
+
+    Returns:
+        The exported run
+    """
+    return ExportedDataSet(path, memmap=memmap)
@@ -1,4 +1,14 @@
-from typing import Any
+import json
+import math
+import threading
+import time
+from typing import (Any, Dict, List, Optional, Sequence, Tuple,
+                    TYPE_CHECKING)
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from qcodes.dataset.data_set import DataSet
 
 
 json_template_linear={"type": 'linear',
@@ -48,3 +58,233 @@ def export_data_as_json_heatmap(
             state['data']['xlen'], state['data']['ylen']).tolist()
         with open(location, mode='w') as f:
             json.dump(state['json'], f)
+
+
+class JSONLinesExporter:
+    """
+    Subscriber callback that streams the results of a :class:`.DataSet` to a
+    file in the JSON lines format (one JSON document per line), for example
+    to watch a long-running measurement live in another program. Unlike
+    :func:`export_data_as_json_linear` and :func:`export_data_as_json_heatmap`,
+    which rewrite the whole document on every update, every write only
+    appends the results that came in since the previous write, such that
+    the cost of an update does not grow with the size of the measurement.
+
+    The first line of the file describes the exported parameters::
+
+        {"type": "header", "parameters": [{"name": "x", "unit": "V", ...}]}
+
+    and each following line holds a block of consecutive results::
+
+        {"type": "data", "start": 0, "data": {"x": [...], "y": [...]}}
+
+    where ``start`` is the index in the dataset of the first result of the
+    block. Missing values, NaN and infinite values are written as ``null``
+    (such that every line is valid JSON). The file can be read back with
+    :func:`load_json_lines`.
+
+    The exported results are also kept in preallocated numpy arrays (see
+    :attr:`data`) that grow geometrically. Disk writes are limited to one
+    per ``min_write_interval`` seconds; the remaining results are written
+    when the dataset is completed or when :meth:`flush` is called.
+
+    Example:
+        >>> exporter = JSONLinesExporter(dataset, 'live.jsonl')
+        >>> dataset.subscribe(exporter, min_wait=0, min_count=1)
+
+    Args:
+        dataset: the dataset whose results are exported
+        location: path of the file to write to. An existing file is
+            overwritten.
+        parameters: names of the parameters to export; all parameters of
+            the dataset if not given
+        min_write_interval: minimal time in seconds between two writes
+        initial_size: the number of results to preallocate memory for
+    """
+
+    def __init__(self,
+                 dataset: 'DataSet',
+                 location: str,
+                 parameters: Optional[Sequence[str]] = None,
+                 min_write_interval: float = 1.0,
+                 initial_size: int = 1024) -> None:
+        self._dataset = dataset
+        self._location = location
+        self._min_write_interval = min_write_interval
+
+        # the results are handed to subscribers as tuples of the values of
+        # all parameters of the dataset in this order
+        all_names = [ps.name for ps in dataset.get_parameters()]
+        if parameters is None:
+            parameters = all_names
+        unknown = set(parameters) - set(all_names)
+        if unknown:
+            raise ValueError(f'Unknown parameter(s) {sorted(unknown)}, the '
+                             f'dataset has parameters {all_names}.')
+        self._indices = {name: all_names.index(name) for name in parameters}
+
+        interdeps = dataset.description.interdeps
+        setpoints = {ps.name for deps in interdeps.dependencies.values()
+                     for ps in deps}
+        paramspecs = {ps.name: ps for ps in interdeps.paramspecs}
+
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name in parameters:
+            if paramspecs[name].type == 'numeric':
+                self._arrays[name] = np.full(initial_size, np.nan)
+            else:
+                self._arrays[name] = np.full(initial_size, None, dtype=object)
+        self._capacity = initial_size
+
+        # the index in the dataset of the first result that we receive
+        self._offset: Optional[int] = None
+        self._n_results = 0
+        self._n_written = 0
+        self._last_write = -np.inf
+        self._lock = threading.Lock()
+
+        header = {'type': 'header',
+                  'parameters': [{'name': name,
+                                  'paramtype': paramspecs[name].type,
+                                  'label': paramspecs[name].label,
+                                  'unit': paramspecs[name].unit,
+                                  'is_setpoint': name in setpoints}
+                                 for name in parameters]}
+        with open(location, mode='w') as f:
+            f.write(json.dumps(header) + '\n')
+
+    @property
+    def data(self) -> Dict[str, np.ndarray]:
+        """
+        The results received so far as dict from parameter name to a (view
+        of a) numpy array of its values
+        """
+        return {name: array[:self._n_results]
+                for name, array in self._arrays.items()}
+
+    def __call__(self, results: List[Tuple[Any, ...]], length: int,
+                 state: Optional[Any] = None) -> None:
+        with self._lock:
+            if len(results) > 0:
+                if self._offset is None:
+                    self._offset = length - len(results)
+                self._append(results)
+            if (self._dataset.completed or
+                    time.monotonic() - self._last_write
+                    >= self._min_write_interval):
+                self._write()
+
+    def flush(self) -> None:
+        """
+        Write all the results received so far to the file
+        """
+        with self._lock:
+            self._write()
+
+    def _append(self, results: List[Tuple[Any, ...]]) -> None:
+        start = self._n_results
+        stop = start + len(results)
+        if stop > self._capacity:
+            self._grow(max(stop, 2 * self._capacity))
+
+        for name, index in self._indices.items():
+            array = self._arrays[name]
+            if array.dtype == object:
+                # assign one by one, such that array values are not
+                # broadcast into the array
+                for i, row in enumerate(results, start):
+                    array[i] = row[index]
+            else:
+                array[start:stop] = [np.nan if row[index] is None
+                                     else row[index] for row in results]
+        self._n_results = stop
+
+    def _grow(self, capacity: int) -> None:
+        for name, array in self._arrays.items():
+            if array.dtype == object:
+                grown = np.full(capacity, None, dtype=object)
+            else:
+                grown = np.full(capacity, np.nan)
+            grown[:self._n_results] = array[:self._n_results]
+            self._arrays[name] = grown
+        self._capacity = capacity
+
+    def _write(self) -> None:
+        start, stop = self._n_written, self._n_results
+        if stop == start:
+            return
+        assert self._offset is not None
+        block = {'type': 'data',
+                 'start': self._offset + start,
+                 'data': {name: _to_json_values(array[start:stop])
+                          for name, array in self._arrays.items()}}
+        with open(self._location, mode='a') as f:
+            f.write(json.dumps(block, default=_to_json_value) + '\n')
+        self._n_written = stop
+        self._last_write = time.monotonic()
+
+
+def load_json_lines(location: str) -> Dict[str, np.ndarray]:
+    """
+    Load the results from a file written by :class:`JSONLinesExporter`. A
+    partially written last line (of a file that is still being written to)
+    is ignored.
+
+    Args:
+        location: path of the file
+
+    Returns:
+        Dict from parameter name to a numpy array of its values. The values
+        of numeric parameters are returned as floats with NaN for missing
+        values, all other values as python objects.
+    """
+    with open(location) as f:
+        header = json.loads(f.readline())
+        columns: Dict[str, List[Any]] = {
+            param['name']: [] for param in header['parameters']}
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            block = json.loads(line)
+            for name, values in block['data'].items():
+                columns[name] += values
+
+    arrays = {}
+    for param in header['parameters']:
+        values = columns[param['name']]
+        if param['paramtype'] == 'numeric':
+            arrays[param['name']] = np.array(
+                [np.nan if value is None else value for value in values],
+                dtype=float)
+        else:
+            array = np.empty(len(values), dtype=object)
+            for i, value in enumerate(values):
+                array[i] = value
+            arrays[param['name']] = array
+    return arrays
+
+
+def _to_json_values(array: np.ndarray) -> List[Any]:
+    """
+    Convert an array of values to a list of values that can be serialized
+    to JSON (see also :func:`_to_json_value`), with NaN and infinite values
+    as None
+    """
+    if array.dtype == object:
+        return array.tolist()
+    return [value if math.isfinite(value) else None
+            for value in array.tolist()]
+
+
+def _to_json_value(value: Any) -> Any:
+    """
+    Convert values that the json module can not serialize by itself
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON '
+                    f'serializable')
@@ -7,6 +7,8 @@ using the :class:`.Measurement` class.
 
 import json
 import logging
+from queue import Queue
+from threading import Thread
 from time import perf_counter
 from typing import (Callable, Union, Dict, Tuple, List, Sequence, cast, Set,
                     MutableMapping, MutableSequence, Optional, Any, TypeVar)
@@ -27,7 +29,9 @@ from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
 from qcodes.dataset.descriptions.dependencies import (
     InterDependencies_, DependencyError, InferenceError)
 from qcodes.dataset.data_set import DataSet, VALUE, load_by_guid
+from qcodes.dataset.sqlite.database import connect
 from qcodes.dataset.linked_datasets.links import Link
+from qcodes.dataset.staging import StagedRun
 from qcodes.utils.helpers import NumpyJSONEncoder
 from qcodes.utils.deprecate import deprecate
 import qcodes.utils.validators as vals
@@ -45,6 +49,7 @@ res_type = Tuple[Union[_BaseParameter, str],
                        Sequence[scalar_res_types]]]
 setpoints_type = Sequence[Union[str, _BaseParameter]]
 numeric_types = Union[float, int]
+columns_type = Dict[str, Union[np.ndarray, Sequence[VALUE]]]
 
 
 class ParameterTypeError(Exception):
@@ -67,17 +72,94 @@ def is_number(thing: Any) -> bool:
         return False
 
 
+class _BackgroundWriter(Thread):
+    """
+    Thread that writes the results handed over by a :class:`DataSaver` to
+    the database, such that the thread performing the measurement does not
+    have to wait for the database.
+
+    The writer uses its own connection to the database file of the dataset,
+    since sqlite connections can not be shared between threads. The results
+    are passed via a bounded queue; when the queue is full, handing over
+    more results blocks until the writer has caught up (back-pressure).
+
+    If writing fails, the exception is stored in ``exception`` and all
+    further results are discarded. It is up to the :class:`DataSaver` to
+    raise the error in the measurement thread.
+
+    The _BackgroundWriter is not meant to be instantiated directly, but
+    rather used via the ``write_in_background`` option of
+    :meth:`Measurement.run`.
+    """
+    def __init__(self, dataset: DataSet, max_queue_size: int) -> None:
+        super().__init__(daemon=True)
+        self._path_to_db = dataset.path_to_db
+        self._run_id = dataset.run_id
+        # results are written via another dataset object, which publishes
+        # them to the subscribers of this one
+        self._subscribers = dataset.subscribers
+        self.queue: Queue = Queue(maxsize=max_queue_size)
+        self.exception: Optional[Exception] = None
+
+    def run(self) -> None:
+        dataset: Optional[DataSet] = None
+        try:
+            conn = connect(self._path_to_db)
+            dataset = DataSet(conn=conn, run_id=self._run_id)
+            dataset.subscribers = self._subscribers
+        except Exception as e:
+            log.exception('Could not start writing in the background')
+            self.exception = e
+
+        while True:
+            results = self.queue.get()
+            try:
+                if results is None:
+                    break
+                if dataset is not None and self.exception is None:
+                    dataset.add_results_from_columns(results)
+            except Exception as e:
+                log.exception('Could not commit to database in the '
+                              'background')
+                self.exception = e
+            finally:
+                self.queue.task_done()
+
+        if dataset is not None:
+            dataset.conn.close()
+
+    def stop(self) -> None:
+        """
+        Ask the writer to stop once all queued results have been written
+        and wait for it to do so
+        """
+        self.queue.put(None)
+        self.join()
+
+
 class DataSaver:
     """
     The class used by the :class:`Runner` context manager to handle the
     datasaving to the database.
+
+    If a ``staging_dir`` is given, the results are written to a local
+    staging DB file instead, see :class:`.StagedRun`. The :attr:`dataset`
+    then has no results until the staged run has been merged into the
+    database after the measurement; read the results from
+    :attr:`results_dataset` while measuring, e.g. to plot them.
     """
 
     default_callback: Optional[dict] = None
 
+    # the maximum number of flushes that can be waiting to be written by the
+    # background writer before adding more results blocks
+    background_queue_size: int = 10
+
     def __init__(self, dataset: DataSet,
                  write_period: numeric_types,
-                 interdeps: InterDependencies_) -> None:
+                 interdeps: InterDependencies_,
+                 write_in_background: bool = False,
+                 staging_dir: Optional[str] = None) -> None:
         self._dataset = dataset
         if DataSaver.default_callback is not None \
                 and 'run_tables_subscription_callback' \
@@ -103,7 +185,7 @@ class DataSaver:
         self._interdeps = interdeps
         self.write_period = float(write_period)
         # self._results will be filled by add_result
-        self._results: List[Dict[str, VALUE]] = []
+        self._results: List[columns_type] = []
         self._last_save_time = perf_counter()
         self._known_dependencies: Dict[str, List[str]] = {}
         self.parent_datasets: List[DataSet] = []
@@ -111,6 +193,22 @@ class DataSaver:
         for link in self._dataset.parent_dataset_links:
             self.parent_datasets.append(load_by_guid(link.tail))
 
+        self._staged_run: Optional[StagedRun] = None
+        # the dataset that the results are written to
+        self._results_dataset = self._dataset
+        if staging_dir is not None:
+            self._staged_run = StagedRun(self._dataset, staging_dir)
+            self._results_dataset = self._staged_run.dataset
+
+        self._writer: Optional[_BackgroundWriter] = None
+        if write_in_background:
+            if self._results_dataset.path_to_db == '':
+                raise ValueError('Can not write in the background to an '
+                                 'in-memory database.')
+            self._writer = _BackgroundWriter(self._results_dataset,
+                                             self.background_queue_size)
+            self._writer.start()
+
     def add_result(self, *res_tuple: res_type) -> None:
         """
         Add a result to the measurement results. Represents a measurement
@@ -368,7 +466,7 @@ class DataSaver:
                                      f'type {vals.dtype} ({vals}).')
 
     def _enqueue_results(
-            self, result_dict: Dict[ParamSpecBase, values_type]) -> None:
+            self, result_dict: Dict[ParamSpecBase, np.ndarray]) -> None:
         """
         Enqueue the results into self._results
 
@@ -377,9 +475,10 @@ class DataSaver:
         effectively mimicking making one call to add_result per parameter
         tree.
 
-        Deal with 'numeric' type parameters. If a 'numeric' top level parameter
-        has non-scalar shape, it must be unrolled into a list of dicts of
-        single values (database).
+        The results are enqueued column-wise, i.e. as one block of columns
+        (one column per parameter) per parameter tree. If a 'numeric' top
+        level parameter has non-scalar shape, it is unrolled into flat numpy
+        columns (one element per database row) instead of one dict per row.
         """
 
         interdeps = self._interdeps
@@ -392,18 +491,18 @@ class DataSaver:
             all_params = (inff_params
                           .union(deps_params)
                           .union({toplevel_param}))
-            res_dict: Dict[str, VALUE] = {}  # the dict to append to _results
+            res_columns: columns_type
             if toplevel_param.type == 'array':
-                res_list = self._finalize_res_dict_array(
+                res_columns = self._finalize_res_dict_array(
                     result_dict, all_params)
             elif toplevel_param.type in ('numeric', 'text', 'complex'):
-                res_list = self._finalize_res_dict_numeric_text_or_complex(
-                               result_dict, toplevel_param,
-                               inff_params, deps_params)
+                res_columns = self._finalize_res_dict_numeric_text_or_complex(
+                                  result_dict, toplevel_param,
+                                  inff_params, deps_params)
             else:
-                res_dict = {ps.name: result_dict[ps] for ps in all_params}
-                res_list = [res_dict]
-            self._results += res_list
+                res_columns = {ps.name: [result_dict[ps]]
+                               for ps in all_params}
+            self._results.append(res_columns)
 
         # Finally, handle standalone parameters
 
@@ -416,12 +515,12 @@ class DataSaver:
 
     @staticmethod
     def _finalize_res_dict_array(
-            result_dict: Dict[ParamSpecBase, values_type],
-            all_params: Set[ParamSpecBase]) -> List[Dict[str, VALUE]]:
+            result_dict: Dict[ParamSpecBase, np.ndarray],
+            all_params: Set[ParamSpecBase]) -> columns_type:
         """
-        Make a list of res_dicts out of the results for a 'array' type
-        parameter. The results are assumed to already have been validated for
-        type and shape
+        Make a block of columns out of the results for a 'array' type
+        parameter. The block holds a single row. The results are assumed to
+        already have been validated for type and shape
         """
         def reshaper(val: Any, ps: ParamSpecBase) -> VALUE:
             paramtype = ps.type
@@ -440,92 +539,89 @@ class DataSaver:
                 raise ValueError(f'Cannot handle unknown paramtype '
                                  f'{paramtype!r} of {ps!r}.')
 
-        res_dict = {ps.name: reshaper(result_dict[ps], ps)
-                    for ps in all_params}
+        res_columns: columns_type = {ps.name: [reshaper(result_dict[ps], ps)]
+                                     for ps in all_params}
 
-        return [res_dict]
+        return res_columns
 
     @staticmethod
     def _finalize_res_dict_numeric_text_or_complex(
             result_dict: Dict[ParamSpecBase, np.ndarray],
             toplevel_param: ParamSpecBase,
             inff_params: Set[ParamSpecBase],
-            deps_params: Set[ParamSpecBase]) -> List[Dict[str, VALUE]]:
+            deps_params: Set[ParamSpecBase]) -> columns_type:
         """
-        Make a res_dict in the format expected by DataSet.add_results out
-        of the results for a 'numeric' or text type parameter. This includes
-        replicating and unrolling values as needed and also handling the corner
-        case of np.array(1) kind of values
+        Make a block of columns in the format expected by
+        DataSet.add_results_from_columns out of the results for a 'numeric'
+        or text type parameter. This includes replicating and unrolling values
+        as needed and also handling the corner case of np.array(1) kind of
+        values
         """
 
-        res_list: List[Dict[str, VALUE]] = []
-        all_params = inff_params.union(deps_params).union({toplevel_param})
-
-        t_map = {'numeric': float, 'text': str, 'complex': complex}
-
-        toplevel_shape = result_dict[toplevel_param].shape
-        if toplevel_shape == ():
-            # In the case of a single value, life is reasonably simple
-            res_list = [{ps.name: t_map[ps.type](result_dict[ps])
-                         for ps in all_params}]
-        else:
-            # We first massage all values into np.arrays of the same
-            # shape
-            flat_results: Dict[str, np.ndarray]= {}
-
-            toplevel_val = result_dict[toplevel_param]
-            flat_results[toplevel_param.name] = toplevel_val.ravel()
-            N = len(flat_results[toplevel_param.name])
-            for dep in deps_params:
-                if result_dict[dep].shape == ():
-                    flat_results[dep.name] = np.repeat(result_dict[dep], N)
-                else:
-                    flat_results[dep.name] = result_dict[dep].ravel()
-            for inff in inff_params:
-                if np.shape(result_dict[inff]) == ():
-                    flat_results[inff.name] = np.repeat(result_dict[dep], N)
-                else:
-                    flat_results[inff.name] = result_dict[inff].ravel()
-
-            # And then put everything into the list
-
-            res_list = [{p.name: flat_results[p.name][ind] for p in all_params}
-                        for ind in range(N)]
+        # We massage all values into flat np.arrays of the same
+        # length; scalars (including the top level parameter) become
+        # arrays of length one
+        toplevel_val = result_dict[toplevel_param]
+        res_columns: columns_type = {toplevel_param.name: toplevel_val.ravel()}
+        N = toplevel_val.size
+
+        for param in deps_params.union(inff_params):
+            value = result_dict[param]
+            if np.shape(value) == ():
+                res_columns[param.name] = np.repeat(value, N)
+            else:
+                res_columns[param.name] = value.ravel()
 
-        return res_list
+        return res_columns
 
     @staticmethod
     def _finalize_res_dict_standalones(
             result_dict: Dict[ParamSpecBase, np.ndarray]
-            ) -> List[Dict[str, VALUE]]:
+            ) -> List[columns_type]:
         """
         Massage all standalone parameters into the correct shape
         """
-        res_list: List[Dict[str, VALUE]] = []
+        res_list: List[columns_type] = []
         for param, value in result_dict.items():
-            if param.type == 'text':
-                if value.shape:
-                    res_list += [{param.name: str(val)} for val in value]
-                else:
-                    res_list += [{param.name: str(value)}]
-            elif param.type == 'numeric':
-                if value.shape:
-                    res_list += [{param.name: number} for number in value]
-                else:
-                    res_list += [{param.name: float(value)}]
+            if param.type in ('text', 'numeric'):
+                res_list.append({param.name: value.ravel()})
             else:
-                res_list += [{param.name: value}]
+                res_list.append({param.name: [value]})
 
         return res_list
 
-    def flush_data_to_database(self) -> None:
+    def flush_data_to_database(self, block: bool = False) -> None:
         """
         Write the in-memory results to the database.
+
+        If the results are written in the background, they are handed over
+        to the background writer instead. This only blocks if the writer has
+        fallen too far behind, unless ``block`` is True in which case this
+        waits until all results have been written.
+
+        Args:
+            block: wait for the background writer to write all results.
+                Ignored if the results are not written in the background.
+
+        Raises:
+            RuntimeError: if writing in the background has failed
         """
+        if self._writer is not None:
+            self._raise_if_background_writing_failed()
+            if self._results != []:
+                log.debug('Handing over results to the background writer')
+                self._writer.queue.put(self._results)
+                self._results = []
+            if block:
+                self._writer.queue.join()
+                self._raise_if_background_writing_failed()
+            return
+
         log.debug('Flushing to database')
         if self._results != []:
             try:
-                write_point = self._dataset.add_results(self._results)
+                write_point = self._results_dataset.add_results_from_columns(
+                    self._results)
                 log.debug(f'Successfully wrote from index {write_point}')
                 self._results = []
             except Exception as e:
@@ -533,18 +629,55 @@ class DataSaver:
         else:
             log.debug('No results to flush')
 
+    def _raise_if_background_writing_failed(self) -> None:
+        if self._writer is not None and self._writer.exception is not None:
+            raise RuntimeError('Writing results to the database in the '
+                               'background failed') \
+                from self._writer.exception
+
+    def _stop_background_writer(self) -> None:
+        """
+        Stop the background writer (if any) once it has written all results
+        handed over to it
+        """
+        if self._writer is not None:
+            self._writer.stop()
+
+    def _finish_staged_run(self) -> None:
+        """
+        Hand the staged run (if any) over to be merged into the database,
+        which marks the dataset as completed once it is done
+        """
+        if self._staged_run is not None:
+            self._staged_run.finish()
+
     @property
     def run_id(self) -> int:
         return self._dataset.run_id
 
     @property
     def points_written(self) -> int:
-        return self._dataset.number_of_results
+        return self._results_dataset.number_of_results
 
     @property
     def dataset(self) -> DataSet:
+        """
+        The dataset of the run in the database. If the run is staged, it
+        has no results until the staged run has been merged, see
+        :attr:`results_dataset`.
+        """
         return self._dataset
 
+    @property
+    def results_dataset(self) -> DataSet:
+        """
+        The dataset that the results are written to, i.e. the staged
+        dataset while a staged run is measured and :attr:`dataset`
+        otherwise. Read the results from this dataset while measuring,
+        e.g. to plot them or from its cache.
+        """
+        return self._results_dataset
+
 
 class Runner:
     """
@@ -567,7 +700,9 @@ class Runner:
             subscribers: Sequence[Tuple[Callable,
                                         Union[MutableSequence,
                                               MutableMapping]]] = None,
-            parent_datasets: List[Dict] = []) -> None:
+            parent_datasets: List[Dict] = [],
+            write_in_background: bool = False,
+            staging_dir: Optional[str] = None) -> None:
 
         self.enteractions = enteractions
         self.exitactions = exitactions
@@ -587,6 +722,8 @@ class Runner:
             if write_period is not None else 5.0
         self.name = name if name else 'results'
         self._parent_datasets = parent_datasets
+        self._write_in_background = write_in_background
+        self._staging_dir = staging_dir
 
     def __enter__(self) -> DataSaver:
         # TODO: should user actions really precede the dataset?
@@ -635,7 +772,9 @@ class Runner:
 
         self.datasaver = DataSaver(dataset=self.ds,
                                    write_period=self.write_period,
-                                   interdeps=self._interdependencies)
+                                   interdeps=self._interdependencies,
+                                   write_in_background=self._write_in_background,
+                                   staging_dir=self._staging_dir)
 
         return self.datasaver
 
@@ -643,7 +782,15 @@ class Runner:
                  exception_type, exception_value, traceback
                  ) -> None:
         with DelayedKeyboardInterrupt():
-            self.datasaver.flush_data_to_database()
+            # when writing in the background, an error may only surface
+            # now; we still want to complete the dataset before raising it
+            write_error: Optional[Exception] = None
+            try:
+                self.datasaver.flush_data_to_database(block=True)
+            except RuntimeError as e:
+                write_error = e
+            finally:
+                self.datasaver._stop_background_writer()
 
             # perform the "teardown" events
             for func, args in self.exitactions:
@@ -661,11 +808,18 @@ class Runner:
                             f'{self.ds.guid};\nTraceback:\n{stream.getvalue()}')
 
             # and finally mark the dataset as closed, thus
-            # finishing the measurement
-            self.ds.mark_completed()
+            # finishing the measurement; a staged run is marked as closed
+            # once it has been merged into the database
+            if self._staging_dir is None:
+                self.ds.mark_completed()
+            else:
+                self.datasaver._finish_staged_run()
             log.info(f'Finished measurement with guid: {self.ds.guid}')
             self.ds.unsubscribe_all()
 
+            if write_error is not None and exception_type is None:
+                raise write_error
+
 
 T = TypeVar('T', bound='Measurement')
 
@@ -1178,14 +1332,37 @@ class Measurement:
 
         return self
 
-    def run(self) -> Runner:
+    def run(self, write_in_background: bool = False,
+            staging_dir: Optional[str] = None) -> Runner:
         """
         Returns the context manager for the experimental run
+
+        Args:
+            write_in_background: if True, results are written to the
+                database by a separate thread such that ``add_result`` does
+                not wait for the database. Errors that occur while writing
+                are raised in the measurement thread at the next flush or
+                when exiting the context manager.
+            staging_dir: a local directory to stage the results in. The run
+                is created in the database right away, but its results are
+                written to a database file of its own in this directory,
+                and merged into the database by a background thread once
+                the measurement is done. The dataset is marked as completed
+                when the merge is done, see
+                :func:`.wait_for_staged_runs`. Until then, the dataset of
+                the datasaver has no results; read them from
+                :attr:`.DataSaver.results_dataset` while measuring. If None,
+                the directory in ``qcodes.config.dataset.staging_dir`` is
+                used, if any.
         """
+        if staging_dir is None:
+            staging_dir = qcodes.config.dataset.staging_dir
         return Runner(self.enteractions, self.exitactions,
                       self.experiment, station=self.station,
                       write_period=self._write_period,
                       interdeps=self._interdeps,
                       name=self.name,
                       subscribers=self.subscribers,
-                      parent_datasets=self._parent_datasets)
+                      parent_datasets=self._parent_datasets,
+                      write_in_background=write_in_background,
+                      staging_dir=staging_dir)
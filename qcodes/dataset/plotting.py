@@ -20,8 +20,8 @@ from qcodes.dataset.data_set import load_by_run_spec, DataSet
 from qcodes.utils.plotting import auto_color_scale_from_config
 
 from .data_export import (get_data_by_id, flatten_1D_data_for_plot,
-                          get_1D_plottype, get_2D_plottype, reshape_2D_data,
-                          _strings_as_ints)
+                          get_1D_plottype, infer_2D_grid, reshape_2D_data,
+                          get_decimated_data, Grid2D, _strings_as_ints)
 
 log = logging.getLogger(__name__)
 DB = qc.config["core"]["db_location"]
@@ -98,6 +98,7 @@ def plot_dataset(dataset: DataSet,
                                                    Number]] = None,
                  complex_plot_type: str = 'real_and_imag',
                  complex_plot_phase: str = 'radians',
+                 resolution: Optional[Union[int, Tuple[int, int]]] = None,
                  **kwargs: Any) -> AxesTupleList:
     """
     Construct all plots for a given dataset
@@ -145,6 +146,13 @@ def plot_dataset(dataset: DataSet,
         complex_plot_phase: Format of phase for plotting complex-valued data,
             either ``"radians"`` or ``"degrees"``. Applicable only for the
             cases where the dataset contains complex numbers
+        resolution: If given, the level of detail of the plots in pixels
+            along the x-axis and the y-axis (an integer is used for both
+            axes). The data are then decimated while they are loaded: line
+            plots show the minimum and maximum of the data within each
+            pixel column and heatmaps show the data averaged over blocks of
+            pixels. See :func:`.get_decimated_data`. Use this for runs
+            that are too large to be plotted in full.
 
     Returns:
         A list of axes and a list of colorbars of the same length. The
@@ -176,7 +184,11 @@ def plot_dataset(dataset: DataSet,
     title = f"Run #{dataset.captured_run_id}, " \
             f"Experiment {experiment_name} ({sample_name})"
 
-    alldata: NamedData = get_data_by_id(dataset.run_id)
+    alldata: NamedData
+    if resolution is None:
+        alldata = get_data_by_id(dataset.run_id)
+    else:
+        alldata = get_decimated_data(dataset, resolution)
     alldata = _complex_to_real_preparser(alldata,
                                          conversion=complex_plot_type,
                                          degrees=degrees)
@@ -260,21 +272,22 @@ def plot_dataset(dataset: DataSet,
             ypoints = flatten_1D_data_for_plot(data[1]['data'])
             zpoints = flatten_1D_data_for_plot(data[2]['data'])
 
-            plottype = get_2D_plottype(xpoints, ypoints, zpoints)
+            grid = infer_2D_grid(xpoints, ypoints)
+            plottype = grid.plottype
 
             log.debug(f'Determined plottype: {plottype}')
 
-            how_to_plot = {'2D_grid': plot_on_a_plain_grid,
-                           '2D_equidistant': plot_on_a_plain_grid,
-                           '2D_point': plot_2d_scatterplot,
-                           '2D_unknown': plot_2d_scatterplot}
-            plot_func = how_to_plot[plottype]
-
             with _appropriate_kwargs(plottype,
                                      colorbar is not None, **kwargs) as k:
-                ax, colorbar = plot_func(xpoints, ypoints, zpoints,
-                                         ax, colorbar,
-                                         **k)
+                if plottype in ('2D_grid', '2D_equidistant'):
+                    # reuse the inferred grid to put the data on it
+                    ax, colorbar = plot_on_a_plain_grid(xpoints, ypoints,
+                                                        zpoints, ax, colorbar,
+                                                        grid=grid, **k)
+                else:
+                    ax, colorbar = plot_2d_scatterplot(xpoints, ypoints,
+                                                       zpoints, ax, colorbar,
+                                                       **k)
 
             _set_data_axes_labels(ax, data, colorbar)
 
@@ -313,6 +326,7 @@ def plot_by_id(run_id: int,
                                                  Number]] = None,
                complex_plot_type: str = 'real_and_imag',
                complex_plot_phase: str = 'radians',
+               resolution: Optional[Union[int, Tuple[int, int]]] = None,
                **kwargs: Any) -> AxesTupleList:
     """
     Construct all plots for a given `run_id`. Here `run_id` is an
@@ -331,6 +345,7 @@ def plot_by_id(run_id: int,
                         cutoff_percentile,
                         complex_plot_type,
                         complex_plot_phase,
+                        resolution,
                         **kwargs)
 
 
@@ -531,6 +546,7 @@ def plot_on_a_plain_grid(x: np.ndarray,
                          z: np.ndarray,
                          ax: matplotlib.axes.Axes,
                          colorbar: matplotlib.colorbar.Colorbar = None,
+                         grid: Optional[Grid2D] = None,
                          **kwargs: Any
                          ) -> AxesTuple:
     """
@@ -551,6 +567,8 @@ def plot_on_a_plain_grid(x: np.ndarray,
         z: The z values
         ax: The axis to plot onto
         colorbar: A colorbar to reuse the axis for
+        grid: The grid inferred by :func:`.infer_2D_grid` for x and y, such
+            that it need not be inferred again
 
     Returns:
         The matplotlib axes handle for plot and colorbar
@@ -574,7 +592,12 @@ def plot_on_a_plain_grid(x: np.ndarray,
         z_strings = np.unique(z)
         z = _strings_as_ints(z)
 
-    xrow, yrow, z_to_plot = reshape_2D_data(x, y, z)
+    xrow, yrow, z_to_plot = reshape_2D_data(x, y, z, grid)
+    # categorical axes are plotted at the integers the strings map to
+    if x_is_stringy:
+        xrow = np.arange(len(xrow))
+    if y_is_stringy:
+        yrow = np.arange(len(yrow))
 
     # we use a general edge calculator,
     # in the case of non-equidistantly spaced data
@@ -4,10 +4,15 @@ initialising it. Note that connecting/initialisation take into account
 database version and possibly perform database upgrades.
 """
 import io
+import os
 import sqlite3
+import struct
 import sys
-from os.path import expanduser, normpath
-from typing import Union, Tuple, Optional
+import threading
+import weakref
+from os.path import abspath, expanduser, normpath
+from pathlib import Path
+from typing import Dict, List, Union, Tuple, Optional
 
 import numpy as np
 from numpy import ndarray
@@ -21,27 +26,70 @@ from qcodes.utils.types import complex_types, complex_type_union
 
 
 # utility function to allow sqlite/numpy type
+# Arrays are stored as blobs in a compact format: a small fixed header
+# holding the format version, the dtype and the shape of the array, followed
+# by the raw data of the array in C order. Blobs written by older versions
+# of QCoDeS are in the .npy format of ``np.save`` (which starts with
+# ``_NPY_MAGIC``) and can still be read. The compact format can not be
+# told apart from .npy blobs by older versions of QCoDeS, which is why
+# databases are upgraded to version 9 before any compact blobs are written
+# (older versions of QCoDeS refuse to open such databases).
+_NPY_MAGIC = b'\x93NUMPY'
+_ARRAY_BLOB_MAGIC = b'\x93QCA'
+_ARRAY_BLOB_VERSION = 1
+# magic, format version, length of the dtype string and number of
+# dimensions; followed by the dtype string and the shape
+_ARRAY_BLOB_HEADER = struct.Struct('<4sBBB')
+_ARRAY_BLOB_DIM = struct.Struct('<Q')
+
+
 def _adapt_array(arr: ndarray) -> sqlite3.Binary:
     """
     See this:
     https://stackoverflow.com/questions/3425320/sqlite3-programmingerror-you-must-not-use-8-bit-bytestrings-unless-you-use-a-te
     """
-    out = io.BytesIO()
-    np.save(out, arr)
-    out.seek(0)
-    return sqlite3.Binary(out.read())
+    if arr.dtype.hasobject or arr.dtype.fields is not None:
+        # the raw data of these arrays does not hold the values
+        out = io.BytesIO()
+        np.save(out, arr)
+        out.seek(0)
+        return sqlite3.Binary(out.read())
+
+    dtype = arr.dtype.str.encode('ascii')
+    header = _ARRAY_BLOB_HEADER.pack(_ARRAY_BLOB_MAGIC, _ARRAY_BLOB_VERSION,
+                                     len(dtype), arr.ndim)
+    shape = b''.join(_ARRAY_BLOB_DIM.pack(dim) for dim in arr.shape)
+    return sqlite3.Binary(header + dtype + shape
+                          + np.ascontiguousarray(arr).tobytes())
 
 
 def _convert_array(text: bytes) -> ndarray:
-    out = io.BytesIO(text)
-    out.seek(0)
-    return np.load(out)
+    """
+    Convert a blob to a numpy array. The data of blobs in the compact
+    format is copied out of the blob, such that the returned array is
+    writable like the arrays loaded with :func:`numpy.load`.
+    """
+    if not text.startswith(_ARRAY_BLOB_MAGIC):
+        out = io.BytesIO(text)
+        out.seek(0)
+        return np.load(out)
+
+    _, version, dtype_len, ndim = _ARRAY_BLOB_HEADER.unpack_from(text)
+    if version != _ARRAY_BLOB_VERSION:
+        raise RuntimeError(f'Can not read array stored in format version '
+                           f'{version}, this version of QCoDeS supports '
+                           f'format version {_ARRAY_BLOB_VERSION}')
+    offset = _ARRAY_BLOB_HEADER.size
+    dtype = np.dtype(text[offset:offset + dtype_len].decode('ascii'))
+    offset += dtype_len
+    shape = struct.unpack_from(f'<{ndim}Q', text, offset)
+    offset += ndim * _ARRAY_BLOB_DIM.size
+    return np.frombuffer(text, dtype=dtype, count=int(np.prod(shape)),
+                         offset=offset).reshape(shape).copy()
 
 
 def _convert_complex(text: bytes) -> complex_type_union:
-    out = io.BytesIO(text)
-    out.seek(0)
-    return np.load(out)[0]
+    return _convert_array(text)[0]
 
 
 this_session_default_encoding = sys.getdefaultencoding()
@@ -100,10 +148,7 @@ def _adapt_float(fl: float) -> Union[float, str]:
 
 
 def _adapt_complex(value: complex_type_union) -> sqlite3.Binary:
-    out = io.BytesIO()
-    np.save(out, np.array([value]))
-    out.seek(0)
-    return sqlite3.Binary(out.read())
+    return _adapt_array(np.array([value]))
 
 
 def connect(name: str, debug: bool = False,
@@ -124,13 +169,7 @@ def connect(name: str, debug: bool = False,
             `ConnectionPlus`, not `sqlite3.Connection`
 
     """
-    # register numpy->binary(TEXT) adapter
-    # the typing here is ignored due to what we think is a flaw in typeshed
-    # see https://github.com/python/typeshed/issues/2429
-    sqlite3.register_adapter(np.ndarray, _adapt_array)  # type: ignore[arg-type]
-    # register binary(TEXT) -> numpy converter
-    # for some reasons mypy complains about this
-    sqlite3.register_converter("array", _convert_array)
+    _register_adapters_and_converters()
 
     sqlite3_conn = sqlite3.connect(name, detect_types=sqlite3.PARSE_DECLTYPES)
     conn = ConnectionPlus(sqlite3_conn)
@@ -146,6 +185,162 @@ def connect(name: str, debug: bool = False,
     # sqlite3 options
     conn.row_factory = sqlite3.Row
 
+    if debug:
+        conn.set_trace_callback(print)
+
+    init_db(conn)
+    perform_db_upgrade(conn, version=version)
+    return conn
+
+
+def connect_read_only(name: str, debug: bool = False) -> ConnectionPlus:
+    """
+    Connect to an existing database in read-only mode, such that any attempt
+    to write to the database raises an ``sqlite3.OperationalError``. Unlike
+    :func:`connect`, this neither creates nor upgrades the database, hence
+    the database must already be of the latest version.
+
+    The connection may be handed over to another thread than the one that
+    created it, but it must not be used by several threads at once; use one
+    connection per thread instead.
+
+    Args:
+        name: path to the sqlite file
+        debug: whether or not to turn on tracing
+
+    Returns:
+        conn: read-only connection object to the database
+    """
+    _register_adapters_and_converters()
+
+    uri = f"{Path(abspath(expanduser(name))).as_uri()}?mode=ro"
+    sqlite3_conn = sqlite3.connect(uri, uri=True,
+                                   detect_types=sqlite3.PARSE_DECLTYPES,
+                                   check_same_thread=False)
+    sqlite3_conn.row_factory = sqlite3.Row
+    conn = ConnectionPlus(sqlite3_conn)
+
+    latest_supported_version = _latest_available_version()
+    db_version = get_user_version(conn)
+
+    if db_version != latest_supported_version:
+        conn.close()
+        raise RuntimeError(f"Database {name} is version {db_version} but "
+                           f"read-only connections require version "
+                           f"{latest_supported_version}. Connect to it with "
+                           f"`connect` to upgrade it.")
+
+    if debug:
+        conn.set_trace_callback(print)
+
+    return conn
+
+
+class _ReadOnlyPool:
+    """
+    The pooled read-only connections of one thread of one process, by path
+    to the database file. The pool is dropped along with the thread-local
+    data of its thread when the thread ends; its connections are closed as
+    soon as they are not used anymore, e.g. by datasets loaded with them.
+    """
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.connections: Dict[str, ConnectionPlus] = {}
+
+
+# the pool of the current thread, and all pools of the process such that
+# they can be closed at once; the pools are created lazily, which is also
+# how a forked process gets pools of its own. The lock also serializes the
+# creation and upgrade of databases when connections are added.
+_read_only_pool_local = threading.local()
+_read_only_pools: 'weakref.WeakSet[_ReadOnlyPool]' = weakref.WeakSet()
+_read_only_pool_lock = threading.Lock()
+# the connections of the parent process of a forked process, which are
+# kept alive such that the child process neither uses nor closes them
+_inherited_connections: List[ConnectionPlus] = []
+
+
+def get_pooled_read_only_connection(path_to_db: str) -> ConnectionPlus:
+    """
+    Get a read-only connection (see :func:`connect_read_only`) to the given
+    database file from the process-wide pool of connections. The pool holds
+    one connection per database file and thread, which is reused by all
+    subsequent calls from that thread, such that loading many runs does not
+    connect to the database over and over again. Before a new connection is
+    added to the pool, the database is created or upgraded if needed.
+
+    The connections of a thread are removed from the pool when the thread
+    has ended, and a forked process does not use the connections of its
+    parent process.
+
+    The pooled connections are shared and must not be closed by their
+    users; if one is closed nevertheless, it is replaced by a new one. Use
+    :func:`close_pooled_connections` to close all of them.
+
+    Args:
+        path_to_db: path to the sqlite file
+
+    Returns:
+        conn: read-only connection object to the database
+    """
+    path_to_db = normpath(abspath(expanduser(path_to_db)))
+
+    pool: Optional[_ReadOnlyPool] = getattr(_read_only_pool_local, 'pool',
+                                            None)
+    if pool is None or pool.pid != os.getpid():
+        if pool is not None:
+            _inherited_connections.extend(pool.connections.values())
+        pool = _ReadOnlyPool()
+        _read_only_pool_local.pool = pool
+        with _read_only_pool_lock:
+            _read_only_pools.add(pool)
+
+    conn = pool.connections.get(path_to_db)
+    if conn is None or not _is_open(conn):
+        with _read_only_pool_lock:
+            connect(path_to_db).close()
+            conn = connect_read_only(path_to_db, get_DB_debug())
+        pool.connections[path_to_db] = conn
+    return conn
+
+
+def close_pooled_connections() -> None:
+    """
+    Close all the connections in the pool of read-only connections, see
+    :func:`get_pooled_read_only_connection`. The datasets that were loaded
+    with these connections can not be used anymore afterwards.
+    """
+    with _read_only_pool_lock:
+        pools = list(_read_only_pools)
+    for pool in pools:
+        if pool.pid == os.getpid():
+            for conn in list(pool.connections.values()):
+                conn.close()
+            pool.connections.clear()
+
+
+def _is_open(conn: ConnectionPlus) -> bool:
+    try:
+        conn.total_changes
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+
+def _register_adapters_and_converters() -> None:
+    """
+    Register the adapters and converters between numpy/python types and the
+    types of the columns of the database with the sqlite3 module
+    """
+    # register numpy->binary(TEXT) adapter
+    # the typing here is ignored due to what we think is a flaw in typeshed
+    # see https://github.com/python/typeshed/issues/2429
+    sqlite3.register_adapter(np.ndarray, _adapt_array)  # type: ignore[arg-type]
+    # register binary(TEXT) -> numpy converter
+    # for some reasons mypy complains about this
+    sqlite3.register_converter("array", _convert_array)
+
     # Make sure numpy ints and floats types are inserted properly
     for numpy_int in [
         np.int, np.int8, np.int16, np.int32, np.int64,
@@ -162,13 +357,6 @@ def connect(name: str, debug: bool = False,
         sqlite3.register_adapter(complex_type, _adapt_complex)  # type: ignore[arg-type]
     sqlite3.register_converter("complex", _convert_complex)
 
-    if debug:
-        conn.set_trace_callback(print)
-
-    init_db(conn)
-    perform_db_upgrade(conn, version=version)
-    return conn
-
 
 def get_db_version_and_newest_available_version(path_to_db: str) -> Tuple[int,
                                                                           int]:
@@ -20,7 +20,7 @@ import sys
 import numpy as np
 from tqdm import tqdm
 
-from qcodes.dataset.guids import generate_guid
+from qcodes.dataset.guids import generate_guid, parse_guid
 from qcodes.dataset.sqlite.connection import ConnectionPlus, \
     atomic_transaction, atomic, transaction
 from qcodes.dataset.sqlite.db_upgrades.version import get_user_version, \
@@ -317,3 +317,112 @@ def perform_db_upgrade_7_to_8(conn: ConnectionPlus) -> None:
         # prints that the database is being upgraded
         for _ in pbar:
             insert_column(conn, 'runs', 'parent_datasets', 'TEXT')
+
+
+@upgrader
+def perform_db_upgrade_8_to_9(conn: ConnectionPlus) -> None:
+    """
+    Perform the upgrade from version 8 to version 9.
+
+    From version 9 on, arrays (and complex numbers) may be stored as blobs
+    in a compact binary format instead of the .npy format. Existing blobs
+    are left as they are since both formats can be read, so the upgrade
+    does not change the database; it only prevents older versions of
+    QCoDeS, which can not read the new format, from opening the database.
+    """
+    pbar = tqdm(range(1), file=sys.stdout)
+    pbar.set_description("Upgrading database; v8 -> v9")
+    # iterate through the pbar for the sake of the side effect; it
+    # prints that the database is being upgraded
+    for _ in pbar:
+        pass
+
+
+@upgrader
+def perform_db_upgrade_9_to_10(conn: ConnectionPlus) -> None:
+    """
+    Perform the upgrade from version 9 to version 10.
+
+    Add the sample, location and work station codes of the GUID of each run
+    as columns to the runs table, and index those columns as well as the
+    start time and captured run id of the runs, such that runs can be
+    searched for in the database instead of by parsing all their GUIDs.
+    """
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    if n_run_tables == 1:
+
+        pbar = tqdm(range(1), file=sys.stdout)
+        pbar.set_description("Upgrading database; v9 -> v10")
+        # iterate through the pbar for the sake of the side effect; it
+        # prints that the database is being upgraded
+        for _ in pbar:
+            with atomic(conn) as conn:
+                for column in ('guid_sample', 'guid_location',
+                               'guid_work_station'):
+                    insert_column(conn, 'runs', column, 'INTEGER')
+
+                cur = transaction(conn, "SELECT run_id, guid FROM runs")
+                components = []
+                for run_id, guid in cur.fetchall():
+                    if guid is None:
+                        continue
+                    comps = parse_guid(guid)
+                    components.append((comps['sample'], comps['location'],
+                                       comps['work_station'], run_id))
+                sql = """
+                      UPDATE runs
+                      SET guid_sample = ?,
+                          guid_location = ?,
+                          guid_work_station = ?
+                      WHERE run_id = ?
+                      """
+                conn.cursor().executemany(sql, components)
+
+                for column in ('guid_sample', 'guid_location',
+                               'guid_work_station', 'run_timestamp',
+                               'captured_run_id'):
+                    sql = f"""
+                          CREATE INDEX
+                          IF NOT EXISTS IX_runs_{column}
+                          ON runs ({column})
+                          """
+                    transaction(conn, sql)
+    else:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_10_to_11(conn: ConnectionPlus) -> None:
+    """
+    Perform the upgrade from version 10 to version 11.
+
+    Add a table of base snapshots, and a column to the runs table that
+    refers to the base snapshot that the snapshot of a run is stored as a
+    difference to, such that runs whose snapshots hardly differ do not all
+    have to store their full snapshot.
+    """
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    if n_run_tables == 1:
+
+        pbar = tqdm(range(1), file=sys.stdout)
+        pbar.set_description("Upgrading database; v10 -> v11")
+        # iterate through the pbar for the sake of the side effect; it
+        # prints that the database is being upgraded
+        for _ in pbar:
+            with atomic(conn) as conn:
+                sql = """
+                      CREATE TABLE IF NOT EXISTS snapshot_bases (
+                          base_id INTEGER PRIMARY KEY,
+                          snapshot TEXT
+                      )
+                      """
+                transaction(conn, sql)
+                insert_column(conn, 'runs', 'snapshot_base_id', 'INTEGER')
+    else:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
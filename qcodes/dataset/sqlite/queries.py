@@ -9,24 +9,27 @@ import sqlite3
 import time
 import unicodedata
 import warnings
+from numbers import Number
 from typing import Dict, List, Optional, Any, Sequence, Union, Tuple, \
-    Callable, cast
+    Callable, Iterable, Iterator, Mapping, cast
 
 import numpy as np
 
 import qcodes as qc
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.rundescriber import RunDescriber
-from qcodes.dataset.descriptions.param_spec import ParamSpec
+from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
 from qcodes.dataset.descriptions.versioning.converters import old_to_new
 from qcodes.dataset.descriptions.versioning import v0
 from qcodes.dataset.descriptions.versioning import serialization as serial
-from qcodes.dataset.guids import parse_guid, generate_guid
+from qcodes.dataset.guids import (parse_guid, generate_guid,
+                                  filter_guids_by_parts)
 from qcodes.dataset.sqlite.connection import transaction, ConnectionPlus, \
     atomic_transaction, atomic
 from qcodes.dataset.sqlite.query_helpers import (
     sql_placeholder_string, many_many, one, many, select_one_where,
     select_many_where, insert_values, insert_column, is_column_in_table,
-    VALUES, update_where)
+    VALUES, update_where, _max_variable_number)
 from qcodes.utils.deprecate import deprecate
 
 
@@ -42,7 +45,15 @@ RUNS_TABLE_COLUMNS = ["run_id", "exp_id", "name", "result_table_name",
                       "result_counter", "run_timestamp", "completed_timestamp",
                       "is_completed", "parameters", "guid",
                       "run_description", "snapshot", "parent_datasets",
-                      "captured_run_id", "captured_counter"]
+                      "captured_run_id", "captured_counter", "guid_sample",
+                      "guid_location", "guid_work_station",
+                      "snapshot_base_id"]
+
+# the columns of the "runs" table that hold the components of the GUID,
+# keyed by the name of the component as returned by `parse_guid`
+GUID_COMPONENT_COLUMNS = {'sample': 'guid_sample',
+                          'location': 'guid_location',
+                          'work_station': 'guid_work_station'}
 
 
 def is_run_id_in_database(conn: ConnectionPlus,
@@ -137,8 +148,10 @@ def get_parameter_data(conn: ConnectionPlus,
                        table_name: str,
                        columns: Sequence[str] = (),
                        start: Optional[int] = None,
-                       end: Optional[int] = None) -> \
-        Dict[str, Dict[str, np.ndarray]]:
+                       end: Optional[int] = None,
+                       where: Optional[Mapping[str, Tuple[Any, Any]]] = None,
+                       interdeps: Optional[InterDependencies_] = None
+                       ) -> Dict[str, Dict[str, np.ndarray]]:
     """
     Get data for one or more parameters and its dependencies. The data
     is returned as numpy arrays within 2 layers of nested dicts. The keys of
@@ -163,75 +176,469 @@ def get_parameter_data(conn: ConnectionPlus,
             are returned.
         start: start of range; if None, then starts from the top of the table
         end: end of range; if None, then ends at the bottom of the table
+        where: dict from parameter name to a (low, high) tuple of the range
+            of values of that parameter to return rows for, both ends
+            included. None means no bound. The parameters must be part
+            of all the requested parameter trees and may not be of type
+            'array'. The start and end are applied after this filter.
+        interdeps: the interdependencies of the run. If not provided, they
+            are read from the run description in the database.
     """
-    sql = """
-    SELECT run_id FROM runs WHERE result_table_name = ?
+    output = {}
+    trees = _get_parameter_trees(conn, table_name, columns, interdeps)
+    for output_param, paramspecs in trees.items():
+        if where is not None:
+            _validate_where(where, paramspecs, output_param)
+        output[output_param] = get_parameter_tree_arrays(conn,
+                                                         table_name,
+                                                         paramspecs,
+                                                         start=start,
+                                                         end=end,
+                                                         where=where)
+
+    return output
+
+
+def _validate_where(where: Mapping[str, Tuple[Any, Any]],
+                    paramspecs: Sequence[ParamSpecBase],
+                    output_param: str) -> None:
     """
-    c = atomic_transaction(conn, sql, table_name)
-    run_id = one(c, 'run_id')
+    Check that the parameters of a range filter are part of the parameter
+    tree given by ``paramspecs`` and can be filtered by
+    """
+    types = {ps.name: ps.type for ps in paramspecs}
+    for name in where:
+        if name not in types:
+            raise ValueError(f'Can not filter the data of {output_param} by '
+                             f'{name}, {name} is not {output_param} or one '
+                             f'of its dependencies.')
+        if types[name] == 'array':
+            raise ValueError(f'Can not filter by {name}, which is of type '
+                             f'array.')
 
-    rd = serial.from_json_to_current(get_run_description(conn, run_id))
-    interdeps = rd.interdeps
 
-    output = {}
+def iter_parameter_data(conn: ConnectionPlus,
+                        table_name: str,
+                        columns: Sequence[str] = (),
+                        chunk_rows: int = 10000,
+                        interdeps: Optional[InterDependencies_] = None) -> \
+        Iterator[Dict[str, Dict[str, np.ndarray]]]:
+    """
+    Iterate over the data of one or more parameters and their dependencies
+    in chunks of at most ``chunk_rows`` rows per parameter. Every chunk has
+    the same format as the output of :func:`get_parameter_data`, and
+    concatenating the arrays of all the chunks gives the same arrays as
+    :func:`get_parameter_data` returns. Parameters whose data has been
+    exhausted are left out of the subsequent chunks.
+
+    Args:
+        conn: database connection
+        table_name: name of the table
+        columns: list of columns. If no columns are provided, all parameters
+            are returned.
+        chunk_rows: the maximal number of rows to read from the database per
+            parameter and chunk
+        interdeps: the interdependencies of the run. If not provided, they
+            are read from the run description in the database.
+
+    Yields:
+        The data of the next chunk of rows of each of the parameters
+    """
+    trees = _get_parameter_trees(conn, table_name, columns, interdeps)
+    iterators = {output_param: iter_parameter_tree_arrays(conn,
+                                                          table_name,
+                                                          paramspecs,
+                                                          chunk_rows)
+                 for output_param, paramspecs in trees.items()}
+
+    while iterators:
+        output = {}
+        for output_param, iterator in list(iterators.items()):
+            try:
+                output[output_param] = next(iterator)
+            except StopIteration:
+                iterators.pop(output_param)
+        if output:
+            yield output
+
+
+def _get_parameter_trees(conn: ConnectionPlus,
+                         table_name: str,
+                         columns: Sequence[str],
+                         interdeps: Optional[InterDependencies_] = None
+                         ) -> Dict[str, List[ParamSpecBase]]:
+    """
+    Look up the requested parameters and their dependencies in the given
+    interdependencies, or if these are not given, in the run description of
+    the run with the given result table. Returns a dict from requested
+    parameter name to the list of the paramspec of that parameter followed
+    by the paramspecs of its dependencies. If no columns are requested, all
+    parameters that are not dependencies are returned.
+    """
+    if interdeps is None:
+        sql = """
+        SELECT run_id FROM runs WHERE result_table_name = ?
+        """
+        c = atomic_transaction(conn, sql, table_name)
+        run_id = one(c, 'run_id')
+
+        rd = serial.from_json_to_current(get_run_description(conn, run_id))
+        interdeps = rd.interdeps
+
     if len(columns) == 0:
         columns = [ps.name for ps in interdeps.non_dependencies]
 
-    # loop over all the requested parameters
+    trees = {}
     for output_param in columns:
         output_param_spec = interdeps._id_to_paramspec[output_param]
         # find all the dependencies of this param
-        paramspecs = [output_param_spec] \
-                   + list(interdeps.dependencies.get(output_param_spec, ()))
-        param_names = [param.name for param in paramspecs]
-        types = [param.type for param in paramspecs]
-
-        res = get_parameter_tree_values(conn,
-                                        table_name,
-                                        output_param,
-                                        *param_names[1:],
-                                        start=start,
-                                        end=end)
-
-        # if we have array type parameters expand all other parameters
-        # to arrays
-        if 'array' in types and ('numeric' in types or 'text' in types
-                                 or 'complex' in types):
-            first_array_element = types.index('array')
-            numeric_elms = [i for i, x in enumerate(types)
-                            if x == "numeric"]
-            complex_elms = [i for i, x in enumerate(types)
-                            if x == 'complex']
-            text_elms = [i for i, x in enumerate(types)
-                         if x == "text"]
-            for row in res:
-                for element in numeric_elms:
-                    row[element] = np.full_like(row[first_array_element],
-                                                row[element],
-                                                dtype=np.float)
-                    # todo should we handle int/float types here
-                    # we would in practice have to perform another
-                    # loop to check that all elements of a given can be cast to
-                    # int without loosing precision before choosing an integer
-                    # representation of the array
-                for element in complex_elms:
-                    row[element] = np.full_like(row[first_array_element],
-                                                row[element],
-                                                dtype=np.complex)
-                for element in text_elms:
-                    strlen = len(row[element])
-                    row[element] = np.full_like(row[first_array_element],
-                                                row[element],
-                                                dtype=f'U{strlen}')
-
-        # Benchmarking shows that transposing the data with python types is
-        # faster than transposing the data using np.array.transpose
-        res_t = map(list, zip(*res))
-        output[output_param] = {name: np.array(column_data)
-                                for name, column_data
-                                in zip(param_names, res_t)}
+        trees[output_param] = [output_param_spec] \
+            + list(interdeps.dependencies.get(output_param_spec, ()))
+
+    return trees
+
+
+# the numpy dtypes that the columns of the various paramtypes are loaded
+# into; 'array' columns take the dtype of the stored arrays, 'numeric'
+# columns become float as soon as a non-integer value is found and 'text'
+# columns are collected as python strings first
+_PARAMTYPE_TO_DTYPE = {'numeric': np.int64,
+                       'complex': np.complex128,
+                       'text': object}
 
-    return output
+
+def get_parameter_tree_arrays(conn: ConnectionPlus,
+                              result_table_name: str,
+                              paramspecs: Sequence[ParamSpecBase],
+                              start: Optional[int] = None,
+                              end: Optional[int] = None,
+                              chunk_size: int = 10000,
+                              where: Optional[
+                                  Mapping[str, Tuple[Any, Any]]] = None
+                              ) -> Dict[str, np.ndarray]:
+    """
+    Get the values of a top level parameter and its dependencies as numpy
+    arrays. The rows are the rows where the top level parameter (the first
+    of the ``paramspecs``) has non-NULL values, see
+    :func:`get_parameter_tree_values`.
+
+    The rows are read from the database in chunks and copied straight into
+    numpy arrays with a dtype based on the type of the parameter, which
+    grow geometrically as chunks are added. If any of the parameters is of
+    type 'array', all other parameters are broadcast to the shape of the
+    (first) array parameter, numeric parameters as floats.
+    'array' type parameters whose arrays differ in shape from row to row are
+    returned as numpy arrays of arrays with dtype ``object``.
+
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table whence the values are to be
+            retrieved
+        paramspecs: The top level parameter followed by the parameters to
+            load along with it
+        start: The (1-indexed) result to include as the first results to
+            be returned. None is equivalent to 1. If start > end, nothing
+            is returned.
+        end: The (1-indexed) result to include as the last result to be
+            returned. None is equivalent to "all the rest". If start > end,
+            nothing is returned.
+        chunk_size: The number of rows to read from the database at a time
+        where: Ranges of values of parameters to restrict the rows to, see
+            :func:`get_parameter_tree_values`
+
+    Returns:
+        A dict from parameter name to numpy array of values. If there are
+        no values, the dict is empty.
+    """
+    param_names = [ps.name for ps in paramspecs]
+    types = [ps.type for ps in paramspecs]
+
+    sql, values = _build_parameter_tree_query(result_table_name,
+                                              param_names[0],
+                                              *param_names[1:],
+                                              start=start, end=end,
+                                              where=where)
+    cursor = conn.cursor()
+    cursor.execute(sql, values)
+
+    def fetch_chunks() -> Iterator[List[sqlite3.Row]]:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if len(rows) == 0:
+                return
+            yield rows
+
+    arrays = _rows_to_arrays(fetch_chunks(), types)
+    cursor.close()
+
+    return dict(zip(param_names, arrays))
+
+
+def get_parameter_tree_length(conn: ConnectionPlus,
+                              result_table_name: str,
+                              paramspecs: Sequence[ParamSpecBase]) -> int:
+    """
+    Get the number of rows of a top level parameter and its dependencies,
+    that is, the number of rows where the top level parameter (the first of
+    the ``paramspecs``) has non-NULL values.
+
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table that holds the values
+        paramspecs: The top level parameter followed by its dependencies
+
+    Returns:
+        The number of rows
+    """
+    param_names = [ps.name for ps in paramspecs]
+    sql, values = _build_parameter_tree_query(result_table_name,
+                                              param_names[0],
+                                              *param_names[1:])
+    c = atomic_transaction(conn, f"SELECT COUNT(*) FROM ({sql})", *values)
+    return one(c, 0)
+
+
+def iter_parameter_tree_arrays(conn: ConnectionPlus,
+                               result_table_name: str,
+                               paramspecs: Sequence[ParamSpecBase],
+                               chunk_rows: int = 10000
+                               ) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Iterate over the values of a top level parameter and its dependencies
+    in chunks of at most ``chunk_rows`` rows. Each chunk is returned in the
+    same format as the output of :func:`get_parameter_tree_arrays`.
+
+    The chunks are selected by the rowid of the last row of the previous
+    chunk (keyset pagination) rather than with an OFFSET, so reading a
+    chunk takes the same time no matter how far into the table it is, and
+    only one chunk is held in memory at a time. Rows that are added to the
+    table while iterating are included in the chunks that follow.
+
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table whence the values are to be
+            retrieved
+        paramspecs: The top level parameter followed by the parameters to
+            load along with it
+        chunk_rows: The maximal number of rows per chunk
+
+    Yields:
+        A dict from parameter name to numpy array of values of the next
+        chunk of rows
+    """
+    if chunk_rows < 1:
+        raise ValueError(f'chunk_rows must be a positive integer, '
+                         f'got {chunk_rows}')
+    param_names = [ps.name for ps in paramspecs]
+    types = [ps.type for ps in paramspecs]
+    columns_for_select = ','.join(param_names)
+
+    # the rowid is selected as the last column such that it is not part of
+    # the columns that are converted to arrays
+    sql = f"""
+          SELECT {columns_for_select}, rowid
+          FROM "{result_table_name}"
+          WHERE {param_names[0]} IS NOT NULL AND rowid > ?
+          ORDER BY rowid
+          LIMIT ?
+          """
+    last_rowid = 0
+    while True:
+        rows = atomic_transaction(conn, sql, last_rowid, chunk_rows).fetchall()
+        if len(rows) == 0:
+            return
+        last_rowid = rows[-1][-1]
+        arrays = _rows_to_arrays([rows], types)
+        yield dict(zip(param_names, arrays))
+
+
+def get_parameter_tree_arrays_after(conn: ConnectionPlus,
+                                    result_table_name: str,
+                                    paramspecs: Sequence[ParamSpecBase],
+                                    rowid: int
+                                    ) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Get the values of a top level parameter and its dependencies from the
+    rows after the row with the given rowid, in the same format as
+    :func:`get_parameter_tree_arrays`. This allows to load only the rows
+    that have been added to a table since it was last read.
+
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table whence the values are to be
+            retrieved
+        paramspecs: The top level parameter followed by the parameters to
+            load along with it
+        rowid: The rowid of the last row that has already been read; 0 to
+            read all rows
+
+    Returns:
+        A dict from parameter name to numpy array of values, which is
+        empty if there are no new rows, and the rowid of the last row that
+        was read (``rowid`` if there are no new rows)
+    """
+    param_names = [ps.name for ps in paramspecs]
+    types = [ps.type for ps in paramspecs]
+    columns_for_select = ','.join(param_names)
+
+    sql = f"""
+          SELECT {columns_for_select}, rowid
+          FROM "{result_table_name}"
+          WHERE {param_names[0]} IS NOT NULL AND rowid > ?
+          ORDER BY rowid
+          """
+    rows = atomic_transaction(conn, sql, rowid).fetchall()
+    if len(rows) == 0:
+        return {}, rowid
+    arrays = _rows_to_arrays([rows], types)
+    return dict(zip(param_names, arrays)), rows[-1][-1]
+
+
+def _rows_to_arrays(row_chunks: Iterable[Sequence[Sequence[Any]]],
+                    types: Sequence[str]) -> List[np.ndarray]:
+    """
+    Copy chunks of rows of values into one numpy array per column, see
+    :func:`get_parameter_tree_arrays`. The rows may hold more values than
+    there are ``types``; those extra values are ignored. If there are no
+    rows, the list is empty.
+    """
+    buffers: List[Optional[np.ndarray]] = [None] * len(types)
+
+    start_row = 0
+    for rows in row_chunks:
+        stop_row = start_row + len(rows)
+        for i, column in zip(range(len(buffers)), zip(*rows)):
+            buffers[i] = _insert_column_chunk(buffers[i], column, types[i],
+                                              start_row, stop_row)
+        start_row = stop_row
+
+    if start_row == 0:
+        return []
+
+    arrays = [_finalize_column(cast(np.ndarray, buffer)[:start_row],
+                               paramtype)
+              for buffer, paramtype in zip(buffers, types)]
+
+    if 'array' in types and len(set(types)) > 1:
+        arrays = _expand_to_array_shape(arrays, types)
+
+    return arrays
+
+
+def _grow_buffer(buffer: np.ndarray, start_row: int,
+                 stop_row: int) -> np.ndarray:
+    """
+    Return a buffer with room for at least ``stop_row`` rows, holding the
+    first ``start_row`` rows of the given buffer. The capacity is at least
+    doubled when the buffer is reallocated, such that filling a buffer
+    chunk by chunk copies every row a constant number of times on average.
+    """
+    if stop_row <= len(buffer):
+        return buffer
+    capacity = max(stop_row, 2 * len(buffer))
+    grown = np.empty((capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+    grown[:start_row] = buffer[:start_row]
+    return grown
+
+
+def _insert_column_chunk(buffer: Optional[np.ndarray],
+                         column: Sequence[Any],
+                         paramtype: str,
+                         start_row: int, stop_row: int) -> np.ndarray:
+    """
+    Copy a chunk of values of one column into the rows
+    ``start_row:stop_row`` of the buffer for that column and return the
+    buffer, which is allocated with the first chunk and grown when it is
+    full. The buffer is converted to a more general dtype if the values do
+    not fit into it. The buffer of an 'array' type column is allocated once
+    the shape and dtype of the arrays is known.
+    """
+    if paramtype == 'array' and (buffer is None or buffer.ndim > 1):
+        # an 'array' type column which is stacked into an n-dimensional
+        # array as long as all the arrays have the same shape
+        try:
+            chunk = np.stack(column)
+        except (ValueError, TypeError):
+            chunk = None
+        if chunk is not None:
+            if buffer is None:
+                buffer = np.empty((stop_row,) + chunk.shape[1:],
+                                  dtype=chunk.dtype)
+            if buffer.shape[1:] == chunk.shape[1:]:
+                if not np.can_cast(chunk.dtype, buffer.dtype):
+                    buffer = buffer.astype(np.result_type(buffer, chunk))
+                buffer = _grow_buffer(buffer, start_row, stop_row)
+                buffer[start_row:stop_row] = chunk
+                return buffer
+        # ragged arrays; fall back to an array of arrays
+        object_buffer = np.empty(stop_row, dtype=object)
+        if buffer is not None:
+            for row in range(start_row):
+                object_buffer[row] = buffer[row]
+        buffer = object_buffer
+    elif buffer is None:
+        buffer = np.empty(stop_row, dtype=_PARAMTYPE_TO_DTYPE[paramtype])
+
+    buffer = _grow_buffer(buffer, start_row, stop_row)
+
+    if buffer.dtype.kind == 'i' and set(map(type, column)) != {int}:
+        buffer = buffer.astype(np.float64)
+
+    if buffer.dtype == np.dtype('O'):
+        # assign one by one, such that numpy does not try to broadcast
+        # sequences (e.g. arrays) into the buffer
+        for row, value in enumerate(column, start=start_row):
+            buffer[row] = value
+        return buffer
+
+    try:
+        buffer[start_row:stop_row] = column
+    except (ValueError, TypeError):
+        # e.g. NULL values or text in a numeric column
+        buffer = buffer.astype(object)
+        buffer[start_row:stop_row] = column
+    return buffer
+
+
+def _finalize_column(buffer: np.ndarray, paramtype: str) -> np.ndarray:
+    """
+    Convert a fully populated column buffer to the array that is returned.
+    Columns that had to be collected as python objects are converted the
+    same way :func:`numpy.array` would convert a list of the values.
+    """
+    if buffer.dtype != np.dtype('O'):
+        return buffer
+    if paramtype == 'array':
+        return buffer
+    return np.array(buffer.tolist())
+
+
+def _expand_to_array_shape(arrays: List[np.ndarray],
+                           types: Sequence[str]) -> List[np.ndarray]:
+    """
+    Expand all columns that hold one value per row to the shape of the
+    arrays in the first column of type 'array', i.e. repeat the value of
+    each row such that it has the shape of the array of that row. Numeric
+    columns are expanded to float arrays.
+    """
+    array_column = arrays[types.index('array')]
+    expanded = []
+    for column, paramtype in zip(arrays, types):
+        if column.ndim > 1 or column.dtype == np.dtype('O'):
+            expanded.append(column)
+            continue
+        dtype = np.float64 if paramtype == 'numeric' else column.dtype
+        if array_column.dtype != np.dtype('O'):
+            # all rows have the same shape; broadcast in one go
+            new_shape = (len(column),) + (1,) * (array_column.ndim - 1)
+            expanded.append(np.array(np.broadcast_to(
+                column.reshape(new_shape), array_column.shape), dtype=dtype))
+        else:
+            rows = np.empty(len(column), dtype=object)
+            for row, (value, array) in enumerate(zip(column, array_column)):
+                rows[row] = np.full_like(array, value, dtype=dtype)
+            expanded.append(rows)
+    return expanded
 
 
 def get_values(conn: ConnectionPlus,
@@ -258,12 +665,178 @@ def get_values(conn: ConnectionPlus,
     return res
 
 
+# The bins that the values of a column are aggregated in: None to make every
+# distinct value a bin of its own, or the (start, stop, number of bins) of
+# equally wide bins
+BinSpec = Optional[Tuple[float, float, int]]
+
+
+def _is_finite(column: str) -> str:
+    # NaN and infinities are stored as the text 'nan' and 'inf', which
+    # ABS converts to 0, so exclude text as well as NULL and infinities
+    return f"typeof({column}) != 'text' AND ABS({column}) < 9e999"
+
+
+def _bin_expression(column: str, bins: BinSpec) -> Tuple[str, List[Any]]:
+    if bins is None:
+        return column, []
+    start, stop, nbins = bins
+    expression = (f"MIN(MAX(CAST(({column} - ?) * ? AS INTEGER), 0), "
+                  f"{int(nbins) - 1})")
+    return expression, [float(start), float(nbins / (stop - start))]
+
+
+def get_column_range(conn: ConnectionPlus,
+                     table_name: str,
+                     param_name: str,
+                     toplevel_param_name: str
+                     ) -> Tuple[int, Optional[float], Optional[float]]:
+    """
+    Get the number of results of a top level parameter and the minimum and
+    the maximum of the finite values of a numeric parameter in its tree
+
+    Args:
+        conn: Connection to the database
+        table_name: Name of the table that holds the data
+        param_name: Name of the numeric parameter to get the range of
+        toplevel_param_name: Name of the top level parameter
+
+    Returns:
+        The number of results, and the minimum and the maximum, which are
+        None if there are no finite values
+    """
+    finite = _is_finite(param_name)
+    sql = f"""
+    SELECT COUNT(*),
+           MIN(CASE WHEN {finite} THEN {param_name} END),
+           MAX(CASE WHEN {finite} THEN {param_name} END)
+    FROM "{table_name}"
+    WHERE {toplevel_param_name} IS NOT NULL
+    """
+    c = atomic_transaction(conn, sql)
+    count, minimum, maximum = c.fetchone()
+    return count, minimum, maximum
+
+
+def get_distinct_values(conn: ConnectionPlus,
+                        table_name: str,
+                        param_name: str,
+                        toplevel_param_name: str,
+                        limit: int) -> np.ndarray:
+    """
+    Get at most ``limit`` of the distinct finite values of a numeric
+    parameter in the tree of a top level parameter
+
+    Args:
+        conn: Connection to the database
+        table_name: Name of the table that holds the data
+        param_name: Name of the numeric parameter to get the values of
+        toplevel_param_name: Name of the top level parameter
+        limit: The maximal number of values to get
+
+    Returns:
+        The sorted distinct values
+    """
+    sql = f"""
+    SELECT DISTINCT {param_name} FROM "{table_name}"
+    WHERE {toplevel_param_name} IS NOT NULL AND {_is_finite(param_name)}
+    LIMIT ?
+    """
+    c = atomic_transaction(conn, sql, limit)
+    return np.sort(np.array([row[0] for row in c.fetchall()], dtype=float))
+
+
+def get_binned_extrema(conn: ConnectionPlus,
+                       table_name: str,
+                       toplevel_param_name: str,
+                       setpoint_name: str,
+                       bins: BinSpec
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                  np.ndarray, np.ndarray]:
+    """
+    Get the minimum and the maximum of the finite values of a numeric top
+    level parameter within bins of the values of its numeric setpoint,
+    aggregated by the database
+
+    Args:
+        conn: Connection to the database
+        table_name: Name of the table that holds the data
+        toplevel_param_name: Name of the top level parameter
+        setpoint_name: Name of the setpoint parameter
+        bins: The bins of the setpoint values
+
+    Returns:
+        The keys of the non-empty bins (the bin index for equally wide bins,
+        the setpoint value otherwise), the setpoint value at the minimum,
+        the minimum, the setpoint value at the maximum, and the maximum
+    """
+    expression, args = _bin_expression(setpoint_name, bins)
+    results = []
+    for aggregate in ('MIN', 'MAX'):
+        # SQLite takes the bare setpoint column from the row that holds the
+        # minimum or maximum of the group
+        sql = f"""
+        SELECT {expression} AS bin, {setpoint_name},
+               {aggregate}({toplevel_param_name})
+        FROM "{table_name}"
+        WHERE {_is_finite(toplevel_param_name)}
+        AND {_is_finite(setpoint_name)}
+        GROUP BY bin ORDER BY bin
+        """
+        c = atomic_transaction(conn, sql, *args)
+        results.append(np.array(c.fetchall(), dtype=float).reshape(-1, 3))
+    lower, upper = results
+    return (lower[:, 0], lower[:, 1], lower[:, 2], upper[:, 1], upper[:, 2])
+
+
+def get_binned_means(conn: ConnectionPlus,
+                     table_name: str,
+                     toplevel_param_name: str,
+                     setpoint_names: Tuple[str, str],
+                     bins: Tuple[BinSpec, BinSpec]
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the mean of the finite values of a numeric top level parameter
+    within the cells of a grid of bins of the values of its two numeric
+    setpoints, aggregated by the database
+
+    Args:
+        conn: Connection to the database
+        table_name: Name of the table that holds the data
+        toplevel_param_name: Name of the top level parameter
+        setpoint_names: Names of the two setpoint parameters
+        bins: The bins of the values of each of the setpoints
+
+    Returns:
+        The keys of the bins of the first and the second setpoint of the
+        non-empty cells (the bin index for equally wide bins, the setpoint
+        value otherwise), and the means
+    """
+    xname, yname = setpoint_names
+    xexpression, xargs = _bin_expression(xname, bins[0])
+    yexpression, yargs = _bin_expression(yname, bins[1])
+    sql = f"""
+    SELECT {xexpression} AS xbin, {yexpression} AS ybin,
+           AVG({toplevel_param_name})
+    FROM "{table_name}"
+    WHERE {_is_finite(toplevel_param_name)}
+    AND {_is_finite(xname)} AND {_is_finite(yname)}
+    GROUP BY xbin, ybin
+    """
+    c = atomic_transaction(conn, sql, *xargs, *yargs)
+    results = np.array(c.fetchall(), dtype=float).reshape(-1, 3)
+    return results[:, 0], results[:, 1], results[:, 2]
+
+
 def get_parameter_tree_values(conn: ConnectionPlus,
                               result_table_name: str,
                               toplevel_param_name: str,
                               *other_param_names: str,
                               start: Optional[int] = None,
-                              end: Optional[int] = None) -> List[List[Any]]:
+                              end: Optional[int] = None,
+                              where: Optional[
+                                  Mapping[str, Tuple[Any, Any]]] = None
+                              ) -> List[List[Any]]:
     """
     Get the values of one or more columns from a data table. The rows
     retrieved are the rows where the 'toplevel_param_name' column has
@@ -283,12 +856,44 @@ def get_parameter_tree_values(conn: ConnectionPlus,
         end: The (1-indexed) result to include as the last result to be
             returned. None is equivalent to "all the rest". If start > end,
             nothing is returned.
+        where: A dict from column name to a (low, high) tuple. Only rows
+            where the value of the column lies in this range (both ends
+            included) are returned. None means no bound. The start and end
+            are applied to the rows that remain.
 
     Returns:
         A list of list. The outer list index is row number, the inner list
         index is parameter value (first toplevel_param, then other_param_names)
     """
 
+    columns = [toplevel_param_name] + list(other_param_names)
+    sql, values = _build_parameter_tree_query(result_table_name,
+                                              toplevel_param_name,
+                                              *other_param_names,
+                                              start=start, end=end,
+                                              where=where)
+
+    cursor = conn.cursor()
+    cursor.execute(sql, values)
+    res = many_many(cursor, *columns)
+
+    return res
+
+
+def _build_parameter_tree_query(result_table_name: str,
+                                toplevel_param_name: str,
+                                *other_param_names: str,
+                                start: Optional[int] = None,
+                                end: Optional[int] = None,
+                                where: Optional[
+                                    Mapping[str, Tuple[Any, Any]]] = None
+                                ) -> Tuple[str, List[Any]]:
+    """
+    Build the query that selects the values of a top level parameter and
+    other parameters from the rows where the top level parameter is not
+    NULL. See :func:`get_parameter_tree_values` for the arguments. Returns
+    the query and the values to bind to its placeholders.
+    """
     offset = (start - 1) if start is not None else 0
     limit = (end - offset) if end is not None else -1
 
@@ -304,22 +909,55 @@ def get_parameter_tree_values(conn: ConnectionPlus,
     columns = [toplevel_param_name] + list(other_param_names)
     columns_for_select = ','.join(columns)
 
+    conditions = [f'{toplevel_param_name} IS NOT NULL']
+    values = []
+    for name, (low, high) in (where or {}).items():
+        if any(isinstance(bound, Number) for bound in (low, high)):
+            # NaN is stored as the text 'nan', which SQLite sorts above
+            # all numbers, so it would otherwise match open upper ranges
+            conditions.append(f"typeof({name}) IN ('integer', 'real')")
+        if low is not None:
+            conditions.append(f'{name} >= ?')
+            values.append(low)
+        if high is not None:
+            conditions.append(f'{name} <= ?')
+            values.append(high)
+    sql_conditions = ' AND '.join(conditions)
+
     sql_subquery = f"""
                    (SELECT {columns_for_select}
                     FROM "{result_table_name}"
-                    WHERE {toplevel_param_name} IS NOT NULL)
+                    WHERE {sql_conditions})
                    """
     sql = f"""
           SELECT {columns_for_select}
           FROM {sql_subquery}
           LIMIT {limit} OFFSET {offset}
           """
+    return sql, values
 
-    cursor = conn.cursor()
-    cursor.execute(sql, ())
-    res = many_many(cursor, *columns)
 
-    return res
+def create_column_indexes(conn: ConnectionPlus,
+                          result_table_name: str,
+                          column_names: Sequence[str]) -> None:
+    """
+    Create an index on each of the given columns of a results table, such
+    that rows can be selected by ranges of values of those columns without
+    scanning the whole table. Indexes that already exist are kept.
+
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table to index
+        column_names: The names of the columns to index
+    """
+    with atomic(conn) as conn:
+        for name in column_names:
+            sql = f"""
+                  CREATE INDEX
+                  IF NOT EXISTS "IX_{result_table_name}_{name}"
+                  ON "{result_table_name}" ({name})
+                  """
+            transaction(conn, sql)
 
 
 def get_setpoints(conn: ConnectionPlus,
@@ -453,11 +1091,16 @@ def get_guids_from_run_spec(conn: ConnectionPlus,
                             captured_run_id: Optional[int] = None,
                             captured_counter: Optional[int] = None,
                             experiment_name: Optional[str] = None,
-                            sample_name: Optional[str] = None) -> List[str]:
+                            sample_name: Optional[str] = None,
+                            sample_id: Optional[int] = None,
+                            location: Optional[int] = None,
+                            work_station: Optional[int] = None,
+                            start_time: Optional[float] = None,
+                            end_time: Optional[float] = None) -> List[str]:
     """
-    Get the GUIDs of runs matching the supplied run specifications.
-
-    # Todo: do we need to select by start/end time too? Is result name useful?
+    Get the GUIDs of runs matching the supplied run specifications. The
+    runs are looked up by the database, using the indices on the
+    components of the GUID and on the start time of the runs.
 
     Args:
         conn: connection to the database.
@@ -467,6 +1110,13 @@ def get_guids_from_run_spec(conn: ConnectionPlus,
             run at capture time.
         experiment_name: Name of the experiment that the runs should belong to.
         sample_name: Name of the sample that the query should be restricted to.
+        sample_id: The sample_id assigned as part of the GUID.
+        location: The location code assigned as part of the GUID.
+        work_station: The workstation assigned as part of the GUID.
+        start_time: Only runs started at or after this time (in seconds
+            since the Epoch) match.
+        end_time: Only runs started at or before this time (in seconds
+            since the Epoch) match.
 
     Returns:
         A list of the GUIDs matching the supplied specifications.
@@ -488,7 +1138,7 @@ def get_guids_from_run_spec(conn: ConnectionPlus,
         exp_ids = None
 
     conds = []
-    inputs = []
+    inputs: List[Any] = []
 
     if exp_ids is not None:
         exp_placeholder = sql_placeholder_string(len(exp_ids))
@@ -500,6 +1150,24 @@ def get_guids_from_run_spec(conn: ConnectionPlus,
     if captured_counter is not None:
         conds.append("captured_counter is ?")
         inputs.append(captured_counter)
+    if start_time is not None:
+        conds.append("run_timestamp >= ?")
+        inputs.append(start_time)
+    if end_time is not None:
+        conds.append("run_timestamp <= ?")
+        inputs.append(end_time)
+
+    guid_components = {'sample': sample_id,
+                       'location': location,
+                       'work_station': work_station}
+    # databases of a version before the GUID components were stored can
+    # only be searched by parsing the GUIDs
+    filter_in_db = _has_guid_component_columns(conn)
+    if filter_in_db:
+        for component, value in guid_components.items():
+            if value is not None:
+                conds.append(f"{GUID_COMPONENT_COLUMNS[component]} = ?")
+                inputs.append(value)
 
     if len(conds) >= 1:
         where_clause = " WHERE " + " AND ".join(conds)
@@ -518,9 +1186,34 @@ def get_guids_from_run_spec(conn: ConnectionPlus,
     results = []
     for r in rows:
         results.append(r['guid'])
+
+    if not filter_in_db:
+        results = filter_guids_by_parts(results, location, sample_id,
+                                        work_station)
     return results
 
 
+def _has_guid_component_columns(conn: ConnectionPlus) -> bool:
+    return is_column_in_table(conn, 'runs', GUID_COMPONENT_COLUMNS['sample'])
+
+
+def _set_guid_components(conn: ConnectionPlus, run_id: int,
+                         guid: str) -> None:
+    """
+    Store the components of the GUID of a run in their columns of the runs
+    table. The caller must check that the database has those columns, see
+    :func:`_has_guid_component_columns`.
+    """
+    comps = parse_guid(guid)
+    columns = ", ".join(f"{column} = ?"
+                        for column in GUID_COMPONENT_COLUMNS.values())
+    sql = f"UPDATE runs SET {columns} WHERE run_id = ?"
+    atomic_transaction(conn, sql,
+                       *(comps[component]
+                         for component in GUID_COMPONENT_COLUMNS),
+                       run_id)
+
+
 @deprecate()
 def get_layout(conn: ConnectionPlus,
                layout_id: int) -> Dict[str, str]:
@@ -1062,6 +1755,8 @@ def _insert_run(conn: ConnectionPlus, exp_id: int, name: str,
         else:
             captured_run_id = 1
 
+    has_guid_component_columns = _has_guid_component_columns(conn)
+
     with atomic(conn) as conn:
 
         if parameters:
@@ -1129,7 +1824,10 @@ def _insert_run(conn: ConnectionPlus, exp_id: int, name: str,
                                captured_counter,
                                parent_dataset_links)
 
-    run_id = curr.lastrowid
+        run_id = curr.lastrowid
+        assert run_id is not None
+        if has_guid_component_columns:
+            _set_guid_components(conn, run_id, guid)
 
     return run_counter, formatted_name, run_id
 
@@ -1539,6 +2237,37 @@ def get_run_description(conn: ConnectionPlus, run_id: int) -> str:
                             "run_id", run_id)
 
 
+def get_result_tables_and_run_descriptions(
+        conn: ConnectionPlus,
+        run_ids: Sequence[int]) -> Dict[int, Tuple[str, str]]:
+    """
+    Look up the name of the result table and the (JSON string) run
+    description of each of the given runs, with as few queries as the
+    maximal number of SQL variables allows.
+
+    Args:
+        conn: the connection to the database
+        run_ids: the run_ids to look up
+
+    Returns:
+        a dict from run_id to the result table name and run description of
+        the run. Runs that do not exist are left out.
+    """
+    run_ids = list(dict.fromkeys(run_ids))
+    chunk_size = _max_variable_number()
+    output = {}
+    for start in range(0, len(run_ids), chunk_size):
+        chunk = run_ids[start:start + chunk_size]
+        sql = f"""
+              SELECT run_id, result_table_name, run_description
+              FROM runs
+              WHERE run_id IN {sql_placeholder_string(len(chunk))}
+              """
+        for row in atomic_transaction(conn, sql, *chunk).fetchall():
+            output[row[0]] = (row[1], row[2])
+    return output
+
+
 def get_parent_dataset_links(conn: ConnectionPlus, run_id: int) -> str:
     """
     Return the (JSON string) of the parent-child dataset links for the
@@ -1664,6 +2393,55 @@ def add_meta_data(conn: ConnectionPlus,
             raise e
 
 
+def set_run_snapshot(conn: ConnectionPlus, run_id: int, snapshot: str,
+                     base_id: Optional[int] = None) -> None:
+    """
+    Store the snapshot of a run, either in full or as the difference to a
+    base snapshot, see :func:`.diff_snapshots`.
+
+    Args:
+        conn: the connection to the sqlite database
+        run_id: the run to store the snapshot of
+        snapshot: the JSON of the snapshot, or of its difference to the
+            base snapshot
+        base_id: the id of the base snapshot, or None if the snapshot is
+            stored in full
+    """
+    with atomic(conn) as conn:
+        add_meta_data(conn, run_id, {'snapshot': snapshot})
+        atomic_transaction(conn, 'UPDATE runs SET snapshot_base_id = ? '
+                                 'WHERE run_id = ?', base_id, run_id)
+
+
+def add_snapshot_base(conn: ConnectionPlus, snapshot: str) -> int:
+    """
+    Add a base snapshot that the snapshots of runs can be stored as a
+    difference to, and return its id
+    """
+    cursor = atomic_transaction(conn, 'INSERT INTO snapshot_bases (snapshot) '
+                                      'VALUES (?)', snapshot)
+    assert cursor.lastrowid is not None
+    return cursor.lastrowid
+
+
+def get_snapshot_base(conn: ConnectionPlus, base_id: int) -> str:
+    """
+    Get the JSON of the base snapshot with the given id
+    """
+    return select_one_where(conn, 'snapshot_bases', 'snapshot', 'base_id',
+                            base_id)
+
+
+def get_last_snapshot_base_id(conn: ConnectionPlus) -> Optional[int]:
+    """
+    Get the id of the base snapshot that was added last, or None if there
+    are none
+    """
+    cursor = atomic_transaction(conn, 'SELECT MAX(base_id) AS base_id '
+                                      'FROM snapshot_bases')
+    return one(cursor, 'base_id')
+
+
 def get_experiment_name_from_experiment_id(
         conn: ConnectionPlus, exp_id: int) -> str:
     return select_one_where(
@@ -1711,6 +2489,8 @@ def update_GUIDs(conn: ConnectionPlus) -> None:
     c = atomic_transaction(conn, query)
     no_of_runs = c.fetchall()[0][0]
 
+    has_guid_component_columns = _has_guid_component_columns(conn)
+
     # now, there are four actions we can take
 
     def _both_nonzero(run_id: int, *args: Any) -> None:
@@ -1739,6 +2519,8 @@ def update_GUIDs(conn: ConnectionPlus) -> None:
                    """
             cur = conn.cursor()
             cur.execute(sql, (guid_str,))
+            if has_guid_component_columns:
+                _set_guid_components(conn, run_id, guid_str)
 
         log.info(f'Succesfully updated run number {run_id}.')
 
@@ -5,8 +5,9 @@ are useful for building more database-specific queries out of them.
 import itertools
 import sqlite3
 from distutils.version import LooseVersion
+from functools import lru_cache
 from numbers import Number
-from typing import List, Any, Union, Dict, Tuple, Optional
+from typing import List, Any, Union, Dict, Tuple, Optional, Sequence
 
 import numpy as np
 from numpy import ndarray
@@ -17,9 +18,17 @@ from qcodes.dataset.sqlite.settings import SQLiteSettings
 
 
 # represent the type of  data we can/want map to sqlite column
-VALUE = Union[str, Number, List, ndarray, bool]
+VALUE = Union[str, Number, float, complex, List, ndarray, bool]
 VALUES = List[VALUE]
 
+# cache of the SQL text of INSERT statements keyed by table name, column
+# names and number of rows, see `insert_many_values`
+INSERT_QUERY_CACHE = Dict[Tuple[str, Tuple[str, ...], int], str]
+
+# the maximal number of rows to insert with one INSERT statement; larger
+# statements are hardly faster but make for very long SQL texts
+_MAX_ROWS_PER_INSERT = 512
+
 
 def one(curr: sqlite3.Cursor, column: Union[int, str]) -> Any:
     """Get the value of one column from one row
@@ -152,6 +161,7 @@ def insert_many_values(conn: ConnectionPlus,
                        formatted_name: str,
                        columns: List[str],
                        values: List[VALUES],
+                       query_cache: Optional[INSERT_QUERY_CACHE] = None
                        ) -> int:
     """
     Inserts many values for the specified columns.
@@ -160,6 +170,15 @@ def insert_many_values(conn: ConnectionPlus,
     columns: ['xparam', 'yparam']
     values: [[x1, y1], [x2, y2], [x3, y3]]
 
+    The rows are inserted in chunks with one INSERT statement per chunk.
+    If a ``query_cache`` dict is given, the SQL texts of the statements are
+    stored in and reused from it, such that they do not need to be rebuilt
+    for every call. Since only a few different chunk sizes are used, the
+    prepared statements are also reused from the statement cache of the
+    connection.
+
+    Returns the rowid of the last row of the first chunk.
+
     NOTE this need to be committed before closing the connection.
     """
     # We demand that all values have the same length
@@ -171,9 +190,33 @@ def insert_many_values(conn: ConnectionPlus,
     no_of_rows = len(lengths)
     no_of_columns = lengths[0]
 
-    # The TOTAL number of inserted values in one query
-    # must be less than the SQLITE_MAX_VARIABLE_NUMBER
+    chunks = _insert_chunk_sizes(no_of_rows, no_of_columns)
+    start = 0
+
+    with atomic(conn) as conn:
+        for ii, chunk in enumerate(chunks):
+            query = _insert_query(formatted_name, columns, chunk, query_cache)
+            stop = start + chunk
+            # we need to make values a flat list from a list of list
+            flattened_values = list(
+                itertools.chain.from_iterable(values[start:stop]))
 
+            c = transaction(conn, query, *flattened_values)
+
+            if ii == 0:
+                return_value = c.lastrowid
+            start = stop
+
+    return return_value
+
+
+@lru_cache(maxsize=None)
+def _max_variable_number() -> int:
+    """
+    Return the maximal number of values that can be bound to one query.
+    The SQLite settings do not change at runtime, hence this is only
+    looked up once.
+    """
     # Version check cf.
     # "https://stackoverflow.com/questions/9527851/sqlite-error-
     #  too-many-terms-in-compound-select"
@@ -183,43 +226,124 @@ def insert_many_values(conn: ConnectionPlus,
     # to check against below
     # ought to be 3.7.11, but that fails on Travis
     if LooseVersion(str(version)) <= LooseVersion('3.8.2'):
-        max_var = SQLiteSettings.limits['MAX_COMPOUND_SELECT']
+        return int(SQLiteSettings.limits['MAX_COMPOUND_SELECT'])
     else:
-        max_var = SQLiteSettings.limits['MAX_VARIABLE_NUMBER']
-    rows_per_transaction = int(int(max_var)/no_of_columns)
+        return int(SQLiteSettings.limits['MAX_VARIABLE_NUMBER'])
+
+
+def _insert_chunk_sizes(no_of_rows: int, no_of_columns: int) -> List[int]:
+    """
+    Split a number of rows into the chunks that are inserted with one
+    statement each. All but the last few chunks have the maximal size; the
+    remaining rows are split into chunks whose size is a power of two, such
+    that the number of different statements stays small no matter how many
+    rows are inserted at a time.
+    """
+    # The TOTAL number of inserted values in one query
+    # must be less than the SQLITE_MAX_VARIABLE_NUMBER
+    rows_per_chunk = max(min(_max_variable_number() // no_of_columns,
+                             _MAX_ROWS_PER_INSERT), 1)
+    n_full_chunks, remainder = divmod(no_of_rows, rows_per_chunk)
+    chunks = n_full_chunks * [rows_per_chunk]
+    power = 1 << remainder.bit_length()
+    while remainder:
+        power >>= 1
+        if remainder & power:
+            chunks.append(power)
+            remainder -= power
+    return chunks
+
+
+def _insert_query(formatted_name: str, columns: Sequence[str], no_of_rows: int,
+                  query_cache: Optional[INSERT_QUERY_CACHE]) -> str:
+    """
+    Return the SQL text of a statement that inserts ``no_of_rows`` rows of
+    values for the given columns, from the ``query_cache`` if possible
+    """
+    key = (formatted_name, tuple(columns), no_of_rows)
+    if query_cache is not None and key in query_cache:
+        return query_cache[key]
 
     _columns = ",".join(columns)
-    _values = "(" + ",".join(["?"] * len(values[0])) + ")"
+    _values_x_params = ",".join([sql_placeholder_string(len(columns))]
+                                * no_of_rows)
+    query = f"""INSERT INTO "{formatted_name}"
+                ({_columns})
+                VALUES
+                {_values_x_params}
+             """
+    if query_cache is not None:
+        query_cache[key] = query
+    return query
+
+
+def _column_to_sqlite_values(
+        column: Union[ndarray, Sequence[Optional[VALUE]]]
+        ) -> Sequence[Optional[VALUE]]:
+    """
+    Convert a column of values into a sequence of python objects that
+    sqlite can bind directly. Numpy arrays of scalars are converted in one
+    go with ``tolist``, which is much faster than letting sqlite call an
+    adapter for every single numpy scalar. NaN values are stored as the
+    string 'nan' to match the behaviour of the numpy float adapter.
+    """
+    if not isinstance(column, ndarray):
+        return column
+    if column.dtype.kind == 'f':
+        nans = np.isnan(column)
+        if nans.any():
+            values = column.astype(object)
+            values[nans] = 'nan'
+            return values.tolist()
+    return column.tolist()
+
+
+def insert_many_columns(conn: ConnectionPlus,
+                        formatted_name: str,
+                        columns: List[str],
+                        values: Sequence[Union[ndarray,
+                                               Sequence[Optional[VALUE]]]],
+                        query_cache: Optional[INSERT_QUERY_CACHE] = None
+                        ) -> Optional[int]:
+    """
+    Inserts many rows for the specified columns where the values are given
+    column-wise, i.e. one sequence (typically a 1D numpy array) per column.
+    The rows are inserted in chunks like in :func:`insert_many_values`,
+    see there for the ``query_cache``.
+
+    Example input:
+    columns: ['xparam', 'yparam']
+    values: [np.array([x1, x2, x3]), np.array([y1, y2, y3])]
 
-    a, b = divmod(no_of_rows, rows_per_transaction)
-    chunks = a*[rows_per_transaction] + [b]
-    if chunks[-1] == 0:
-        chunks.pop()
+    Returns the rowid of the first inserted row, or None if there are no
+    rows to insert.
 
-    start = 0
-    stop = 0
+    NOTE this need to be committed before closing the connection.
+    """
+    lengths = [len(col) for col in values]
+    if len(set(lengths)) > 1:
+        raise ValueError('Wrong input format for values. Must specify the '
+                         'same number of values for all columns. Received'
+                         f' lengths {lengths}.')
+    if len(lengths) == 0 or lengths[0] == 0:
+        return None
+
+    chunks = _insert_chunk_sizes(lengths[0], len(columns))
+    rows = zip(*(_column_to_sqlite_values(col) for col in values))
 
+    first_rowid = None
     with atomic(conn) as conn:
         for ii, chunk in enumerate(chunks):
-            _values_x_params = ",".join([_values] * chunk)
-
-            query = f"""INSERT INTO "{formatted_name}"
-                        ({_columns})
-                        VALUES
-                        {_values_x_params}
-                     """
-            stop += chunk
-            # we need to make values a flat list from a list of list
-            flattened_values = list(
-                itertools.chain.from_iterable(values[start:stop]))
-
+            query = _insert_query(formatted_name, columns, chunk, query_cache)
+            flattened_values = list(itertools.chain.from_iterable(
+                itertools.islice(rows, chunk)))
             c = transaction(conn, query, *flattened_values)
-
             if ii == 0:
-                return_value = c.lastrowid
-            start += chunk
+                # rowids of inserted rows are consecutive
+                assert c.lastrowid is not None
+                first_rowid = c.lastrowid - chunk + 1
 
-    return return_value
+    return first_rowid
 
 
 def modify_values(conn: ConnectionPlus,
@@ -0,0 +1,364 @@
+"""
+This module contains the staging of the results of a measurement in a local
+database file, see the ``staging_dir`` argument of
+:meth:`.Measurement.run`.
+
+Writing results to a database file on a network share is slow, since every
+flush waits for the file to be synced remotely. When a run is staged, it is
+created in the database as usual, such that it gets its ``run_id``,
+``captured_run_id``, counter and GUID right away, but its results are
+written to a database file of its own in a local staging directory. Once the
+measurement is done, a background thread merges the results into the
+database in a single transaction and marks the run as completed there.
+Until then, the run in the database has no results; while measuring, they
+can be read from the staged run instead, see
+:attr:`.DataSaver.results_dataset`.
+
+A staged run that has not been merged, e.g. because the process crashed, is
+merged the next time that a run is staged into the same staging directory,
+or by calling :func:`merge_staged_runs`.
+"""
+import atexit
+import functools
+import glob
+import logging
+import os
+import sqlite3
+from queue import Queue
+from threading import Lock, Thread
+from typing import List, Optional, Set
+
+import qcodes
+from qcodes.dataset.data_set import DataSet
+from qcodes.dataset.sqlite.connection import (ConnectionPlus, atomic,
+                                              transaction)
+from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.queries import (completed, get_runid_from_guid,
+                                           new_experiment)
+from qcodes.dataset.sqlite.query_helpers import one, select_one_where
+
+log = logging.getLogger(__name__)
+
+# the name under which the staging DB file is attached to the connection to
+# the database when the run is merged
+STAGING_SCHEMA = 'staging'
+
+# the metadata of the staged run that tells where to merge it into
+_TARGET_DB_PATH = 'staging_target_db_path'
+_TARGET_GUID = 'staging_target_guid'
+
+_STAGING_DB_SUFFIX = '.db'
+_LOCK_SUFFIX = '.lock'
+
+
+def _staging_db_path(staging_dir: str, guid: str) -> str:
+    return os.path.join(staging_dir, guid + _STAGING_DB_SUFFIX)
+
+
+def _lock_path(staging_db_path: str) -> str:
+    return staging_db_path + _LOCK_SUFFIX
+
+
+def _acquire_lock(path: str) -> sqlite3.Connection:
+    """
+    Lock the given file for as long as the returned connection is open. The
+    operating system releases the lock if the process dies, which tells
+    whether a staged run is still being measured.
+    """
+    lock = sqlite3.connect(path, isolation_level=None,
+                           check_same_thread=False)
+    lock.execute('PRAGMA locking_mode=EXCLUSIVE')
+    # nothing is written to the lock file, so it needs no journal
+    lock.execute('PRAGMA journal_mode=OFF')
+    # in exclusive locking mode, the lock is held after the transaction
+    lock.execute('BEGIN EXCLUSIVE')
+    lock.execute('COMMIT')
+    return lock
+
+
+def _is_locked(path: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    conn = sqlite3.connect(path, timeout=0)
+    try:
+        conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchall()
+        return False
+    except sqlite3.OperationalError:
+        return True
+    finally:
+        conn.close()
+
+
+class StagedRun:
+    """
+    The results of a run that are written to a local staging DB file
+    rather than to the database of the run. The staged run is not meant to
+    be created directly, but rather via the ``staging_dir`` argument of
+    :meth:`.Measurement.run`.
+
+    Args:
+        dataset: the run in the database; it must have been started
+        staging_dir: the directory to create the staging DB file in
+    """
+
+    def __init__(self, dataset: DataSet, staging_dir: str) -> None:
+        if dataset.pristine:
+            raise ValueError('Can not stage a run that has not been started')
+        if dataset.path_to_db == '':
+            raise ValueError('Can not stage a run of an in-memory database')
+        os.makedirs(staging_dir, exist_ok=True)
+        _recover_staged_runs_once(staging_dir)
+
+        self.path = _staging_db_path(staging_dir, dataset.guid)
+        self._target = dataset
+        self._lock: Optional[sqlite3.Connection] = \
+            _acquire_lock(_lock_path(self.path))
+
+        conn = connect(self.path)
+        exp_id = new_experiment(conn, name='staging', sample_name='staging')
+        self.dataset = DataSet(conn=conn, exp_id=exp_id, name=dataset.name,
+                               metadata={
+                                   _TARGET_DB_PATH:
+                                       os.path.abspath(dataset.path_to_db),
+                                   _TARGET_GUID: dataset.guid})
+        self.dataset.set_interdependencies(dataset.description.interdeps)
+        self.dataset.mark_started()
+        # the results are published to the subscribers of the run in the
+        # database, as if they were added to it
+        self.dataset.subscribers = dataset.subscribers
+
+    def finish(self) -> None:
+        """
+        Mark the staged run as completed and hand it over to the background
+        merger. The run in the database is marked as completed once it has
+        been merged, see :func:`wait_for_staged_runs`.
+        """
+        self.dataset.mark_completed()
+        self.dataset.conn.close()
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+        _get_merger().queue.put(functools.partial(_merge_and_complete,
+                                                  self.path, self._target))
+
+
+def merge_staged_run(path: str) -> None:
+    """
+    Merge a staged run into the database that it was staged for, and remove
+    its staging DB file.
+
+    The results are copied in one transaction, together with marking the
+    run as completed if the staged run was completed. Merging a staged run
+    that was interrupted by a crash copies the results that were written,
+    and leaves the run incomplete, just like the crash would have done
+    without staging. Merging is idempotent: results that are already in
+    the database are not copied again. The staging DB file is only removed
+    once all of its results are in the database.
+
+    Args:
+        path: path to the staging DB file
+
+    Raises:
+        RuntimeError: if the staged run is still being measured, or if the
+            run has been completed in the database without some of the
+            staged results
+        ValueError: if the run does not exist in the database
+    """
+    lock_path = _lock_path(path)
+    if _is_locked(lock_path):
+        raise RuntimeError(f'The staged run {path} is still being measured')
+
+    staging_conn = connect(path)
+    try:
+        staged = DataSet(conn=staging_conn, run_id=1)
+        target_db_path = staged.metadata[_TARGET_DB_PATH]
+        guid = staged.metadata[_TARGET_GUID]
+        staged_table_name = staged.table_name
+        completed_timestamp = staged.completed_timestamp_raw
+    finally:
+        staging_conn.close()
+
+    target_conn = connect(target_db_path)
+    try:
+        run_id = get_runid_from_guid(target_conn, guid)
+        if run_id is None or run_id == -1:
+            raise ValueError(f'The staged run {path} does not exist in the '
+                             f'database {target_db_path}')
+        # ATTACH can not be executed within a transaction
+        transaction(target_conn,
+                    f'ATTACH DATABASE ? AS "{STAGING_SCHEMA}"', path)
+        table_name = select_one_where(target_conn, 'runs',
+                                      'result_table_name', 'run_id', run_id)
+        if completed(target_conn, run_id):
+            if _last_result_id(target_conn, table_name) < _last_result_id(
+                    target_conn, staged_table_name, STAGING_SCHEMA):
+                # e.g. the run was completed by another process; the staged
+                # results must not be lost, nor added to a completed run
+                raise RuntimeError(f'The run of the staged run {path} has '
+                                   f'been completed in the database '
+                                   f'{target_db_path} without all of the '
+                                   f'staged results')
+        else:
+            with atomic(target_conn) as conn:
+                _copy_new_results(conn, staged_table_name, table_name)
+                if completed_timestamp is not None:
+                    transaction(conn, 'UPDATE runs SET is_completed = 1, '
+                                      'completed_timestamp = ? '
+                                      'WHERE run_id = ?',
+                                completed_timestamp, run_id)
+            if completed_timestamp is not None and \
+                    qcodes.config.dataset.index_setpoints:
+                DataSet(conn=target_conn,
+                        run_id=run_id)._create_setpoint_indexes()
+    finally:
+        target_conn.close()
+
+    os.remove(path)
+    if os.path.exists(lock_path):
+        os.remove(lock_path)
+
+
+def _copy_new_results(conn: ConnectionPlus, staged_table_name: str,
+                      table_name: str) -> None:
+    """
+    Copy the rows of the staged results table that are not in the results
+    table yet, keeping their ids, such that copying again is a NOOP
+    """
+    cursor = transaction(conn, f'PRAGMA "{STAGING_SCHEMA}".table_info'
+                               f'("{staged_table_name}")')
+    column_names = ','.join(f'"{row["name"]}"' for row in cursor.fetchall())
+    last_id = _last_result_id(conn, table_name)
+    transaction(conn, f'INSERT INTO "{table_name}" ({column_names}) '
+                      f'SELECT {column_names} '
+                      f'FROM "{STAGING_SCHEMA}"."{staged_table_name}" '
+                      f'WHERE id > ? ORDER BY id', last_id)
+
+
+def _last_result_id(conn: ConnectionPlus, table_name: str,
+                    schema: str = 'main') -> int:
+    """
+    The id of the last row of a results table, or 0 if it is empty. The
+    rows of a staged run keep their ids when they are merged, so these can
+    be compared between the staged and the merged results table.
+    """
+    return one(transaction(conn, f'SELECT COALESCE(MAX(id), 0) AS last_id '
+                                 f'FROM "{schema}"."{table_name}"'),
+               'last_id')
+
+
+def merge_staged_runs(staging_dir: Optional[str] = None) -> List[str]:
+    """
+    Merge all staged runs in the staging directory that are not being
+    measured anymore into their databases, e.g. after a crash. Runs that
+    can not be merged are logged and left in the staging directory.
+
+    Args:
+        staging_dir: the staging directory; if None, the staging directory
+            that the config points to
+
+    Returns:
+        The paths to the staging DB files of the runs that were merged
+    """
+    staging_dir = staging_dir or qcodes.config.dataset.staging_dir
+    if not staging_dir:
+        raise ValueError('No staging directory given and none configured '
+                         'in qcodes.config.dataset.staging_dir')
+    merged = []
+    for path in sorted(glob.glob(os.path.join(staging_dir,
+                                              '*' + _STAGING_DB_SUFFIX))):
+        if _is_locked(_lock_path(path)):
+            continue
+        try:
+            merge_staged_run(path)
+        except Exception:
+            log.exception(f'Could not merge the staged run {path}')
+        else:
+            merged.append(path)
+    return merged
+
+
+class _StagingMerger(Thread):
+    """
+    Thread that merges staged runs into their databases, one after the
+    other, such that the measurement does not wait for the database. The
+    merges are handed over as callables via the queue. If a merge fails,
+    the failure is logged and the staged run is left for
+    :func:`merge_staged_runs`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.queue: Queue = Queue()
+
+    def run(self) -> None:
+        while True:
+            merge = self.queue.get()
+            try:
+                if merge is None:
+                    break
+                merge()
+            except Exception:
+                log.exception('Could not merge a staged run')
+            finally:
+                self.queue.task_done()
+
+
+def _merge_and_complete(path: str, dataset: DataSet) -> None:
+    merge_staged_run(path)
+    # the dataset belongs to the measurement thread, so its connection can
+    # not be used here, but the run is now completed in the database
+    dataset._completed = True
+
+
+_merger: Optional[_StagingMerger] = None
+_merger_lock = Lock()
+_recovered_dirs: Set[str] = set()
+
+
+def _get_merger() -> _StagingMerger:
+    global _merger
+    with _merger_lock:
+        if _merger is None:
+            _merger = _StagingMerger()
+            _merger.start()
+            atexit.register(_stop_merger)
+        return _merger
+
+
+def _stop_merger() -> None:
+    """
+    Let the merger finish merging the runs handed over to it, such that
+    they do not have to be recovered after the process exits
+    """
+    global _merger
+    with _merger_lock:
+        merger, _merger = _merger, None
+    if merger is not None:
+        merger.queue.put(None)
+        merger.join()
+
+
+def _recover_staged_runs_once(staging_dir: str) -> None:
+    """
+    Have the background merger merge the runs that were left in the
+    staging directory by an earlier process, the first time that a run is
+    staged into it by this process
+    """
+    staging_dir = os.path.abspath(staging_dir)
+    with _merger_lock:
+        if staging_dir in _recovered_dirs:
+            return
+        _recovered_dirs.add(staging_dir)
+    _get_merger().queue.put(functools.partial(merge_staged_runs,
+                                              staging_dir))
+
+
+def wait_for_staged_runs() -> None:
+    """
+    Wait until the background merger has merged all the staged runs that
+    have been handed over to it
+    """
+    with _merger_lock:
+        merger = _merger
+    if merger is not None:
+        merger.queue.join()
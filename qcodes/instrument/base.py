@@ -1,14 +1,16 @@
 """Instrument base class."""
+import asyncio
 import time
 import weakref
 import logging
 from abc import ABC
 from typing import Sequence, Optional, Dict, Union, Callable, Any, List, \
-    TYPE_CHECKING, cast, Type
+    TYPE_CHECKING, cast, Type, Tuple
 
 import numpy as np
 from qcodes.utils.helpers import DelegateAttributes, strip_attrs, full_class
 from qcodes.utils.metadata import Metadatable
+from qcodes.utils.threading import to_thread
 from qcodes.utils.validators import Anything
 from qcodes.logger.instrument_logger import get_instrument_logger
 from .parameter import Parameter, _BaseParameter
@@ -197,6 +199,12 @@ class InstrumentBase(Metadatable, DelegateAttributes):
             "__class__": full_class(self)
         }
 
+        raw_values = {}
+        if update:
+            raw_values = self._ask_parameters_pipelined(
+                [name for name in self.parameters
+                 if name not in params_to_skip_update])
+
         snap['parameters'] = {}
         for name, param in self.parameters.items():
             if param.snapshot_exclude:
@@ -207,6 +215,9 @@ class InstrumentBase(Metadatable, DelegateAttributes):
                 update_par = update
 
             try:
+                if name in raw_values:
+                    param._update_cache_from_raw_value(raw_values[name])
+                    update_par = False
                 snap['parameters'][name] = param.snapshot(update=update_par)
             except:
                 # really log this twice. Once verbose for the UI and once
@@ -221,6 +232,50 @@ class InstrumentBase(Metadatable, DelegateAttributes):
                 snap[attr] = getattr(self, attr)
         return snap
 
+    def _pipelining_instrument(self) -> Optional['Instrument']:
+        """
+        The instrument that can send the queries of this instrument with
+        :meth:`Instrument.ask_many`, or None if the queries of this
+        instrument are not pipelined
+        """
+        return None
+
+    def _ask_parameters_pipelined(self, names: Sequence[str]
+                                  ) -> Dict[str, str]:
+        """
+        Ask the queries of the given parameters that are read with a plain
+        query string (``get_cmd``) in one pipelined batch, if this instrument
+        pipelines queries, such that a snapshot of many parameters does not
+        wait for a round trip per parameter.
+
+        Returns:
+            The raw responses of the parameters that were asked, by name. If
+            the batch fails, no parameters are returned, and they are read
+            one by one instead.
+        """
+        instrument = self._pipelining_instrument()
+        if instrument is None:
+            return {}
+        queries = {}
+        for name in names:
+            param = self.parameters[name]
+            if (param.snapshot_exclude or not param._snapshot_get or
+                    not param._snapshot_value or param.instrument is not self):
+                continue
+            cmd_str = param._instrument_cmd_str(
+                getattr(param, 'get_raw', None), 'ask')
+            if cmd_str is not None:
+                queries[name] = cmd_str.format()
+        if len(queries) < 2:
+            return {}
+        try:
+            responses = instrument.ask_many(list(queries.values()))
+        except Exception:
+            self.log.info("Could not ask the parameters in one batch, "
+                          "asking them one by one", exc_info=True)
+            return {}
+        return dict(zip(queries, responses))
+
     def print_readable_snapshot(self, update: bool = False,
                                 max_chars: int = 80) -> None:
         """
@@ -431,6 +486,21 @@ class Instrument(InstrumentBase, AbstractInstrument):
     _type = None
     _instances: List[weakref.ref] = []
 
+    # the lock that serializes the async communication with the instrument,
+    # and the event loop that it belongs to
+    _async_io_lock: Optional[Tuple[asyncio.AbstractEventLoop,
+                                   asyncio.Lock]] = None
+
+    #: The number of queries that :meth:`ask_many` sends to the instrument
+    #: before reading any of their responses. Drivers of instruments that
+    #: accept queued queries can raise this to save a round trip per query.
+    max_pipelined_queries: int = 1
+    #: If not None, :meth:`ask_many` joins the queries that are pipelined
+    #: with this separator into a single message, and splits the response
+    #: with it, e.g. ``';'`` for SCPI instruments. If None, the queries are
+    #: sent one after the other, and the responses read in order.
+    query_separator: Optional[str] = None
+
     def __init__(self, name: str,
                  metadata: Optional[Dict] = None) -> None:
         self._t0 = time.time()
@@ -785,6 +855,165 @@ class Instrument(InstrumentBase, AbstractInstrument):
             'Instrument {} has not defined an ask method'.format(
                 type(self).__name__))
 
+    def ask_many(self, cmds: Sequence[str]) -> List[str]:
+        """
+        Write many command strings to the hardware and return their
+        responses, in order.
+
+        Up to ``max_pipelined_queries`` commands are sent before their
+        responses are read, see also ``query_separator``. By default, the
+        commands are asked one by one with :meth:`ask`.
+
+        Args:
+            cmds: The strings to send to the instrument.
+
+        Returns:
+            The responses to the commands
+
+        Raises:
+            Exception: Wraps any underlying exception with extra context,
+                including the commands and the instrument.
+        """
+        if self.max_pipelined_queries <= 1:
+            return [self.ask(cmd) for cmd in cmds]
+        try:
+            responses: List[str] = []
+            for start in range(0, len(cmds), self.max_pipelined_queries):
+                responses += self.ask_many_raw(
+                    cmds[start:start + self.max_pipelined_queries])
+            return responses
+
+        except Exception as e:
+            inst = repr(self)
+            e.args = e.args + ('asking ' + repr(list(cmds)) + ' to ' + inst,)
+            raise e
+
+    def ask_many_raw(self, cmds: Sequence[str]) -> List[str]:
+        """
+        Low level method to send a batch of commands to the hardware, and
+        return their responses in order.
+
+        Subclasses that define a new hardware communication should override
+        this method to pipeline the commands, otherwise they are asked one by
+        one with :meth:`ask_raw`.
+
+        Args:
+            cmds: The strings to send to the instrument.
+        """
+        return [self.ask_raw(cmd) for cmd in cmds]
+
+    def _get_async_io_lock(self) -> asyncio.Lock:
+        """
+        The lock that the async communication with this instrument holds,
+        such that the commands and responses of concurrent coroutines are
+        not interleaved. There is one lock per event loop.
+        """
+        loop = asyncio.get_event_loop()
+        if self._async_io_lock is None or self._async_io_lock[0] is not loop:
+            self._async_io_lock = (loop, asyncio.Lock())
+        return self._async_io_lock[1]
+
+    async def write_async(self, cmd: str) -> None:
+        """
+        Write a command string with NO response to the hardware, without
+        blocking the running event loop, such that many instruments can be
+        communicated with concurrently. The async communication with this
+        instrument is serialized, but it must not be mixed with concurrent
+        blocking communication from other threads.
+
+        Subclasses that transform ``cmd`` in an override of :meth:`write`
+        are written to in a thread. Subclasses that define a new async
+        hardware communication should override :meth:`write_raw_async`.
+
+        Args:
+            cmd: The string to send to the instrument.
+
+        Raises:
+            Exception: Wraps any underlying exception with extra context,
+                including the command and the instrument.
+        """
+        async with self._get_async_io_lock():
+            if type(self).write is not Instrument.write:
+                await to_thread(self.write, cmd)
+                return
+            try:
+                await self.write_raw_async(cmd)
+            except Exception as e:
+                inst = repr(self)
+                e.args = e.args + ('writing ' + repr(cmd) + ' to ' + inst,)
+                raise e
+
+    async def write_raw_async(self, cmd: str) -> None:
+        """
+        Low level method to write a command string to the hardware without
+        blocking the running event loop. By default, :meth:`write_raw` is
+        called in a thread.
+
+        Args:
+            cmd: The string to send to the instrument.
+        """
+        await to_thread(self.write_raw, cmd)
+
+    async def ask_async(self, cmd: str) -> str:
+        """
+        Write a command string to the hardware and return a response,
+        without blocking the running event loop, see :meth:`write_async`.
+
+        Subclasses that transform ``cmd`` in an override of :meth:`ask` are
+        asked in a thread. Subclasses that define a new async hardware
+        communication should override :meth:`ask_raw_async`.
+
+        Args:
+            cmd: The string to send to the instrument.
+
+        Returns:
+            response
+
+        Raises:
+            Exception: Wraps any underlying exception with extra context,
+                including the command and the instrument.
+        """
+        async with self._get_async_io_lock():
+            if type(self).ask is not Instrument.ask:
+                return await to_thread(self.ask, cmd)
+            try:
+                return await self.ask_raw_async(cmd)
+            except Exception as e:
+                inst = repr(self)
+                e.args = e.args + ('asking ' + repr(cmd) + ' to ' + inst,)
+                raise e
+
+    async def ask_raw_async(self, cmd: str) -> str:
+        """
+        Low level method to write to the hardware and return a response
+        without blocking the running event loop. By default,
+        :meth:`ask_raw` is called in a thread.
+
+        Args:
+            cmd: The string to send to the instrument.
+        """
+        return await to_thread(self.ask_raw, cmd)
+
+    def _split_joined_response(self, response: str, count: int) -> List[str]:
+        """
+        Split the response to ``count`` queries that were joined with the
+        ``query_separator`` into a single message
+        """
+        assert self.query_separator is not None
+        responses = response.split(self.query_separator)
+        if len(responses) != count:
+            raise RuntimeError(f'Expected {count} responses separated by '
+                               f'{self.query_separator!r}, got {response!r}')
+        return responses
+
+    def _pipelining_instrument(self) -> Optional['Instrument']:
+        # queries that are transformed by an override of ask can not be
+        # sent with ask_many
+        if self.max_pipelined_queries > 1 and \
+                type(self).ask is Instrument.ask:
+            return self
+        return None
+
 
 def find_or_create_instrument(instrument_class: Type[Instrument],
                               name: str,
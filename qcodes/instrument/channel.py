@@ -10,6 +10,10 @@ from .parameter import (MultiParameter, ArrayParameter, Parameter,
 from ..utils.validators import Validator
 from ..utils.metadata import Metadatable
 from ..utils.helpers import full_class
+from ..utils.threading import to_thread
+
+BatchedGetType = Callable[[Sequence['InstrumentChannel']],
+                          Sequence[ParamRawDataType]]
 
 
 class InstrumentChannel(InstrumentBase):
@@ -69,10 +73,34 @@ class InstrumentChannel(InstrumentBase):
     def ask_raw(self, cmd: str) -> str:
         return self._parent.ask_raw(cmd)
 
+    async def write_async(self, cmd: str) -> None:
+        if type(self).write is InstrumentChannel.write:
+            await self._parent.write_async(cmd)
+            return
+        # the command is transformed by an override of write
+        root_instrument = cast(Instrument, self.root_instrument)
+        async with root_instrument._get_async_io_lock():
+            await to_thread(self.write, cmd)
+
+    async def ask_async(self, cmd: str) -> str:
+        if type(self).ask is InstrumentChannel.ask:
+            return await self._parent.ask_async(cmd)
+        # the command is transformed by an override of ask
+        root_instrument = cast(Instrument, self.root_instrument)
+        async with root_instrument._get_async_io_lock():
+            return await to_thread(self.ask, cmd)
+
     @property
     def parent(self) -> InstrumentBase:
         return self._parent
 
+    def _pipelining_instrument(self) -> Optional[Instrument]:
+        # the queries are passed on to the parent, unless they are
+        # transformed by an override of ask
+        if type(self).ask is InstrumentChannel.ask:
+            return self._parent._pipelining_instrument()
+        return None
+
     @property
     def root_instrument(self) -> InstrumentBase:
         return self._parent.root_instrument
@@ -96,23 +124,49 @@ class MultiChannelInstrumentParameter(MultiParameter):
           simultaneously.
 
         param_name(str): Name of the multichannel parameter
+
+        batched_get: Optional function that reads the raw values of the
+          parameter of all the given channels at once, see
+          :meth:`ChannelList.add_batched_get`. If None, the parameter is
+          read from each channel in turn.
     """
     def __init__(self,
                  channels: Sequence[InstrumentChannel],
                  param_name: str,
-                 *args: Any, **kwargs: Any) -> None:
+                 *args: Any,
+                 batched_get: Optional[BatchedGetType] = None,
+                 **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self._channels = channels
         self._param_name = param_name
+        self._batched_get = batched_get
 
     def get_raw(self) -> Tuple[ParamRawDataType, ...]:
         """
         Return a tuple containing the data from each of the channels in the
         list.
         """
+        if self._batched_get is not None:
+            return self._get_batched(self._batched_get)
         return tuple(chan.parameters[self._param_name].get() for chan
                      in self._channels)
 
+    def _get_batched(self, batched_get: BatchedGetType
+                     ) -> Tuple[ParamRawDataType, ...]:
+        """
+        Read the raw values of all channels at once, and update the
+        parameters of the channels with them as if each of them was read
+        """
+        raw_values = batched_get(self._channels)
+        if len(raw_values) != len(self._channels):
+            raise RuntimeError(f'The batched get of {self._param_name} '
+                               f'returned {len(raw_values)} values for '
+                               f'{len(self._channels)} channels')
+        return tuple(
+            chan.parameters[self._param_name]._update_cache_from_raw_value(
+                raw_value)
+            for chan, raw_value in zip(self._channels, raw_values))
+
     def set_raw(self, value: ParamRawDataType) -> None:
         """
         Set all parameters to this value.
@@ -195,6 +249,7 @@ class ChannelList(Metadatable):
         self._chan_type = chan_type
         self._snapshotable = snapshotable
         self._paramclass = multichan_paramclass
+        self._batched_gets: Dict[str, BatchedGetType] = {}
 
         self._channel_mapping: Dict[str, InstrumentChannel] = {}
         # provide lookup of channels by name
@@ -226,14 +281,17 @@ class ChannelList(Metadatable):
               to get
         """
         if isinstance(i, slice):
-            return ChannelList(self._parent, self._name, self._chan_type,
-                               self._channels[i],
-                               multichan_paramclass=self._paramclass)
+            sublist = ChannelList(self._parent, self._name, self._chan_type,
+                                  self._channels[i],
+                                  multichan_paramclass=self._paramclass)
         elif isinstance(i, tuple):
-            return ChannelList(self._parent, self._name, self._chan_type,
-                               [self._channels[j] for j in i],
-                               multichan_paramclass=self._paramclass)
-        return self._channels[i]
+            sublist = ChannelList(self._parent, self._name, self._chan_type,
+                                  [self._channels[j] for j in i],
+                                  multichan_paramclass=self._paramclass)
+        else:
+            return self._channels[i]
+        sublist._batched_gets = dict(self._batched_gets)
+        return sublist
 
     def __iter__(self) -> Iterator['InstrumentChannel']:
         return iter(self._channels)
@@ -271,8 +329,41 @@ class ChannelList(Metadatable):
             raise ValueError("Can only add channels from the same parent "
                              "together.")
 
-        return ChannelList(self._parent, self._name, self._chan_type,
-                           list(self._channels) + list(other._channels))
+        combined = ChannelList(self._parent, self._name, self._chan_type,
+                               list(self._channels) + list(other._channels))
+        combined._batched_gets = {
+            name: batched_get
+            for name, batched_get in self._batched_gets.items()
+            if other._batched_gets.get(name) == batched_get}
+        return combined
+
+    def add_batched_get(self, param_name: str,
+                        batched_get: BatchedGetType) -> None:
+        """
+        Declare how the parameter ``param_name`` of many channels is read at
+        once, e.g. with a single command that returns the values of all
+        channels, or by sending the queries of all channels before reading
+        any of the responses. The multi-channel parameter
+        (``channel_list.<param_name>``) of this list, and of the lists that
+        are sliced from it, then uses ``batched_get`` rather than reading
+        the channels one by one.
+
+        Args:
+            param_name: The name of the parameter of the channels
+            batched_get: Function that is called with the channels to read
+                and returns their raw values, i.e. what the ``get_raw`` of
+                the parameter of each channel would return. The values are
+                parsed, scaled etc. by the parameters of the channels as
+                usual, and the parameters of the channels are updated with
+                them, as if each of them had been read.
+
+        Raises:
+            ValueError: If the channels have no parameter ``param_name``
+        """
+        if self._channels and param_name not in self._channels[0].parameters:
+            raise ValueError(f'The channels of {self._name} have no '
+                             f'parameter {param_name}')
+        self._batched_gets[param_name] = batched_get
 
     def append(self, obj: InstrumentChannel) -> None:
         """
@@ -470,6 +561,12 @@ class ChannelList(Metadatable):
             else:
                 shapes = tuple(() for _ in self._channels)
 
+            # only pass a batched get if there is one, such that subclasses
+            # of MultiChannelInstrumentParameter do not need to accept it
+            kwargs = {}
+            if name in self._batched_gets:
+                kwargs['batched_get'] = self._batched_gets[name]
+
             param = self._paramclass(self._channels,
                                      param_name=name,
                                      name="Multi_{}".format(name),
@@ -481,7 +578,8 @@ class ChannelList(Metadatable):
                                      setpoints=setpoints,
                                      setpoint_names=setpoint_names,
                                      setpoint_units=setpoint_units,
-                                     setpoint_labels=setpoint_labels)
+                                     setpoint_labels=setpoint_labels,
+                                     **kwargs)
             return param
 
         # Check if this is a valid function
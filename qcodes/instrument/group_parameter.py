@@ -6,7 +6,7 @@ should be of type :class:`GroupParameter`
 
 
 from collections import OrderedDict
-from typing import List, Union, Callable, Dict, Any, Optional
+from typing import List, Union, Callable, Dict, Any, Optional, Sequence
 
 from qcodes.instrument.parameter import Parameter
 from qcodes import Instrument
@@ -142,7 +142,10 @@ class Group:
         set_cmd: Format string of the command that is used for setting the
             valueS of the parameters; for example, ``CMD {a}, {b}``.
         get_cmd: String of the command that is used for getting the values
-            of the parameters; for example, ``CMD?``.
+            of the parameters; for example, ``CMD?``. If the values are
+            read with several commands, a sequence of commands, which are
+            sent in one batch with :meth:`.Instrument.ask_many`; their
+            responses are joined with the ``separator`` before parsing.
         separator: A separator that is used when parsing the output of the
             ``get_cmd`` in order to obtain the values of the parameters; it
             is ignored in case a custom ``get_parser`` is used.
@@ -156,7 +159,7 @@ class Group:
     def __init__(self,
                  parameters: List[GroupParameter],
                  set_cmd: str = None,
-                 get_cmd: str = None,
+                 get_cmd: Union[str, Sequence[str], None] = None,
                  get_parser: Union[Callable[[str],
                                             Dict[str, Any]], None] = None,
                  separator: str = ','
@@ -174,6 +177,7 @@ class Group:
 
         self.set_cmd = set_cmd
         self.get_cmd = get_cmd
+        self._separator = separator
 
         if get_parser:
             self.get_parser = get_parser
@@ -249,6 +253,11 @@ class Group:
         if self.instrument is None:
             raise RuntimeError("Trying to update GroupParameter not attached "
                                "to any instrument.")
-        ret = self.get_parser(self.instrument.ask(self.get_cmd))
+        if self.get_cmd is None or isinstance(self.get_cmd, str):
+            response = self.instrument.ask(self.get_cmd)
+        else:
+            response = self._separator.join(
+                self.instrument.ask_many(self.get_cmd))
+        ret = self.get_parser(response)
         for name, p in list(self.parameters.items()):
             p.get(result=ret[name])
@@ -1,4 +1,5 @@
 """Ethernet instrument driver class based on sockets."""
+import asyncio
 import socket
 import logging
 from typing import Dict, Sequence, Optional
@@ -54,6 +55,8 @@ class IPInstrument(Instrument):
         self._buffer_size = 1400
 
         self._socket = None
+        # a non-blocking duplicate of the socket for the async communication
+        self._async_socket = None
 
         self.set_persistent(persistent)
 
@@ -113,6 +116,9 @@ class IPInstrument(Instrument):
             self._socket = None
 
     def _disconnect(self):
+        if getattr(self, '_async_socket', None) is not None:
+            self._async_socket.close()
+            self._async_socket = None
         if getattr(self, '_socket', None) is None:
             return
         log.info("Socket shutdown")
@@ -157,6 +163,32 @@ class IPInstrument(Instrument):
                         "Connection broken.")
         return result.decode()
 
+    def _get_async_socket(self):
+        # the duplicate shares the connection, and the timeout of the socket
+        # already puts it in non-blocking mode at the OS level, so the
+        # blocking communication is not affected by the duplicate
+        if self._async_socket is None:
+            self._async_socket = self._socket.dup()
+            self._async_socket.setblocking(False)
+        return self._async_socket
+
+    async def _send_async(self, cmd):
+        data = cmd + self._terminator
+        log.debug(f"Writing {data} to instrument {self.name}")
+        loop = asyncio.get_event_loop()
+        await loop.sock_sendall(self._get_async_socket(), data.encode())
+
+    async def _recv_async(self):
+        loop = asyncio.get_event_loop()
+        result = await asyncio.wait_for(
+            loop.sock_recv(self._get_async_socket(), self._buffer_size),
+            self._timeout)
+        log.debug(f"Got {result} from instrument {self.name}")
+        if result == b'':
+            log.warning("Got empty response from Socket recv() "
+                        "Connection broken.")
+        return result.decode()
+
     def close(self):
         """Disconnect and irreversibly tear down the instrument."""
         self._disconnect()
@@ -189,6 +221,77 @@ class IPInstrument(Instrument):
             self._send(cmd)
             return self._recv()
 
+    def ask_many_raw(self, cmds):
+        """
+        Low-level interface to send a batch of queries. If the
+        ``query_separator`` is set, the queries are joined into a single
+        message, otherwise they are all sent before their responses are
+        read. In the latter case, the responses have to be terminated with
+        the terminator, which is how they are told apart.
+
+        Args:
+            cmds (Sequence[str]): The commands to send to the instrument.
+
+        Returns:
+            List[str]: The instrument's responses, in order.
+        """
+        if self.query_separator is not None:
+            response = self.ask_raw(self.query_separator.join(cmds))
+            return self._split_joined_response(response, len(cmds))
+        if not self._terminator:
+            return [self.ask_raw(cmd) for cmd in cmds]
+
+        with self._ensure_connection:
+            for cmd in cmds:
+                self._send(cmd)
+            received = ''
+            while received.count(self._terminator) < len(cmds):
+                data = self._recv()
+                if data == '':
+                    raise ConnectionError(
+                        f'Connection broken after receiving {received!r}')
+                received += data
+        responses = received.split(self._terminator)
+        if any(responses[len(cmds):]):
+            log.warning(f"Got more responses than queries from instrument "
+                        f"{self.name}: {received!r}")
+        # as returned by ask_raw
+        return [response + self._terminator
+                for response in responses[:len(cmds)]]
+
+    async def write_raw_async(self, cmd):
+        """
+        Low-level interface to send a command that gets no response, on the
+        socket of the instrument with :mod:`asyncio`. If the socket is not
+        persistent, the command is sent in a thread instead.
+
+        Args:
+            cmd (str): The command to send to the instrument.
+        """
+        if not self._persistent or self._socket is None:
+            await super().write_raw_async(cmd)
+            return
+        await self._send_async(cmd)
+        if self._confirmation:
+            await self._recv_async()
+
+    async def ask_raw_async(self, cmd):
+        """
+        Low-level interface to send a command an read a response, on the
+        socket of the instrument with :mod:`asyncio`. If the socket is not
+        persistent, the command is asked in a thread instead.
+
+        Args:
+            cmd (str): The command to send to the instrument.
+
+        Returns:
+            str: The instrument's response.
+        """
+        if not self._persistent or self._socket is None:
+            return await super().ask_raw_async(cmd)
+        await self._send_async(cmd)
+        return await self._recv_async()
+
     def __del__(self):
         self.close()
 
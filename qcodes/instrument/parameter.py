@@ -74,6 +74,7 @@ more specialized ones:
 
 from datetime import datetime, timedelta
 from copy import copy
+import asyncio
 from operator import xor
 import time
 import logging
@@ -93,6 +94,7 @@ from qcodes.utils.helpers import (permissive_range, is_sequence_of,
                                   warn_units)
 from qcodes.utils.metadata import Metadatable
 from qcodes.utils.command import Command
+from qcodes.utils.threading import to_thread
 from qcodes.utils.validators import Validator, Ints, Strings, Enum, Arrays
 from qcodes.instrument.sweep_values import SweepFixedValues
 from qcodes.data.data_array import DataArray
@@ -596,6 +598,27 @@ class _BaseParameter(Metadatable):
 
         return value
 
+    def _update_cache_from_raw_value(self, raw_value: ParamRawDataType
+                                     ) -> ParamDataType:
+        """
+        Convert a raw value that was read from the instrument to the value
+        of the parameter, and update the cache with both, as getting the
+        parameter does. This is a private method for internal QCoDeS use,
+        e.g. for updating the parameters of many channels from a single
+        query.
+
+        Returns:
+            The value of the parameter
+        """
+        value = self._from_raw_value_to_value(raw_value)
+
+        if self._validate_on_get:
+            self.validate(value)
+
+        self._update_cache_with(value=value, raw_value=raw_value)
+
+        return value
+
     def _wrap_get(self, get_function: Callable[..., ParamDataType]) ->\
             Callable[..., ParamDataType]:
         @wraps(get_function)
@@ -604,14 +627,7 @@ class _BaseParameter(Metadatable):
                 # There might be cases where a .get also has args/kwargs
                 raw_value = get_function(*args, **kwargs)
 
-                value = self._from_raw_value_to_value(raw_value)
-
-                if self._validate_on_get:
-                    self.validate(value)
-
-                self._update_cache_with(value=value, raw_value=raw_value)
-
-                return value
+                return self._update_cache_from_raw_value(raw_value)
 
             except Exception as e:
                 e.args = e.args + ('getting {}'.format(self),)
@@ -619,48 +635,62 @@ class _BaseParameter(Metadatable):
 
         return get_wrapper
 
-    def _wrap_set(self, set_function: Callable[..., None]) -> \
-            Callable[..., None]:
-        @wraps(set_function)
-        def set_wrapper(value: ParamDataType, **kwargs: Any) -> None:
-            try:
-                self.validate(value)
+    def _set_steps(self, value: ParamDataType
+                   ) -> Iterator[Tuple[str, Any]]:
+        """
+        The steps of setting the parameter to ``value``, shared by the
+        synchronous set and :meth:`set_async`, which carry them out. Each
+        step is either ``('sleep', seconds)`` or ``('set', raw_value)``;
+        the cache is updated once the caller resumes the iteration after
+        setting a raw value.
+        """
+        self.validate(value)
 
-                # In some cases intermediate sweep values must be used.
-                # Unless `self.step` is defined, get_sweep_values will return
-                # a list containing only `value`.
-                steps = self.get_ramp_values(value, step=self.step)
+        # In some cases intermediate sweep values must be used.
+        # Unless `self.step` is defined, get_sweep_values will return
+        # a list containing only `value`.
+        steps = self.get_ramp_values(value, step=self.step)
 
-                for step_index, val_step in enumerate(steps):
-                    # even if the final value is valid we may be generating
-                    # steps that are not so validate them too
-                    self.validate(val_step)
+        for val_step in steps:
+            # even if the final value is valid we may be generating
+            # steps that are not so validate them too
+            self.validate(val_step)
 
-                    raw_val_step = self._from_value_to_raw_value(val_step)
+            raw_val_step = self._from_value_to_raw_value(val_step)
 
-                    # Check if delay between set operations is required
-                    t_elapsed = time.perf_counter() - self._t_last_set
-                    if t_elapsed < self.inter_delay:
-                        # Sleep until time since last set is larger than
-                        # self.inter_delay
-                        time.sleep(self.inter_delay - t_elapsed)
+            # Check if delay between set operations is required
+            t_elapsed = time.perf_counter() - self._t_last_set
+            if t_elapsed < self.inter_delay:
+                # Sleep until time since last set is larger than
+                # self.inter_delay
+                yield 'sleep', self.inter_delay - t_elapsed
 
-                    # Start timer to measure execution time of set_function
-                    t0 = time.perf_counter()
+            # Start timer to measure execution time of the set
+            t0 = time.perf_counter()
 
-                    set_function(raw_val_step, **kwargs)
+            yield 'set', raw_val_step
 
-                    self._update_cache_with(value=val_step,
-                                            raw_value=raw_val_step)
+            self._update_cache_with(value=val_step, raw_value=raw_val_step)
 
-                    # Update last set time (used for calculating delays)
-                    self._t_last_set = time.perf_counter()
+            # Update last set time (used for calculating delays)
+            self._t_last_set = time.perf_counter()
 
-                    # Check if any delay after setting is required
-                    t_elapsed = self._t_last_set - t0
-                    if t_elapsed < self.post_delay:
-                        # Sleep until total time is larger than self.post_delay
-                        time.sleep(self.post_delay - t_elapsed)
+            # Check if any delay after setting is required
+            t_elapsed = self._t_last_set - t0
+            if t_elapsed < self.post_delay:
+                # Sleep until total time is larger than self.post_delay
+                yield 'sleep', self.post_delay - t_elapsed
+
+    def _wrap_set(self, set_function: Callable[..., None]) -> \
+            Callable[..., None]:
+        @wraps(set_function)
+        def set_wrapper(value: ParamDataType, **kwargs: Any) -> None:
+            try:
+                for action, arg in self._set_steps(value):
+                    if action == 'sleep':
+                        time.sleep(arg)
+                    else:
+                        set_function(arg, **kwargs)
 
             except Exception as e:
                 e.args = e.args + ('setting {} to {}'.format(self, value),)
@@ -668,8 +698,94 @@ class _BaseParameter(Metadatable):
 
         return set_wrapper
 
+    def _instrument_cmd_str(self, command: Any, method: str
+                            ) -> Optional[str]:
+        """
+        The command string of a ``get_raw`` or ``set_raw`` that is a plain
+        command string (``get_cmd`` or ``set_cmd``), which is sent with the
+        ``method`` (``'ask'`` or ``'write'``) of the instrument of this
+        parameter, or None if it is anything else.
+        """
+        if (isinstance(command, Command) and self._instrument is not None and
+                getattr(command, 'exec_str', None) ==
+                getattr(self._instrument, method, None) and
+                not hasattr(command, 'input_parser') and
+                not hasattr(command, 'output_parser')):
+            return command.cmd_str
+        return None
+
+    async def _call_in_thread(self, function: Callable[..., Any],
+                              *args: Any) -> Any:
+        """
+        Call a blocking function of this parameter in a thread, holding the
+        async I/O lock of its instrument, see :meth:`.Instrument.ask_async`
+        """
+        root_instrument = self.root_instrument
+        get_lock = getattr(root_instrument, '_get_async_io_lock', None)
+        if get_lock is None:
+            return await to_thread(function, *args)
+        async with get_lock():
+            return await to_thread(function, *args)
+
+    async def get_async(self) -> ParamDataType:
+        """
+        Get the value of the parameter without blocking the running event
+        loop, such that many parameters, notably of different instruments,
+        can be read concurrently, e.g. with :func:`asyncio.gather`.
+
+        A parameter that is read with a ``get_cmd`` string is asked with
+        :meth:`.Instrument.ask_async` of its instrument; any other
+        parameter is gotten in a thread. Either way, the communication with
+        an instrument is not interleaved with other async communication
+        with the same instrument.
+        """
+        cmd_str = self._instrument_cmd_str(getattr(self, 'get_raw', None),
+                                           'ask')
+        if cmd_str is None:
+            return await self._call_in_thread(self.get)
+        instrument = cast('Instrument', self._instrument)
+        try:
+            raw_value = await instrument.ask_async(cmd_str.format())
+            return self._update_cache_from_raw_value(raw_value)
+        except Exception as e:
+            e.args = e.args + ('getting {}'.format(self),)
+            raise e
+
+    async def set_async(self, value: ParamDataType) -> None:
+        """
+        Set the parameter to the given value without blocking the running
+        event loop, see :meth:`get_async`. For a parameter that is set with
+        a ``set_cmd`` string, the ``step``, ``inter_delay`` and
+        ``post_delay`` are waited for with :func:`asyncio.sleep`.
+
+        Args:
+            value: The value to set the parameter to.
+        """
+        cmd_str = self._instrument_cmd_str(getattr(self, 'set_raw', None),
+                                           'write')
+        if cmd_str is None:
+            await self._call_in_thread(self.set, value)
+            return
+        instrument = cast('Instrument', self._instrument)
+        try:
+            if (self.step is not None and hasattr(self, 'get') and
+                    self.get_latest._is_outdated()):
+                # get the value to ramp from here, as get_ramp_values
+                # would get it blocking the event loop
+                await self.get_async()
+
+            for action, arg in self._set_steps(value):
+                if action == 'sleep':
+                    await asyncio.sleep(arg)
+                else:
+                    await instrument.write_async(cmd_str.format(arg))
+
+        except Exception as e:
+            e.args = e.args + ('setting {} to {}'.format(self, value),)
+            raise e
+
     def get_ramp_values(self, value: Union[Number, Sized],
-                        step: Number = None) -> List[Union[Number,
+                        step: Optional[Number] = None) -> List[Union[Number,
                                                            Sized]]:
         """
         Return values to sweep from current value to target value.
@@ -1815,6 +1931,20 @@ class GetLatest(DelegateAttributes):
             else:
                 return state['value']
 
+    def _is_outdated(self) -> bool:
+        """
+        Whether :meth:`get` would perform a `get()` of the parameter, as it
+        never has been captured or was captured more than `max_val_age`
+        ago.
+        """
+        state = self.parameter._latest
+        if state['ts'] is None:
+            return True
+        if self.max_val_age is None:
+            return False
+        oldest_ok_val = datetime.now() - timedelta(seconds=self.max_val_age)
+        return state['ts'] < oldest_ok_val
+
     def get_timestamp(self) -> Optional[datetime]:
         """
         Return the age of the latest parameter value.
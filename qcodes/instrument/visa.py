@@ -1,5 +1,5 @@
 """Visa instrument driver based on pyvisa."""
-from typing import Sequence, Optional, Dict, Union, Any
+from typing import Sequence, Optional, Dict, Union, Any, List
 import warnings
 import logging
 
@@ -228,6 +228,34 @@ class VisaInstrument(Instrument):
             self.visa_log.debug(f"Response: {response}")
         return response
 
+    def ask_many_raw(self, cmds: Sequence[str]) -> List[str]:
+        """
+        Low-level interface to send a batch of queries. If the
+        ``query_separator`` is set, the queries are joined into a single
+        ``visa_handle.query``, otherwise they are all written before their
+        responses are read.
+
+        Args:
+            cmds: The commands to send to the instrument.
+
+        Returns:
+            The instrument's responses, in order.
+        """
+        with DelayedKeyboardInterrupt():
+            if self.query_separator is not None:
+                response = self.ask_raw(self.query_separator.join(cmds))
+                return self._split_joined_response(response, len(cmds))
+
+            for cmd in cmds:
+                self.visa_log.debug(f"Writing: {cmd}")
+                self.visa_handle.write(cmd)
+            responses = []
+            for _ in cmds:
+                response = self.visa_handle.read()
+                self.visa_log.debug(f"Response: {response}")
+                responses.append(response)
+        return responses
+
     def snapshot_base(self, update: bool = True,
                       params_to_skip_update: Optional[Sequence[str]] = None
                       ) -> Dict:
@@ -3,9 +3,13 @@ Station objects - collect all the equipment you use to do an experiment.
 """
 
 
+from collections import deque
 from contextlib import suppress
+from threading import Condition, Thread
+from time import perf_counter
 from typing import (
-    Dict, List, Optional, Sequence, Any, cast, AnyStr, IO, Iterator, Tuple)
+    Dict, List, Optional, Sequence, Any, cast, AnyStr, IO, Iterator, Set,
+    Tuple)
 from types import ModuleType
 from functools import partial
 import importlib
@@ -22,7 +26,7 @@ import jsonschema
 import warnings
 
 import qcodes
-from qcodes.utils.metadata import Metadatable
+from qcodes.utils.metadata import Metadatable, Snapshot
 from qcodes.utils.helpers import (
     DelegateAttributes, YAML, checked_getattr, get_qcodes_path,
     get_qcodes_user_path)
@@ -67,6 +71,14 @@ def get_config_use_monitor() -> Optional[str]:
     return qcodes.config["station"]["use_monitor"]
 
 
+def get_config_snapshot_workers() -> int:
+    return qcodes.config["station"]["snapshot_workers"]
+
+
+def get_config_snapshot_timeout() -> Optional[float]:
+    return qcodes.config["station"]["snapshot_timeout"]
+
+
 ChannelOrInstrumentBase = Union[InstrumentBase, ChannelList]
 
 
@@ -76,6 +88,127 @@ class ValidationWarning(Warning):
     pass
 
 
+SnapshotGroup = List[Tuple[str, Metadatable]]
+
+
+def _snapshot_group(
+        group: SnapshotGroup, update: bool
+) -> Tuple[Dict[str, Snapshot], Dict[str, Dict[str, Any]]]:
+    """
+    Snapshot the components of a group one after the other, and time them
+    """
+    snapshots = {}
+    timing = {}
+    for name, itm in group:
+        start = perf_counter()
+        snapshots[name] = itm.snapshot(update=update)
+        timing[name] = {'duration': perf_counter() - start,
+                        'timed_out': False}
+    return snapshots, timing
+
+
+class _ConcurrentSnapshot:
+    """
+    Snapshot groups of components with a number of threads that take the
+    groups one after the other. If the snapshot of a group takes longer
+    than the timeout, its thread is abandoned (threads can not be
+    interrupted) and replaced by a new one, and the latest values in memory
+    of the components of the group are used instead.
+    """
+
+    def __init__(self, groups: List[SnapshotGroup], update: bool,
+                 workers: int, timeout: Optional[float]) -> None:
+        self._groups = groups
+        self._update = update
+        self._timeout = timeout
+        self._n_threads = min(workers, len(groups))
+        self._condition = Condition()
+        self._queued = deque(range(len(groups)))
+        self._started: Dict[int, float] = {}
+        self._finished: Set[int] = set()
+        self._abandoned: Set[int] = set()
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._timing: Dict[str, Dict[str, Any]] = {}
+        self._error: Optional[BaseException] = None
+
+    def run(self) -> Tuple[Dict[str, Snapshot], Dict[str, Dict[str, Any]]]:
+        for _ in range(self._n_threads):
+            self._start_thread()
+
+        with self._condition:
+            while True:
+                next_timeout = self._abandon_timed_out_groups()
+                if len(self._finished) + len(self._abandoned) \
+                        == len(self._groups):
+                    break
+                self._condition.wait(next_timeout)
+
+        if self._error is not None:
+            raise self._error
+
+        for index in sorted(self._abandoned):
+            for name, itm in self._groups[index]:
+                log.warning(f'Snapshot of {name} timed out after '
+                            f'{self._timeout} s, using the latest values '
+                            f'in memory instead')
+                self._snapshots[name] = itm.snapshot(update=False)
+                self._timing[name] = {'duration': None, 'timed_out': True}
+        return self._snapshots, self._timing
+
+    def _start_thread(self) -> None:
+        Thread(target=self._work, daemon=True,
+               name='station_snapshot').start()
+
+    def _abandon_timed_out_groups(self) -> Optional[float]:
+        """
+        Abandon the groups that have timed out, and return the time until
+        the next group times out. Must be called with the condition held.
+        """
+        if self._timeout is None:
+            return None
+        now = perf_counter()
+        next_timeout = None
+        for index, start in self._started.items():
+            if index in self._finished or index in self._abandoned:
+                continue
+            remaining = start + self._timeout - now
+            if remaining <= 0:
+                self._abandoned.add(index)
+                if self._queued:
+                    self._start_thread()
+            elif next_timeout is None or remaining < next_timeout:
+                next_timeout = remaining
+        return next_timeout
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                if not self._queued or self._error is not None:
+                    return
+                index = self._queued.popleft()
+                self._started[index] = perf_counter()
+                # the timeout of the group starts now
+                self._condition.notify_all()
+            try:
+                snapshots, timing = _snapshot_group(self._groups[index],
+                                                    self._update)
+                error = None
+            except BaseException as e:
+                error = e
+            with self._condition:
+                if index not in self._abandoned:
+                    if error is not None and self._error is None:
+                        self._error = error
+                        # the remaining groups are not snapshotted anymore
+                        self._abandoned.update(self._queued)
+                        self._queued.clear()
+                    elif error is None:
+                        self._snapshots.update(snapshots)
+                        self._timing.update(timing)
+                    self._finished.add(index)
+                self._condition.notify_all()
+
+
 
 class Station(Metadatable, DelegateAttributes):
 
@@ -93,6 +226,13 @@ class Station(Metadatable, DelegateAttributes):
         default (bool): Is this station the default?
         update_snapshot (bool): Immediately update the snapshot of each
             component as it is added to the Station.
+        snapshot_workers: The number of threads to snapshot the components
+            with, see :meth:`snapshot_base`. If None, the number in the
+            ``station.snapshot_workers`` config option is used.
+        snapshot_timeout: The time in seconds after which the updated
+            snapshot of an instrument is given up on when snapshotting
+            concurrently. If None, the time in the
+            ``station.snapshot_timeout`` config option is used.
 
     Attributes:
         default (Station): Class attribute to store the default station.
@@ -106,8 +246,13 @@ class Station(Metadatable, DelegateAttributes):
     def __init__(self, *components: Metadatable,
                  config_file: Optional[str] = None,
                  use_monitor: Optional[bool] = None, default: bool = True,
-                 update_snapshot: bool = True, **kwargs) -> None:
+                 update_snapshot: bool = True,
+                 snapshot_workers: Optional[int] = None,
+                 snapshot_timeout: Optional[float] = None,
+                 **kwargs) -> None:
         super().__init__(**kwargs)
+        self.snapshot_workers = snapshot_workers
+        self.snapshot_timeout = snapshot_timeout
 
         # when a new station is defined, store it in a class variable
         # so it becomes the globally accessible default station.
@@ -143,6 +288,19 @@ class Station(Metadatable, DelegateAttributes):
         closed, not only will it not be snapshotted, it will also be removed
         from the station during the execution of this function.
 
+        If ``snapshot_workers`` is larger than 1, the components are
+        snapshotted concurrently by that many threads. The components that
+        belong to the same root instrument, i.e. that talk to the same
+        hardware, are snapshotted one after the other by the same thread.
+        If the updated snapshot of an instrument takes longer than
+        ``snapshot_timeout`` seconds, it is given up on (the thread is left
+        to finish in the background) and the latest values in memory are
+        used instead.
+
+        If ``update`` is ``True``, the time it took to snapshot each
+        component is recorded in the ``snapshot_timing`` entry of the
+        snapshot.
+
         Args:
             update: If ``True``, update the state by querying the
                 all the children: f.ex. instruments, parameters,
@@ -162,29 +320,72 @@ class Station(Metadatable, DelegateAttributes):
         }
 
         components_to_remove = []
+        components_to_snapshot = {}
 
         for name, itm in self.components.items():
+            # instruments can be closed during the lifetime of the
+            # station object, hence this 'if' allows to avoid
+            # snapshotting instruments that are already closed
+            if isinstance(itm, Instrument) and not Instrument.is_valid(itm):
+                components_to_remove.append(name)
+            else:
+                components_to_snapshot[name] = itm
+
+        start = perf_counter()
+        snapshots, timing = self._snapshot_components(components_to_snapshot,
+                                                      update)
+
+        for name, itm in components_to_snapshot.items():
             if isinstance(itm, Instrument):
-                # instruments can be closed during the lifetime of the
-                # station object, hence this 'if' allows to avoid
-                # snapshotting instruments that are already closed
-                if Instrument.is_valid(itm):
-                    snap['instruments'][name] = itm.snapshot(update=update)
-                else:
-                    components_to_remove.append(name)
+                snap['instruments'][name] = snapshots[name]
             elif isinstance(itm, (Parameter,
                                   ManualParameter,
                                   StandardParameter
                                   )):
-                snap['parameters'][name] = itm.snapshot(update=update)
+                snap['parameters'][name] = snapshots[name]
             else:
-                snap['components'][name] = itm.snapshot(update=update)
+                snap['components'][name] = snapshots[name]
+
+        if update:
+            snap['snapshot_timing'] = {
+                'duration': perf_counter() - start,
+                'components': {name: timing[name]
+                               for name in components_to_snapshot}}
 
         for c in components_to_remove:
             self.remove_component(c)
 
         return snap
 
+    def _snapshot_components(
+            self, components: Dict[str, Metadatable], update: bool
+    ) -> Tuple[Dict[str, Snapshot], Dict[str, Dict[str, Any]]]:
+        """
+        Snapshot the given components, concurrently if the station has more
+        than one snapshot worker, and return the snapshots and the timing
+        of each component
+        """
+        workers = self.snapshot_workers
+        if workers is None:
+            workers = get_config_snapshot_workers()
+        timeout = self.snapshot_timeout
+        if timeout is None:
+            timeout = get_config_snapshot_timeout()
+
+        # the components of the same root instrument are snapshotted by
+        # the same thread, such that the instrument is not queried
+        # concurrently
+        groups: Dict[int, List[Tuple[str, Metadatable]]] = {}
+        for name, itm in components.items():
+            root = getattr(itm, 'root_instrument', None)
+            key = id(itm if root is None else root)
+            groups.setdefault(key, []).append((name, itm))
+
+        if workers <= 1 or len(groups) <= 1:
+            return _snapshot_group(list(components.items()), update)
+        return _ConcurrentSnapshot(list(groups.values()), update,
+                                   workers, timeout).run()
+
     def add_component(self, component: Metadatable, name: str = None,
                       update_snapshot: bool = True) -> str:
         """
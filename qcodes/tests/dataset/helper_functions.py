@@ -117,3 +117,25 @@ def verify_dataframe_for_single_param(dataframe: pandas.DataFrame,
     for name, shape, value in zip(names, shapes, values):
         assert len(simpledf[name]) == reduce(mul, shape)
         assert_array_equal(dataframe.reset_index()[name].values, value.ravel())
+
+
+def verify_same_data_dicts(data: Dict[str, Dict[str, np.ndarray]],
+                           expected: Dict[str, Dict[str, np.ndarray]]
+                           ) -> None:
+    """
+    Verify that two dicts of data in the format of
+    :meth:`.DataSet.get_parameter_data` hold the same parameters in the same
+    order, with arrays of the same dtype and values. Arrays of dtype object,
+    e.g. arrays of arrays of varying shape, are compared element-wise.
+    """
+    assert list(data) == list(expected)
+    for tree_name, arrays in expected.items():
+        assert list(data[tree_name]) == list(arrays)
+        for name, values in arrays.items():
+            assert data[tree_name][name].dtype == values.dtype
+            if values.dtype == np.dtype('O'):
+                for value, expected_value in zip(data[tree_name][name],
+                                                 values):
+                    assert_array_equal(value, expected_value)
+            else:
+                assert_array_equal(data[tree_name][name], values)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qcodes.dataset.data_conversion import (infer_grid,
+                                            parameter_data_to_dataframes,
+                                            parameter_data_to_xarray_dataset)
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+# pylint: disable=unused-import
+from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
+                                                      experiment, dataset)
+from qcodes.tests.dataset.dataset_fixtures import (
+    array_in_scalar_dataset, standalone_parameters_dataset)
+
+
+def _grid_points(*rows):
+    return [a.ravel() for a in np.meshgrid(*rows, indexing='ij')]
+
+
+def test_infer_grid():
+    xs, ys, zs = np.array([0., 1., 3.]), np.array([-1., 1.]), np.arange(4.)
+    points = _grid_points(xs, ys, zs)
+
+    rows, flat_index = infer_grid(points)
+    for row, expected in zip(rows, (xs, ys, zs)):
+        assert np.array_equal(row, expected)
+    assert np.array_equal(flat_index, np.arange(24))
+
+    order = np.random.default_rng(0).permutation(24)[:15]
+    rows, flat_index = infer_grid([p[order] for p in points])
+    assert np.array_equal(flat_index, order)
+    assert infer_grid([p[order] for p in points], allow_holes=False) is None
+
+
+@pytest.mark.parametrize('setpoints', [
+    # several points in the same cell
+    [np.array([0., 0., 1., 1.]), np.array([0., 0., 1., 0.])],
+    # too many holes
+    [np.array([0., 1., 2., 3.]), np.array([0., 1., 2., 3.])],
+    [np.array([0., np.nan, 1., 1.]), np.array([0., 1., 0., 1.])],
+    [np.array([])],
+])
+def test_infer_grid_no_grid(setpoints):
+    assert infer_grid(setpoints) is None
+
+
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_parameter_data_to_dataframes(shuffle):
+    x, y = _grid_points(np.linspace(0, 1, 20), np.array([3., 1., 2.]))
+    z = np.random.rand(len(x))
+    if shuffle:
+        order = np.random.default_rng(0).permutation(len(x))
+        x, y, z = x[order], y[order], z[order]
+
+    df = parameter_data_to_dataframes({'z': {'z': z, 'x': x, 'y': y}})['z']
+
+    expected = pd.MultiIndex.from_arrays((x, y), names=('x', 'y'))
+    assert df.index.equals(expected)
+    assert list(df.index.names) == ['x', 'y']
+    assert np.array_equal(df['z'].to_numpy(), z)
+
+
+def test_parameter_data_to_xarray_dataset():
+    xr = pytest.importorskip('xarray')
+    xs, ys = np.linspace(0, 1, 20), np.array([1., 2., 3.])
+    x, y = _grid_points(xs, ys)
+    z = np.random.rand(len(x))
+    order = np.random.default_rng(0).permutation(len(x))[:40]
+    w = np.random.rand(10)
+    paramspecs = {'x': ParamSpecBase('x', 'numeric', label='X', unit='V')}
+
+    xrdataset = parameter_data_to_xarray_dataset(
+        {'z': {'z': z, 'x': x, 'y': y},
+         'partial': {'partial': z[order], 'x': x[order], 'y': y[order]},
+         'w': {'w': w, 't': np.repeat(np.arange(5.), 2)},
+         'empty': {}},
+        paramspecs)
+
+    assert isinstance(xrdataset, xr.Dataset)
+    assert set(xrdataset.data_vars) == {'z', 'partial', 'w'}
+    # the data of an ordered grid are not copied
+    assert xrdataset['z'].dims == ('x', 'y')
+    assert np.shares_memory(xrdataset['z'].values, z)
+    assert np.array_equal(xrdataset['z'].values, z.reshape(20, 3))
+    assert xrdataset['x'].attrs == {'long_name': 'X', 'units': 'V'}
+
+    partial = xrdataset['partial'].values.ravel()
+    assert np.array_equal(partial[order], z[order])
+    assert np.isnan(np.delete(partial, order)).all()
+
+    # the setpoints of w repeat, so they do not span a grid
+    assert xrdataset['w'].dims == ('w_index',)
+    assert np.array_equal(xrdataset['w'].values, w)
+    assert xrdataset['t'].dims == ('w_index',)
+
+
+def test_get_data_as_xarray_dataset(array_in_scalar_dataset,
+                                    standalone_parameters_dataset):
+    pytest.importorskip('xarray')
+    ds = array_in_scalar_dataset
+    xrdataset = ds.get_data_as_xarray_dataset()
+    data = ds.get_parameter_data()['testparameter']
+
+    assert xrdataset['testparameter'].dims == ('scalarparam',
+                                               'this_setpoint')
+    assert np.array_equal(xrdataset['testparameter'].values,
+                          data['testparameter'])
+    assert xrdataset['testparameter'].attrs == {'long_name': 'this label',
+                                                'units': 'this unit'}
+    assert xrdataset.attrs['guid'] == ds.guid
+
+    ds = standalone_parameters_dataset
+    xrdataset = ds.get_data_as_xarray_dataset()
+    assert set(xrdataset.data_vars) == {'param_1', 'param_2', 'param_3'}
+    assert xrdataset['param_3'].dims == ('param_0',)
+    assert xrdataset['param_1'].dims == ('param_1_index',)
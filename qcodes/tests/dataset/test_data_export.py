@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from qcodes.dataset.data_export import (infer_2D_grid, reshape_2D_data,
+                                        _distinct_values)
+
+
+def _grid_points(xs, ys):
+    x, y = np.meshgrid(xs, ys)
+    return x.ravel(), y.ravel()
+
+
+@pytest.mark.parametrize('points', [
+    np.array([1., 2., 3., 1., 2., 3., 1.]),
+    np.array([5., 5., 5., 2., 2., 2., 7.]),
+    np.array([3., 1., 2., 1., 3., 2., 2.]),
+    np.array([np.nan, 1., np.nan, 1.]),
+    np.array(['b', 'a', 'b', 'a']),
+])
+def test_distinct_values(points):
+    row, index, counts = _distinct_values(points)
+    expected = np.unique(points, return_inverse=True, return_counts=True)
+    assert np.array_equal(row, expected[0],
+                          equal_nan=points.dtype.kind == 'f')
+    assert np.array_equal(index, expected[1])
+    assert np.array_equal(counts, expected[2])
+
+
+def test_infer_2D_grid_simple_grid():
+    xs = np.array([0., 1., 3., 7.])
+    ys = np.array([-1., 0., 1.])
+    x, y = _grid_points(xs, ys)
+    z = np.arange(len(x), dtype=float)
+
+    grid = infer_2D_grid(x, y)
+    assert grid.plottype == '2D_grid'
+    assert np.array_equal(grid.xrow, xs)
+    assert np.array_equal(grid.yrow, ys)
+
+    xrow, yrow, z_to_plot = reshape_2D_data(x, y, z, grid)
+    assert np.array_equal(z_to_plot, z.reshape(3, 4))
+    # the grid is the same when it is inferred by reshape_2D_data
+    for ours, theirs in zip((xrow, yrow, z_to_plot), reshape_2D_data(x, y, z)):
+        assert np.array_equal(ours, theirs)
+
+
+def test_infer_2D_grid_interrupted_and_shuffled():
+    x, y = _grid_points(np.array([0., 1., 3., 7.]), np.array([-1., 0., 1.]))
+    x, y = x[:10], y[:10]
+    order = np.random.default_rng(0).permutation(10)
+    x, y = x[order], y[order]
+
+    grid = infer_2D_grid(x, y)
+    assert grid.plottype == '2D_grid'
+
+    _, _, z_to_plot = reshape_2D_data(x, y, order.astype(float), grid)
+    assert np.array_equal(z_to_plot.ravel()[:10], np.arange(10))
+    assert np.isnan(z_to_plot[2, 2:]).all()
+
+
+def test_infer_2D_grid_with_holes():
+    # steps that are not multiples of each other, such that the grid is
+    # not equidistant
+    x, y = _grid_points(np.array([0., 1.3, 2., 7.]), np.array([-1., 0.5, 1.]))
+    grid = infer_2D_grid(np.delete(x, [1, 6, 11]), np.delete(y, [1, 6, 11]))
+    assert grid.plottype == '2D_grid'
+
+    # a grid with too many holes is not plotted on the grid
+    grid = infer_2D_grid(x[[0, 5, 10, 11]], y[[0, 5, 10, 11]])
+    assert grid.plottype == '2D_unknown'
+
+
+@pytest.mark.parametrize('x, y, plottype', [
+    (np.array([1., 1., 1.]), np.array([1., 2., 3.]), '2D_point'),
+    (np.array([0., 2., 4., 0., 6.]), np.array([0., 0., 0., 1., 1.]),
+     '2D_equidistant'),
+    (np.array([0., 0.3, 1.]), np.array([0., 0.5, 1.]), '2D_unknown'),
+    (np.array(['a', 'b', 'a', 'b']), np.array([1., 1., 2., 2.]), '2D_grid'),
+])
+def test_infer_2D_grid_plottype(x, y, plottype):
+    assert infer_2D_grid(x, y).plottype == plottype
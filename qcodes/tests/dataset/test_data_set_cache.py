@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from qcodes.dataset.data_set import load_by_id
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.sqlite.queries import get_parameter_tree_arrays_after
+from qcodes.tests.dataset.helper_functions import verify_same_data_dicts
+# pylint: disable=unused-import
+from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
+                                                      experiment, dataset)
+
+
+@pytest.fixture
+def growing_dataset(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    spectrum = ParamSpecBase('spectrum', 'array')
+    label = ParamSpecBase('label', 'text')
+    dataset.set_interdependencies(
+        InterDependencies_(dependencies={y: (x,), spectrum: (x,)},
+                           standalones=(label,)))
+    yield dataset
+
+
+# the results added in each step; the dtype of y changes from integer to
+# float and the spectra change from equal to different lengths on the way
+_STEPS = [
+    [{'x': 0, 'y': 1, 'spectrum': np.arange(3.)}],
+    [{'x': 1, 'y': 2, 'label': 'a'}, {'x': 2, 'y': 2.5, 'label': 'bcd'}],
+    [],
+    [{'x': 3, 'spectrum': np.arange(3.) + 1},
+     {'x': 4, 'spectrum': np.arange(5.)}],
+    [{'x': 5, 'y': 3, 'spectrum': np.arange(2.), 'label': 'e'}],
+]
+
+
+def test_cache_follows_growing_run(growing_dataset):
+    ds = growing_dataset
+    assert ds.cache.data() == {}
+    ds.mark_started()
+    reader = load_by_id(ds.run_id)
+
+    for results in _STEPS:
+        if results:
+            ds.add_results(results)
+        for dataset in (ds, reader):
+            verify_same_data_dicts(dataset.cache.data(),
+                                   ds.get_parameter_data())
+            assert not dataset.cache.completed
+
+    ds.mark_completed()
+    verify_same_data_dicts(reader.cache.data(), ds.get_parameter_data())
+    assert reader.cache.completed
+
+
+def test_cache_does_not_read_completed_run(growing_dataset, monkeypatch):
+    ds = growing_dataset
+    ds.mark_started()
+    ds.add_results(_STEPS[1])
+    ds.mark_completed()
+
+    data = ds.cache.data()
+    assert ds.cache.completed
+
+    def fail(*args, **kwargs):
+        raise AssertionError('The database was read')
+
+    monkeypatch.setattr('qcodes.dataset.data_set_cache.'
+                        'get_parameter_tree_arrays_after', fail)
+    verify_same_data_dicts(ds.cache.data(), data)
+
+    ds.cache.clear()
+    assert not ds.cache.completed
+
+
+def test_get_parameter_tree_arrays_after(growing_dataset):
+    ds = growing_dataset
+    ds.mark_started()
+    paramspecs = [ds.paramspecs['y'], ds.paramspecs['x']]
+    ds.add_results(_STEPS[1])
+
+    arrays, rowid = get_parameter_tree_arrays_after(ds.conn, ds.table_name,
+                                                    paramspecs, 0)
+    assert np.array_equal(arrays['y'], [2, 2.5])
+    assert get_parameter_tree_arrays_after(ds.conn, ds.table_name,
+                                           paramspecs, rowid) == ({}, rowid)
+
+    ds.add_results(_STEPS[4])
+    arrays, new_rowid = get_parameter_tree_arrays_after(ds.conn,
+                                                        ds.table_name,
+                                                        paramspecs, rowid)
+    assert new_rowid > rowid
+    assert np.array_equal(arrays['y'], [3])
+    assert np.array_equal(arrays['x'], [5])
@@ -1,3 +1,4 @@
+import io
 import json
 import logging
 import os
@@ -5,6 +6,7 @@ import tempfile
 from contextlib import contextmanager
 from copy import deepcopy
 
+import numpy as np
 import pytest
 
 import qcodes as qc
@@ -30,16 +32,21 @@ from qcodes.dataset.sqlite.db_upgrades import (_latest_available_version,
                                                perform_db_upgrade_5_to_6,
                                                perform_db_upgrade_6_to_7,
                                                perform_db_upgrade_7_to_8,
+                                               perform_db_upgrade_8_to_9,
+                                               perform_db_upgrade_9_to_10,
+                                               perform_db_upgrade_10_to_11,
                                                perform_db_upgrade,
                                                set_user_version)
-from qcodes.dataset.sqlite.queries import get_run_description, update_GUIDs
+from qcodes.dataset.sqlite.queries import (add_meta_data,
+                                           get_run_description, update_GUIDs,
+                                           get_guids_from_run_spec)
 from qcodes.dataset.sqlite.query_helpers import is_column_in_table, one
 from qcodes.tests.common import error_caused_by
 from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
                                                       experiment,
                                                       temporarily_copied_DB)
 from qcodes.dataset.data_set import (
-    load_by_counter, load_by_id, load_by_run_spec)
+    DataSet, load_by_counter, load_by_id, load_by_run_spec)
 
 fixturepath = os.sep.join(qcodes.tests.dataset.__file__.split(os.sep)[:-1])
 fixturepath = os.path.join(fixturepath, 'fixtures')
@@ -80,7 +87,8 @@ def test_tables_exist(empty_temp_db, version):
                    version=version)
     cursor = conn.execute("select sql from sqlite_master"
                           " where type = 'table'")
-    expected_tables = ['experiments', 'runs', 'layouts', 'dependencies']
+    expected_tables = ['experiments', 'runs', 'layouts', 'dependencies',
+                       'snapshot_bases']
     rows = [row for row in cursor]
     assert len(rows) == len(expected_tables)
     for row, expected_table in zip(rows, expected_tables):
@@ -637,6 +645,11 @@ def test_update_existing_guids(caplog):
         assert guid_comps_5['location'] == old_loc
         assert guid_comps_5['work_station'] == old_ws
 
+        # the stored GUID components are updated along with the GUIDs
+        assert get_guids_from_run_spec(
+            ds1.conn, location=new_loc,
+            work_station=new_ws) == [ds1.guid, ds2.guid]
+
 
 @pytest.mark.parametrize('db_file',
                          ['empty',
@@ -888,6 +901,30 @@ def test_perform_actual_upgrade_7_to_8(db_file):
         assert is_column_in_table(conn, 'runs', 'parent_datasets')
 
 
+def test_perform_upgrade_8_to_9_keeps_npy_blobs(tmp_path):
+    conn = connect(str(tmp_path / 'v8.db'), version=8)
+    new_experiment('some-exp', 'some-sample', conn=conn)
+    ds = DataSet(conn=conn)
+    x = ParamSpecBase('x', 'array')
+    ds.set_interdependencies(InterDependencies_(standalones=(x,)))
+    ds.mark_started()
+
+    old_array = np.arange(4.0)
+    out = io.BytesIO()
+    np.save(out, old_array)
+    atomic_transaction(conn, f'INSERT INTO "{ds.table_name}" (x) VALUES (?)',
+                       out.getvalue())
+
+    perform_db_upgrade_8_to_9(conn)
+    assert get_user_version(conn) == 9
+
+    new_array = np.arange(4.0, 8.0)
+    ds.add_result({'x': new_array})
+    data = ds.get_parameter_data()['x']['x']
+    np.testing.assert_array_equal(data, np.stack([old_array, new_array]))
+    conn.close()
+
+
 @pytest.mark.usefixtures("empty_temp_db")
 def test_cannot_connect_to_newer_db():
     conn = connect(qc.config["core"]["db_location"],
@@ -902,8 +939,58 @@ def test_cannot_connect_to_newer_db():
                        qc.config["core"]["db_debug"])
 
 
+def test_perform_upgrade_9_to_10_stores_guid_components(tmp_path):
+    conn = connect(str(tmp_path / 'v9.db'), version=9)
+    new_experiment('some-exp', 'some-sample', conn=conn)
+    guids = [DataSet(conn=conn).guid for _ in range(3)]
+    assert not is_column_in_table(conn, 'runs', 'guid_sample')
+
+    perform_db_upgrade_9_to_10(conn)
+    assert get_user_version(conn) == 10
+
+    rows = atomic_transaction(
+        conn, 'SELECT guid_sample, guid_location, guid_work_station '
+              'FROM runs ORDER BY run_id').fetchall()
+    for guid, row in zip(guids, rows):
+        comps = parse_guid(guid)
+        assert tuple(row) == (comps['sample'], comps['location'],
+                              comps['work_station'])
+
+    indices = atomic_transaction(
+        conn, "SELECT name FROM sqlite_master WHERE type='index' "
+              "AND tbl_name='runs'").fetchall()
+    for column in ('guid_sample', 'guid_location', 'guid_work_station',
+                   'run_timestamp', 'captured_run_id'):
+        assert f'IX_runs_{column}' in [row[0] for row in indices]
+
+    # runs created after the upgrade get their components stored too
+    ds = DataSet(conn=conn)
+    comps = parse_guid(ds.guid)
+    assert get_guids_from_run_spec(
+        conn, sample_id=comps['sample'], location=comps['location'],
+        work_station=comps['work_station']) == guids + [ds.guid]
+    conn.close()
+
+
+def test_perform_upgrade_10_to_11(tmp_path):
+    conn = connect(str(tmp_path / 'v10.db'), version=10)
+    new_experiment('some-exp', 'some-sample', conn=conn)
+    ds = DataSet(conn=conn)
+    add_meta_data(conn, ds.run_id, {'snapshot': '{"a": 1}'})
+    assert not is_column_in_table(conn, 'runs', 'snapshot_base_id')
+
+    perform_db_upgrade_10_to_11(conn)
+    assert get_user_version(conn) == 11
+    assert is_column_in_table(conn, 'runs', 'snapshot_base_id')
+    assert is_column_in_table(conn, 'snapshot_bases', 'snapshot')
+
+    # snapshots stored before the upgrade are full snapshots
+    assert DataSet(conn=conn, run_id=ds.run_id).snapshot == {'a': 1}
+    conn.close()
+
+
 def test_latest_available_version():
-    assert _latest_available_version() == 8
+    assert _latest_available_version() == 11
 
 
 @pytest.mark.parametrize('version', VERSIONS)
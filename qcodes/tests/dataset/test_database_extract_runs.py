@@ -1,9 +1,10 @@
 from os.path import getmtime
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
 import re
 import os
 from pathlib import Path
 import random
+import sqlite3
 import uuid
 
 import pytest
@@ -13,6 +14,8 @@ from qcodes.config import Config
 import qcodes.tests.dataset
 from qcodes.dataset.experiment_container import Experiment,\
     load_experiment_by_name
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.data_set import (DataSet, load_by_guid, load_by_counter,
                                      load_by_id, load_by_run_spec,
                                      generate_dataset_table)
@@ -351,6 +354,47 @@ def test_extracting_dataless_run(two_empty_temp_db_connections):
     assert loaded_ds.the_same_dataset_as(source_ds)
 
 
+def test_extraction_copies_stored_values(two_empty_temp_db_connections):
+    """
+    Test that the results are copied exactly as they are stored in the
+    source DB, in the same order
+    """
+    source_conn, target_conn = two_empty_temp_db_connections
+
+    source_path = path_to_dbfile(source_conn)
+    target_path = path_to_dbfile(target_conn)
+
+    Experiment(conn=source_conn)
+
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'array')
+    z = ParamSpecBase('z', 'complex')
+    t = ParamSpecBase('t', 'text')
+    source_ds = DataSet(conn=source_conn)
+    source_ds.set_interdependencies(
+        InterDependencies_(dependencies={y: (x,), z: (x,)}, standalones=(t,)))
+    source_ds.mark_started()
+    source_ds.add_results([{'x': xval, 'y': np.arange(3) * xval,
+                            'z': 1j * xval}
+                           for xval in [2, np.nan, 0.5, np.inf, 1]])
+    source_ds.add_results([{'t': 'some text'}])
+    source_ds.mark_completed()
+
+    extract_runs_into_db(source_path, target_path, source_ds.run_id)
+
+    target_ds = DataSet(conn=target_conn, run_id=1)
+    query = 'SELECT * FROM "{}" ORDER BY id'
+    # compare the raw stored values without converting them
+    with closing(sqlite3.connect(source_path)) as conn:
+        source_rows = conn.execute(
+            query.format(source_ds.table_name)).fetchall()
+    with closing(sqlite3.connect(target_path)) as conn:
+        target_rows = conn.execute(
+            query.format(target_ds.table_name)).fetchall()
+    assert len(target_rows) == 6
+    assert source_rows == target_rows
+
+
 def test_result_table_naming_and_run_id(two_empty_temp_db_connections,
                                         some_interdeps):
     """
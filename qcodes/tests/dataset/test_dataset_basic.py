@@ -24,7 +24,7 @@ from qcodes.tests.common import error_caused_by
 from qcodes.dataset.sqlite.database import get_DB_location
 from qcodes.dataset.data_set import CompletedError, DataSet
 from qcodes.dataset.guids import parse_guid
-from qcodes.dataset.sqlite.connection import path_to_dbfile
+from qcodes.dataset.sqlite.connection import atomic_transaction, path_to_dbfile
 from qcodes.utils.deprecate import QCoDeSDeprecationWarning
 # pylint: disable=unused-import
 from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
@@ -187,7 +187,8 @@ def test_dataset_read_only_properties(dataset):
                        'number_of_results', 'counter', 'parameters',
                        'paramspecs', 'exp_id', 'exp_name', 'sample_name',
                        'run_timestamp_raw', 'completed_timestamp_raw',
-                       'snapshot', 'snapshot_raw', 'dependent_parameters']
+                       'snapshot', 'snapshot_raw', 'dependent_parameters',
+                       'cache']
 
     # It is not expected to be possible to set readonly properties
     for prop in read_only_props:
@@ -555,6 +556,68 @@ def test_numpy_inf(dataset):
     assert np.isinf(retrieved).all()
 
 
+def test_add_results_from_columns(dataset):
+    """
+    Test that column-wise blocks of results are written in order and that
+    consecutive blocks with the same parameters are merged
+    """
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    z = ParamSpecBase('z', 'array')
+    idps = InterDependencies_(dependencies={y: (x,)}, standalones=(z,))
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+
+    blocks = [{'x': np.array([0, 1]), 'y': np.array([0.5, np.nan])},
+              {'x': np.array([2.0]), 'y': np.array([2.5])},
+              {'z': [np.arange(3)]},
+              {'x': np.array([3.0]), 'y': np.array([-np.inf])}]
+
+    write_point = dataset.add_results_from_columns(blocks)
+
+    assert write_point == 0
+    assert len(dataset) == 5
+    data = dataset.get_data('x', 'y')
+    assert [row[0] for row in data] == [0, 1, 2, None, 3]
+    assert data[0][1] == 0.5
+    assert np.isnan(data[1][1])
+    assert data[3][1] is None
+    assert np.isneginf(data[4][1])
+    np.testing.assert_array_equal(dataset.get_data('z')[3][0], np.arange(3))
+
+
+def test_add_results_write_points(dataset):
+    """
+    Test that repeated writes of different sizes return the index of their
+    first result and reuse the insert statements of the dataset
+    """
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    idps = InterDependencies_(dependencies={y: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+
+    n_written = 0
+    for n_rows in [1, 3, 1000, 3, 1]:
+        write_point = dataset.add_results(
+            [{'x': n_written + i, 'y': 2 * i} for i in range(n_rows)])
+        assert write_point == n_written
+        n_written += n_rows
+
+        write_point = dataset.add_results_from_columns(
+            [{'y': np.zeros(n_rows), 'x': n_written + np.arange(n_rows)}])
+        assert write_point == n_written
+        n_written += n_rows
+
+    assert len(dataset) == n_written
+    xs = dataset.get_parameter_data('y')['y']['x']
+    np.testing.assert_array_equal(xs, np.arange(n_written))
+    # the same few statements are used for the same columns
+    queries = dataset._insert_query_cache
+    assert {key[2] for key in queries} == {1, 2, 8, 32, 64, 128, 256, 512}
+    assert {key[1] for key in queries} == {('x', 'y'), ('y', 'x')}
+
+
 def test_missing_keys(dataset):
     """
     Test that we can now have partial results with keys missing. This is for
@@ -630,6 +693,45 @@ def test_get_description(experiment, some_interdeps):
     assert loaded_ds.description == expected_desc
 
 
+def test_description_cache_is_invalidated(experiment, some_interdeps):
+    ds = DataSet()
+
+    assert ds.description is ds.description
+    assert ds.get_parameters() == []
+
+    ds.set_interdependencies(some_interdeps[1])
+
+    assert ds.description == RunDescriber(some_interdeps[1])
+    assert {ps.name for ps in ds.get_parameters()} == set(
+        some_interdeps[1].names)
+
+
+def test_completed_run_lookups_are_cached(experiment, some_interdeps):
+    ds = DataSet(metadata={'tag': 'old'})
+    ds.set_interdependencies(some_interdeps[1])
+    ds.mark_started()
+    ds.add_result({'ps1': 1, 'ps2': 2})
+    ds.mark_completed()
+
+    loaded_ds = DataSet(run_id=ds.run_id)
+    expected_data = loaded_ds.get_parameter_data()
+    assert loaded_ds.get_metadata('tag') == 'old'
+    guid = loaded_ds.guid
+
+    # neither the run description nor the run values are read again
+    with patch('qcodes.dataset.sqlite.queries.get_run_description') as desc, \
+            patch('qcodes.dataset.data_set.select_one_where') as select:
+        assert loaded_ds.get_parameter_data().keys() == expected_data.keys()
+        assert loaded_ds.get_metadata('tag') == 'old'
+        assert loaded_ds.guid == guid
+    desc.assert_not_called()
+    select.assert_not_called()
+
+    # adding metadata clears the cached value of that tag
+    loaded_ds.add_metadata('tag', 'new')
+    assert loaded_ds.get_metadata('tag') == 'new'
+
+
 def test_metadata(experiment, request):
 
     metadata1 = {'number': 1, "string": "Once upon a time..."}
@@ -1140,6 +1242,178 @@ def test_get_parameter_data_independent_parameters(standalone_parameters_dataset
                           expected_values)
 
 
+@pytest.mark.parametrize("chunk_rows", [1, 7, 10**3, 10**4])
+def test_iter_parameter_data(standalone_parameters_dataset, chunk_rows):
+    ds = standalone_parameters_dataset
+    expected = ds.get_parameter_data()
+
+    chunks = list(ds.iter_parameter_data(chunk_rows=chunk_rows))
+    assert len(chunks) == -(-10**3 // chunk_rows)
+
+    for name, subdict in expected.items():
+        for subname, values in subdict.items():
+            parts = [chunk[name][subname] for chunk in chunks]
+            assert all(len(part) <= chunk_rows for part in parts)
+            np.testing.assert_array_equal(np.concatenate(parts), values)
+
+
+def test_iter_parameter_data_drops_exhausted_parameters(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'text')
+    dataset.set_interdependencies(InterDependencies_(standalones=(x, y)))
+    dataset.mark_started()
+    dataset.add_results([{'x': 0, 'y': 'a'}, {'x': 1}, {'x': 2}])
+    dataset.mark_completed()
+
+    chunks = list(dataset.iter_parameter_data(chunk_rows=2))
+    assert [list(chunk.keys()) for chunk in chunks] == [['x', 'y'], ['x']]
+    np.testing.assert_array_equal(chunks[0]['x']['x'], [0, 1])
+    np.testing.assert_array_equal(chunks[0]['y']['y'], ['a'])
+    np.testing.assert_array_equal(chunks[1]['x']['x'], [2])
+
+
+def test_iter_parameter_data_array(array_dataset):
+    expected = array_dataset.get_parameter_data()
+
+    chunks = list(array_dataset.iter_parameter_data(chunk_rows=1))
+    assert len(chunks) == len(array_dataset)
+
+    for name, subdict in expected.items():
+        for subname, values in subdict.items():
+            parts = [chunk[name][subname] for chunk in chunks]
+            np.testing.assert_array_equal(np.concatenate(parts), values)
+
+
+def test_iter_parameter_data_invalid_chunk_rows(scalar_dataset):
+    with pytest.raises(ValueError, match='chunk_rows'):
+        next(scalar_dataset.iter_parameter_data(chunk_rows=0))
+
+
+def test_iter_data_as_pandas_dataframe(scalar_dataset):
+    import pandas as pd
+    expected = scalar_dataset.get_data_as_pandas_dataframe()
+
+    chunks = list(scalar_dataset.iter_data_as_pandas_dataframe(
+        chunk_rows=300))
+    assert len(chunks) == 4
+
+    for name, df in expected.items():
+        concatenated = pd.concat([chunk[name] for chunk in chunks])
+        pd.testing.assert_frame_equal(concatenated, df)
+
+
+@pytest.fixture
+def grid_dataset(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    t = ParamSpecBase('t', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    z = ParamSpecBase('z', 'array')
+    idps = InterDependencies_(dependencies={y: (x, t), z: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    xs, ts = np.meshgrid(np.linspace(0, 1, 11), np.arange(5), indexing='ij')
+    dataset.add_results_from_columns([{'x': xs.ravel(), 't': ts.ravel(),
+                                       'y': xs.ravel() * ts.ravel()}])
+    dataset.add_results([{'x': x, 'z': np.arange(3)} for x in (0, 0.5, 1)])
+    yield dataset
+
+
+def test_get_parameter_data_where(grid_dataset):
+    expected = grid_dataset.get_parameter_data('y')['y']
+    mask = (expected['x'] >= 0.25) & (expected['x'] <= 0.75) & \
+        (expected['t'] >= 3)
+
+    data = grid_dataset.get_parameter_data(
+        'y', where={'x': (0.25, 0.75), 't': (3, None)})['y']
+    assert len(data['y']) == 10
+    for name in ('y', 'x', 't'):
+        np.testing.assert_array_equal(data[name], expected[name][mask])
+
+    data = grid_dataset.get_parameter_data(
+        'y', where={'x': (0.25, 0.75), 't': (3, None)}, start=2, end=3)['y']
+    np.testing.assert_array_equal(data['y'], expected['y'][mask][1:3])
+
+    data = grid_dataset.get_parameter_data('z', where={'x': (None, 0.5)})
+    np.testing.assert_array_equal(data['z']['z'], np.tile(np.arange(3),
+                                                          (2, 1)))
+
+
+def test_get_parameter_data_where_non_finite(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+    dataset.mark_started()
+    xs = [0, 0.5, 1, 2, np.nan, np.inf, -np.inf]
+    dataset.add_results([{'x': x, 'y': i} for i, x in enumerate(xs)])
+
+    data = dataset.get_parameter_data('y', where={'x': (0.5, 1e9)})['y']
+    np.testing.assert_array_equal(data['x'], [0.5, 1, 2])
+    np.testing.assert_array_equal(data['y'], [1, 2, 3])
+
+    # NaN never falls in a range, infinities only in open ones
+    data = dataset.get_parameter_data('y', where={'x': (0.5, None)})['y']
+    np.testing.assert_array_equal(data['x'], [0.5, 1, 2, np.inf])
+    np.testing.assert_array_equal(data['y'], [1, 2, 3, 5])
+
+    data = dataset.get_parameter_data('y', where={'x': (None, 0.5)})['y']
+    np.testing.assert_array_equal(data['x'], [0, 0.5, -np.inf])
+
+
+def test_get_parameter_data_where_raises(grid_dataset):
+    with pytest.raises(ValueError, match='not z or one of its dependencies'):
+        grid_dataset.get_parameter_data(where={'t': (0, 1)})
+    with pytest.raises(ValueError, match='of type array'):
+        grid_dataset.get_parameter_data('z', where={'z': (0, 1)})
+
+
+def _get_index_names(dataset):
+    sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND " \
+          "tbl_name = ?"
+    rows = atomic_transaction(dataset.conn, sql, dataset.table_name)
+    return sorted(row['name'] for row in rows.fetchall())
+
+
+def test_setpoint_indexes(grid_dataset):
+    index_setpoints = qc.config.dataset.index_setpoints
+    try:
+        qc.config.dataset.index_setpoints = False
+        grid_dataset.get_parameter_data('y', where={'t': (0, 1)})
+        grid_dataset.mark_completed()
+        assert _get_index_names(grid_dataset) == []
+
+        qc.config.dataset.index_setpoints = True
+        # reading the data does not write to the database
+        grid_dataset.get_parameter_data('y', where={'t': (0, 1)})
+        assert _get_index_names(grid_dataset) == []
+        with pytest.raises(ValueError, match='not y or one of its'):
+            grid_dataset.get_parameter_data('y', where={'unknown': (0, 1)})
+
+        grid_dataset._create_setpoint_indexes()
+        assert _get_index_names(grid_dataset) == \
+            [f'IX_{grid_dataset.table_name}_t',
+             f'IX_{grid_dataset.table_name}_x']
+
+        plan = atomic_transaction(
+            grid_dataset.conn,
+            f'EXPLAIN QUERY PLAN SELECT y FROM "{grid_dataset.table_name}" '
+            f'WHERE y IS NOT NULL AND x >= ? AND x <= ?', 0, 0.1).fetchall()
+        assert f'IX_{grid_dataset.table_name}_x' in plan[0]['detail']
+    finally:
+        qc.config.dataset.index_setpoints = index_setpoints
+
+
+def test_setpoint_indexes_created_on_completion(grid_dataset):
+    index_setpoints = qc.config.dataset.index_setpoints
+    try:
+        qc.config.dataset.index_setpoints = True
+        grid_dataset.mark_completed()
+        assert _get_index_names(grid_dataset) == \
+            [f'IX_{grid_dataset.table_name}_t',
+             f'IX_{grid_dataset.table_name}_x']
+    finally:
+        qc.config.dataset.index_setpoints = index_setpoints
+
+
 def parameter_test_helper(ds: DataSet,
                           toplevel_names: Sequence[str],
                           expected_names: Dict[str, Sequence[str]],
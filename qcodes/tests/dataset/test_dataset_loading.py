@@ -1,25 +1,34 @@
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from math import floor
 
+import numpy as np
 import pytest
 
+import qcodes as qc
+
 from qcodes.dataset.data_set import (DataSet,
                                      new_data_set,
                                      load_by_guid,
                                      load_by_id,
                                      load_by_counter,
-                                     load_by_run_spec)
+                                     load_by_run_spec,
+                                     load_many)
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.data_export import get_data_by_id
-from qcodes.dataset.sqlite.queries import get_guids_from_run_spec
+from qcodes.dataset.sqlite.database import close_pooled_connections
+from qcodes.dataset.sqlite.queries import (get_guids_from_run_spec,
+                                           create_run)
+from qcodes.dataset.sqlite.connection import atomic_transaction
 from qcodes.dataset.experiment_container import new_experiment
 # pylint: disable=unused-import
 from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
                                                       experiment, dataset)
 # pylint: disable=unused-import
 from qcodes.tests.dataset.test_dependencies import some_interdeps
+from qcodes.tests.common import error_caused_by
 
 
 @pytest.mark.usefixtures("experiment")
@@ -322,3 +331,130 @@ def test_load_by_run_spec(empty_temp_db, some_interdeps):
     empty_guid_list = get_guids_from_run_spec(conn=conn,
                                               experiment_name='nosuchexp')
     assert empty_guid_list == []
+
+
+def test_get_guids_from_run_spec_by_guid_parts_and_time(experiment):
+    conn = experiment.conn
+
+    def guid(sample, location, work_station, time_ms):
+        station = f'{work_station:06x}'
+        time_str = f'{time_ms:016x}'
+        return (f'{sample:08x}-{location:02x}{station[:2]}-{station[2:]}-'
+                f'{time_str[:4]}-{time_str[4:]}')
+
+    parts = [(1, 10, 100), (1, 10, 200), (2, 10, 100), (2, 20, 100)]
+    guids = []
+    for n, (sample, location, work_station) in enumerate(parts):
+        guids.append(guid(sample, location, work_station, 1000 + n))
+        _, run_id, _ = create_run(conn, experiment.exp_id, 'run', guids[-1])
+        atomic_transaction(conn,
+                           'UPDATE runs SET run_timestamp = ? '
+                           'WHERE run_id = ?', 1000.0 + n, run_id)
+
+    assert get_guids_from_run_spec(conn, sample_id=1) == guids[:2]
+    assert get_guids_from_run_spec(conn, location=10,
+                                   work_station=100) == [guids[0], guids[2]]
+    assert get_guids_from_run_spec(conn, sample_id=2,
+                                   location=20) == [guids[3]]
+    assert get_guids_from_run_spec(conn, sample_id=3) == []
+    assert get_guids_from_run_spec(conn, start_time=1001,
+                                   end_time=1002) == guids[1:3]
+    assert get_guids_from_run_spec(conn, work_station=100,
+                                   start_time=1001.5) == guids[2:]
+
+    loaded_ds = load_by_run_spec(sample_id=1, work_station=200, conn=conn)
+    assert loaded_ds.guid == guids[1]
+    with pytest.raises(NameError, match="More than one matching"):
+        load_by_run_spec(location=10, conn=conn)
+
+    # the search uses the indices on the runs table
+    plan = atomic_transaction(
+        conn, 'EXPLAIN QUERY PLAN SELECT guid FROM runs '
+              'WHERE guid_work_station = ?', 100).fetchall()
+    assert 'IX_runs_guid_work_station' in str([tuple(row) for row in plan])
+
+
+@pytest.mark.usefixtures('experiment')
+def test_load_with_pooled_read_only_connections(some_interdeps):
+    n_runs = 8
+    guids = []
+    for i in range(n_runs):
+        ds = DataSet()
+        ds.set_interdependencies(some_interdeps[1])
+        ds.mark_started()
+        ds.add_results([{'ps1': i, 'ps2': j} for j in range(10)])
+        ds.mark_completed()
+        guids.append(ds.guid)
+
+    def load(run_id):
+        ds = load_by_id(run_id)
+        assert load_by_guid(ds.guid).conn is ds.conn
+        return ds, ds.get_parameter_data()
+
+    pool_read_only_connections = qc.config.dataset.pool_read_only_connections
+    try:
+        qc.config.dataset.pool_read_only_connections = True
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            loaded = list(executor.map(load, range(1, n_runs + 1)))
+
+        for i, (ds, data) in enumerate(loaded):
+            assert ds.guid == guids[i]
+            np.testing.assert_array_equal(data['ps2']['ps1'], [i] * 10)
+            np.testing.assert_array_equal(data['ps2']['ps2'], np.arange(10))
+
+        with pytest.raises(RuntimeError) as e:
+            loaded[0][0].add_metadata('tag', 'value')
+        assert error_caused_by(e, 'attempt to write a readonly database')
+    finally:
+        qc.config.dataset.pool_read_only_connections = \
+            pool_read_only_connections
+        close_pooled_connections()
+
+
+@pytest.mark.parametrize('use_processes', (False, True))
+@pytest.mark.usefixtures('experiment')
+def test_load_many(some_interdeps, use_processes):
+    n_runs = 6
+    for i in range(n_runs):
+        ds = DataSet()
+        ds.set_interdependencies(some_interdeps[1])
+        ds.mark_started()
+        ds.add_results([{'ps1': i, 'ps2': j} for j in range(10 * (i + 1))])
+        ds.mark_completed()
+
+    run_ids = list(range(1, n_runs + 1))
+    try:
+        loaded = dict(load_many(run_ids, workers=3,
+                                use_processes=use_processes))
+        assert sorted(loaded) == run_ids
+        for run_id, data in loaded.items():
+            expected = load_by_id(run_id).get_parameter_data()
+            assert list(data) == list(expected)
+            for name, values in expected['ps2'].items():
+                np.testing.assert_array_equal(data['ps2'][name], values)
+
+        loaded = dict(load_many([2, 2, 3], params=['ps1'],
+                                use_processes=use_processes))
+        assert sorted(loaded) == [2, 3]
+        assert list(loaded[3]) == ['ps1']
+        np.testing.assert_array_equal(loaded[3]['ps1']['ps1'], [2] * 30)
+    finally:
+        close_pooled_connections()
+
+
+@pytest.mark.usefixtures('experiment')
+def test_load_many_raises(some_interdeps):
+    ds = DataSet()
+    ds.set_interdependencies(some_interdeps[1])
+    ds.mark_started()
+    ds.add_results([{'ps1': 1, 'ps2': 2}])
+    ds.mark_completed()
+
+    try:
+        # the arguments are checked before the runs are iterated over
+        with pytest.raises(ValueError, match=r'Runs \[2\] do not exist'):
+            load_many([1, 2])
+        with pytest.raises(ValueError, match='Run 1 has no parameters named'):
+            load_many([1], params=['ps2', 'ps7'])
+    finally:
+        close_pooled_connections()
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.export import load_from_export
+from qcodes.tests.dataset.helper_functions import verify_same_data_dicts
+# pylint: disable=unused-import
+from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
+                                                      experiment, dataset)
+from qcodes.tests.dataset.dataset_fixtures import (
+    array_in_scalar_dataset, array_in_str_dataset, multi_dataset,
+    standalone_parameters_dataset, varlen_array_in_scalar_dataset)
+
+
+def _assert_round_trip(ds, path, compression):
+    ds.add_metadata('comment', 'some words')
+
+    ds.export(path, compression=compression, chunk_rows=4)
+    loaded = load_from_export(path)
+
+    verify_same_data_dicts(loaded.get_parameter_data(),
+                           ds.get_parameter_data())
+    for attribute in ('guid', 'run_id', 'captured_run_id', 'counter',
+                      'captured_counter', 'name', 'exp_name', 'sample_name',
+                      'run_timestamp_raw', 'completed_timestamp_raw',
+                      'metadata', 'snapshot_raw', 'paramspecs',
+                      'dependent_parameters', 'parent_dataset_links'):
+        assert getattr(loaded, attribute) == getattr(ds, attribute)
+    assert loaded.description == ds.description
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_export_array_in_scalar(array_in_scalar_dataset, compression,
+                                tmp_path):
+    _assert_round_trip(array_in_scalar_dataset, str(tmp_path / 'run.h5'),
+                       compression)
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_export_array_in_str(array_in_str_dataset, compression, tmp_path):
+    _assert_round_trip(array_in_str_dataset, str(tmp_path / 'run.h5'),
+                       compression)
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_export_multi(multi_dataset, compression, tmp_path):
+    _assert_round_trip(multi_dataset, str(tmp_path / 'run.h5'), compression)
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_export_standalone_parameters(standalone_parameters_dataset,
+                                      compression, tmp_path):
+    _assert_round_trip(standalone_parameters_dataset,
+                       str(tmp_path / 'run.h5'), compression)
+
+
+def test_export_memory_maps_uncompressed_data(array_in_scalar_dataset,
+                                              tmp_path):
+    ds = array_in_scalar_dataset
+    compressed, uncompressed = (str(tmp_path / 'compressed.h5'),
+                                str(tmp_path / 'uncompressed.h5'))
+    ds.export(compressed)
+    ds.export(uncompressed, compression=None)
+
+    data = load_from_export(uncompressed).get_parameter_data()
+    assert all(isinstance(values, np.memmap)
+               for values in data['testparameter'].values())
+    data = load_from_export(uncompressed,
+                            memmap=False).get_parameter_data()
+    assert not any(isinstance(values, np.memmap)
+                   for values in data['testparameter'].values())
+    data = load_from_export(compressed).get_parameter_data()
+    assert not any(isinstance(values, np.memmap)
+                   for values in data['testparameter'].values())
+
+
+def test_export_widens_dtype_between_chunks(dataset, tmp_path, monkeypatch):
+    # the rows that were written already are copied in blocks of two rows
+    monkeypatch.setattr('qcodes.dataset.export._TARGET_CHUNK_BYTES', 16)
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    z = ParamSpecBase('z', 'text')
+    dataset.set_interdependencies(
+        InterDependencies_(dependencies={y: (x,)}, standalones=(z,)))
+    dataset.mark_started()
+    # the first chunk of y is all integers, the second one is not
+    dataset.add_results([{'x': i, 'y': i} for i in range(5)])
+    dataset.add_results([{'x': i, 'y': i + 0.5} for i in range(5)])
+    dataset.mark_completed()
+    path = str(tmp_path / 'run.h5')
+
+    dataset.export(path, chunk_rows=5)
+
+    loaded = load_from_export(path).get_parameter_data()
+    verify_same_data_dicts(loaded, dataset.get_parameter_data())
+    # z has no results
+    assert loaded['z'] == {}
+    assert load_from_export(path).get_parameter_data('y')['y']['y'][-1] == 4.5
+
+
+def test_export_raises(varlen_array_in_scalar_dataset, tmp_path):
+    ds = varlen_array_in_scalar_dataset
+    path = str(tmp_path / 'run.h5')
+
+    with pytest.raises(ValueError, match='Unknown export format'):
+        ds.export(path, format='netcdf')
+    with pytest.raises(ValueError, match='differ in shape'):
+        ds.export(path, chunk_rows=1)
+
+
+def test_load_from_export_unknown_parameter(array_in_scalar_dataset,
+                                            tmp_path):
+    path = str(tmp_path / 'run.h5')
+    array_in_scalar_dataset.export(path)
+
+    with pytest.raises(ValueError, match='Unknown parameter scalarparam'):
+        load_from_export(path).get_parameter_data('scalarparam')
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.json_exporter import JSONLinesExporter, load_json_lines
+# pylint: disable=unused-import
+from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
+                                                      experiment, dataset)
+
+
+@pytest.fixture
+def xyt_dataset(dataset):
+    x = ParamSpecBase('x', 'numeric', unit='V')
+    y = ParamSpecBase('y', 'numeric')
+    t = ParamSpecBase('t', 'text')
+    dataset.set_interdependencies(
+        InterDependencies_(dependencies={y: (x,)}, standalones=(t,)))
+    dataset.mark_started()
+    yield dataset
+
+
+def _read_lines(location):
+    with open(location) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_json_lines_exporter(xyt_dataset, tmp_path):
+    location = str(tmp_path / 'live.jsonl')
+    exporter = JSONLinesExporter(xyt_dataset, location,
+                                 min_write_interval=0, initial_size=2)
+    xyt_dataset.subscribe(exporter, min_wait=0, min_count=1)
+
+    xs = np.linspace(0, 1, 11)
+    for xval in xs:
+        xyt_dataset.add_result({'x': xval, 'y': xval ** 2})
+    xyt_dataset.add_result({'t': 'some text'})
+    xyt_dataset.add_results([{'x': 2, 'y': np.nan}, {'x': 3}])
+    xyt_dataset.mark_completed()
+
+    lines = _read_lines(location)
+    header = lines[0]
+    assert header['type'] == 'header'
+    assert header['parameters'][0] == {'name': 'x', 'paramtype': 'numeric',
+                                       'label': '', 'unit': 'V',
+                                       'is_setpoint': True}
+    assert [p['name'] for p in header['parameters']] == ['x', 'y', 't']
+    # every write only appends the new results
+    starts = [line['start'] for line in lines[1:]]
+    assert starts == sorted(set(starts))
+    assert starts[0] == 0
+
+    data = load_json_lines(location)
+    expected_x = np.concatenate([xs, [np.nan, 2, 3]])
+    expected_y = np.concatenate([xs ** 2, [np.nan, np.nan, np.nan]])
+    np.testing.assert_array_equal(data['x'], expected_x)
+    np.testing.assert_array_equal(data['y'], expected_y)
+    assert list(data['t']) == [None] * 11 + ['some text', None, None]
+
+    np.testing.assert_array_equal(exporter.data['x'], expected_x)
+    np.testing.assert_array_equal(exporter.data['y'], expected_y)
+
+
+def test_json_lines_exporter_rate_limit(xyt_dataset, tmp_path):
+    location = str(tmp_path / 'live.jsonl')
+    exporter = JSONLinesExporter(xyt_dataset, location, parameters=['y'],
+                                 min_write_interval=3600)
+
+    exporter([(0, 0, None)], 1)
+    exporter([(1, 1, None), (2, 4, None)], 3)
+    # the first results are written right away, the rest is held back
+    assert [line['data'] for line in _read_lines(location)[1:]] == \
+        [{'y': [0]}]
+
+    exporter.flush()
+    assert [line['data'] for line in _read_lines(location)[1:]] == \
+        [{'y': [0]}, {'y': [1, 4]}]
+    assert list(load_json_lines(location)) == ['y']
+
+
+def test_json_lines_exporter_unknown_parameter(xyt_dataset, tmp_path):
+    with pytest.raises(ValueError, match='Unknown parameter'):
+        JSONLinesExporter(xyt_dataset, str(tmp_path / 'live.jsonl'),
+                          parameters=['x', 'z'])
+
+
+def test_load_json_lines_ignores_partial_line(xyt_dataset, tmp_path):
+    location = str(tmp_path / 'live.jsonl')
+    exporter = JSONLinesExporter(xyt_dataset, location, min_write_interval=0)
+    exporter([(0, 1, 'a'), (1, 2, 'b')], 2)
+    with open(location, mode='a') as f:
+        f.write('{"type": "data", "start": 2, "da')
+
+    data = load_json_lines(location)
+    np.testing.assert_array_equal(data['y'], [1, 2])
+    assert list(data['t']) == ['a', 'b']
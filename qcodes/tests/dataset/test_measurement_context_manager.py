@@ -1,7 +1,9 @@
 import re
 import os
+import sqlite3
 from time import sleep
 import json
+from unittest.mock import patch
 
 import pytest
 from hypothesis import given, settings
@@ -21,7 +23,7 @@ from qcodes.tests.instrument_mocks import DummyInstrument, \
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.instrument.parameter import ArrayParameter, Parameter, ParameterWithSetpoints
 from qcodes.dataset.legacy_import import import_dat_file
-from qcodes.dataset.data_set import load_by_id
+from qcodes.dataset.data_set import DataSet, load_by_id
 from qcodes.instrument.parameter import expand_setpoints_helper
 from qcodes.utils.validators import Arrays, ComplexNumbers, Numbers
 # pylint: disable=unused-import
@@ -595,8 +597,8 @@ def test_subscriptions(experiment, DAC, DMM):
             datasaver.add_result((DAC.ch1, dac_val), (DMM.v1, dmm_val))
 
             # Ensure that data is flushed to the database despite the write
-            # period, so that the database triggers are executed, which in turn
-            # add data to the queues within the subscribers
+            # period, so that the data is published to the queues within the
+            # subscribers
             datasaver.flush_data_to_database()
 
             # In order to make this test deterministic, we need to ensure that
@@ -605,11 +607,9 @@ def test_subscriptions(experiment, DAC, DMM):
             # subscriber constructor) has been updated by the corresponding
             # subscriber's callback function. At the moment, there is no robust
             # way to ensure this. The reason is that the subscribers have
-            # internal queue which is populated via a trigger call from the SQL
-            # database, hence from this "main" thread it is difficult to say
-            # whether the queue is empty because the subscriber callbacks have
-            # already been executed or because the triggers of the SQL database
-            # has not been executed yet.
+            # internal queue which is exhausted by the subscriber threads,
+            # hence from this "main" thread it is difficult to say whether
+            # the subscriber callbacks have already been executed.
             #
             # In order to overcome this problem, a special decorator is used to
             # wrap the assertions. This is going to ensure that some time is
@@ -677,6 +677,62 @@ def test_subscribers_called_at_exiting_context_if_queue_is_not_empty(experiment,
     assert collected_x_vals == given_x_vals
 
 
+def test_datasaver_write_in_background(experiment, DAC, DMM):
+    """
+    Test that results written by the background writer end up in the
+    database and are passed on to subscribers
+    """
+    def collect_x_vals(results, length, state):
+        state += [res[0] for res in results]
+
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DMM.v1, setpoints=(DAC.ch1,))
+    meas.write_period = 0.001
+
+    collected_x_vals = []
+    meas.add_subscriber(collect_x_vals, state=collected_x_vals)
+
+    xvals = np.linspace(0, 1, 200)
+
+    with meas.run(write_in_background=True) as datasaver:
+        for x in xvals:
+            datasaver.add_result((DAC.ch1, x), (DMM.v1, 2 * x))
+        datasaver.flush_data_to_database(block=True)
+        assert datasaver.points_written == len(xvals)
+
+    assert not datasaver._writer.is_alive()
+    assert datasaver.dataset.completed
+    assert collected_x_vals == list(xvals)
+    data = datasaver.dataset.get_parameter_data()['dummy_dmm_v1']
+    assert_allclose(data['dummy_dac_ch1'], xvals)
+    assert_allclose(data['dummy_dmm_v1'], 2 * xvals)
+
+
+def test_datasaver_write_in_background_raises(experiment, DAC):
+    """
+    Test that an error in the background writer is raised in the
+    measurement thread and that the dataset is still completed
+    """
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1)
+
+    def failing_add(*args, **kwargs):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    with pytest.raises(RuntimeError,
+                       match='in the background failed') as excinfo:
+        with meas.run(write_in_background=True) as datasaver:
+            with patch.object(DataSet, 'add_results_from_columns',
+                              side_effect=failing_add):
+                datasaver.add_result((DAC.ch1, 1))
+                datasaver.flush_data_to_database(block=True)
+
+    assert isinstance(excinfo.value.__cause__, sqlite3.OperationalError)
+    assert not datasaver._writer.is_alive()
+    assert datasaver.dataset.completed
+
+
 @settings(deadline=None, max_examples=25)
 @given(N=hst.integers(min_value=2000, max_value=3000))
 def test_subscribers_called_for_all_data_points(experiment, DAC, DMM, N):
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from hypothesis import given, example, assume
 from hypothesis.strategies import text, sampled_from, floats, lists, data, \
     one_of, just
@@ -7,8 +8,9 @@ import qcodes as qc
 from qcodes.dataset.plotting import _make_rescaled_ticks_and_units, \
     _ENGINEERING_PREFIXES, _UNITS_FOR_RESCALING
 
-from qcodes.dataset.plotting import (plot_by_id, _appropriate_kwargs,
-    _complex_to_real_preparser)
+from qcodes.dataset.plotting import (plot_by_id, plot_dataset,
+    _appropriate_kwargs, _complex_to_real_preparser)
+from qcodes.dataset.data_export import get_decimated_data
 from qcodes.dataset.measurements import Measurement
 from qcodes.tests.instrument_mocks import DummyInstrument
 from qcodes.tests.dataset.temporary_databases import empty_temp_db, experiment
@@ -121,6 +123,81 @@ def test_plot_by_id_line_and_heatmap(experiment, request):
     plot_by_id(dataid, cmap='bone')
 
 
+@pytest.mark.parametrize('paramtype', ['numeric', 'array'])
+def test_decimated_line(experiment, monkeypatch, paramtype):
+    monkeypatch.setattr('qcodes.dataset.data_export._DECIMATION_CHUNK_ROWS',
+                        97)
+
+    meas = Measurement()
+    meas.register_custom_parameter('x', paramtype=paramtype)
+    meas.register_custom_parameter('y', setpoints=('x',),
+                                   paramtype=paramtype)
+
+    xs = np.linspace(0, 1, 1000)
+    ys = np.sin(50 * xs)
+    ys[123] = 5
+    ys[456] = np.nan
+    ys[789] = np.inf
+    with meas.run() as datasaver:
+        datasaver.add_result(('x', xs), ('y', ys))
+    dataset = datasaver.dataset
+
+    data, = get_decimated_data(dataset, 20)
+    assert [d['name'] for d in data] == ['x', 'y']
+    x, y = data[0]['data'], data[1]['data']
+    assert len(x) == len(y) == 40
+    assert np.all(np.diff(x) >= 0)
+    # the envelope of the data is preserved
+    assert y.max() == 5
+    assert np.isclose(y.min(), np.nanmin(ys))
+    assert np.isclose(x, 123 / 999).any()
+
+    # data that fit the resolution are not decimated
+    data, = get_decimated_data(dataset, 500)
+    full_data = dataset.get_parameter_data()['y']
+    assert np.array_equal(data[0]['data'], full_data['x'].ravel())
+    assert np.array_equal(data[1]['data'], full_data['y'].ravel(),
+                          equal_nan=True)
+
+    axes, colorbars = plot_dataset(dataset, resolution=20)
+    assert len(axes[0].lines[0].get_xdata()) == 40
+
+
+@pytest.mark.parametrize('paramtype', ['numeric', 'array'])
+def test_decimated_heatmap(experiment, monkeypatch, paramtype):
+    monkeypatch.setattr('qcodes.dataset.data_export._DECIMATION_CHUNK_ROWS',
+                        97)
+
+    meas = Measurement()
+    meas.register_custom_parameter('x', paramtype=paramtype)
+    meas.register_custom_parameter('y', paramtype=paramtype)
+    meas.register_custom_parameter('z', setpoints=('x', 'y'),
+                                   paramtype=paramtype)
+
+    xs, ys = np.meshgrid(np.arange(40), np.arange(7))
+    zs = (xs + 100 * ys).astype(float)
+    zs[3, 5] = np.nan
+    with meas.run() as datasaver:
+        datasaver.add_result(('x', xs.ravel()), ('y', ys.ravel()),
+                             ('z', zs.ravel()))
+    dataset = datasaver.dataset
+
+    data, = get_decimated_data(dataset, (10, 20))
+    assert [d['name'] for d in data] == ['x', 'y', 'z']
+    x, y, z = (d['data'] for d in data)
+    # blocks of four points along x, every distinct y has a row of its own
+    assert len(z) == 10 * 7
+    assert np.array_equal(np.unique(y), np.arange(7))
+    # non-finite values are left out of the averages
+    assert np.allclose(z, np.nanmean(zs.reshape(7, 10, 4), axis=2).ravel())
+    edges = np.linspace(0, 39, 11)
+    assert np.allclose(np.unique(x), (edges[:-1] + edges[1:]) / 2)
+
+    axes, colorbars = plot_dataset(dataset, resolution=(10, 20))
+    assert colorbars[0] is not None
+    assert axes[0].collections[0].get_array().size == 7 * 10
+
+
 def test_appropriate_kwargs():
 
     kwargs = {'cmap': 'bone'}
@@ -1,8 +1,14 @@
 import json
+from copy import deepcopy
 
 import numpy
 import pytest
 
+import qcodes as qc
+from qcodes.dataset.data_set import DataSet, load_by_id
+from qcodes.dataset.sqlite.queries import (get_last_snapshot_base_id,
+                                           get_snapshot_base)
+from qcodes.dataset.sqlite.query_helpers import select_one_where
 from qcodes.instrument.parameter import ManualParameter
 from qcodes.tests.instrument_mocks import DummyInstrument
 from qcodes.dataset.measurements import Measurement
@@ -108,3 +114,87 @@ def test_snapshot_creation_for_types_not_supported_by_builtin_json(experiment):
 
     assert False is snapshot['station']['parameters']['p_np_bool']['value']
     assert False is snapshot['station']['parameters']['p_np_bool']['raw_value']
+
+
+@pytest.fixture
+def store_snapshot_diffs():
+    store_snapshot_diffs = qc.config.dataset.store_snapshot_diffs
+    qc.config.dataset.store_snapshot_diffs = True
+    try:
+        yield
+    finally:
+        qc.config.dataset.store_snapshot_diffs = store_snapshot_diffs
+
+
+def _station_snapshot(dac_value, n_instruments=10):
+    return {'station': {'instruments': {
+        f'dac{i}': {'parameters': {
+            f'ch{j}': {'value': dac_value, 'unit': 'V', 'label': f'Gate {j}'}
+            for j in range(10)}}
+        for i in range(n_instruments)}}}
+
+
+def _stored_snapshot(dataset):
+    return select_one_where(dataset.conn, 'runs', 'snapshot', 'run_id',
+                            dataset.run_id)
+
+
+@pytest.mark.usefixtures('experiment', 'store_snapshot_diffs')
+def test_snapshots_stored_as_diffs():
+    snapshots = [_station_snapshot(0.1), _station_snapshot(0.1),
+                 deepcopy(_station_snapshot(0.1))]
+    snapshots[2]['station']['instruments']['dac3']['parameters']['ch1'][
+        'value'] = 0.2
+    datasets = []
+    for snapshot in snapshots:
+        dataset = DataSet()
+        dataset.add_snapshot(json.dumps(snapshot))
+        datasets.append(dataset)
+
+    # the first snapshot is the base of the others
+    base_id = get_last_snapshot_base_id(datasets[0].conn)
+    assert json.loads(get_snapshot_base(datasets[0].conn, base_id)) == \
+        snapshots[0]
+    assert _stored_snapshot(datasets[0]) == '{}'
+    assert _stored_snapshot(datasets[1]) == '{}'
+    assert len(_stored_snapshot(datasets[2])) < \
+        len(json.dumps(snapshots[2])) / 20
+
+    for dataset, snapshot in zip(datasets, snapshots):
+        assert dataset.snapshot_raw == json.dumps(snapshot)
+        assert dataset.get_metadata('snapshot') == json.dumps(snapshot)
+        assert load_by_id(dataset.run_id).snapshot == snapshot
+
+
+@pytest.mark.usefixtures('experiment', 'store_snapshot_diffs')
+def test_snapshot_that_differs_too_much_becomes_base():
+    first = DataSet()
+    first.add_snapshot(json.dumps(_station_snapshot(0.1)))
+    base_id = get_last_snapshot_base_id(first.conn)
+
+    second = DataSet()
+    snapshot = _station_snapshot(0.2, n_instruments=12)
+    second.add_snapshot(json.dumps(snapshot))
+    assert get_last_snapshot_base_id(first.conn) == base_id + 1
+    assert second.snapshot == snapshot
+    assert first.snapshot == _station_snapshot(0.1)
+
+    # storing full snapshots again
+    qc.config.dataset.store_snapshot_diffs = False
+    second.add_snapshot(json.dumps({'a': 1}), overwrite=True)
+    assert _stored_snapshot(second) == json.dumps({'a': 1})
+    assert second.snapshot == {'a': 1}
+    assert load_by_id(second.run_id).snapshot == {'a': 1}
+
+
+@pytest.mark.usefixtures('experiment', 'store_snapshot_diffs')
+def test_snapshot_added_as_metadata_replaces_diff():
+    dataset = DataSet()
+    dataset.add_snapshot(json.dumps(_station_snapshot(0.1)))
+    assert get_last_snapshot_base_id(dataset.conn) is not None
+
+    snapshot = _station_snapshot(0.3)
+    dataset.add_metadata('snapshot', json.dumps(snapshot))
+    assert dataset.snapshot == snapshot
+    assert dataset.get_metadata('snapshot') == json.dumps(snapshot)
+    assert load_by_id(dataset.run_id).snapshot == snapshot
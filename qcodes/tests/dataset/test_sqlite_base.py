@@ -1,6 +1,7 @@
 # Since all other tests of data_set and measurements will inevitably also
 # test the sqlite module, we mainly test exceptions and small helper
 # functions here
+import io
 from sqlite3 import OperationalError
 import tempfile
 import os
@@ -12,9 +13,10 @@ import hypothesis.strategies as hst
 from hypothesis import given
 import unicodedata
 import numpy as np
+from numpy.testing import assert_array_equal
 from unittest.mock import patch
 
-from qcodes.dataset.descriptions.param_spec import ParamSpec
+from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
 from qcodes.dataset.descriptions.rundescriber import RunDescriber
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 import qcodes.dataset.descriptions.versioning.serialization as serial
@@ -102,6 +104,57 @@ def test_insert_many_values_raises(experiment):
                                     values=[[1], [1, 3]])
 
 
+def test_insert_many_columns_raises(experiment):
+    conn = experiment.conn
+
+    with pytest.raises(ValueError):
+        mut_help.insert_many_columns(conn, 'some_string',
+                                     ['column1', 'column2'],
+                                     values=[np.array([1]),
+                                             np.array([1, 3])])
+
+
+@pytest.mark.parametrize(('no_of_rows', 'max_var', 'chunks'),
+                         [(0, 1000, []),
+                          (1, 1000, [1]),
+                          (7, 1000, [4, 2, 1]),
+                          (512, 2000, [512]),
+                          (1200, 2000, [512, 512, 128, 32, 16]),
+                          (11, 8, [4, 4, 2, 1]),
+                          (9, 5, [2, 2, 2, 2, 1])])
+def test_insert_chunk_sizes(no_of_rows, max_var, chunks):
+    with patch.object(mut_help, '_max_variable_number',
+                      return_value=max_var):
+        assert mut_help._insert_chunk_sizes(no_of_rows, 2) == chunks
+
+
+def test_insert_many_columns_query_cache(experiment):
+    conn = experiment.conn
+    mut_conn.atomic_transaction(conn,
+                                'CREATE TABLE "t" (id INTEGER PRIMARY KEY, '
+                                'a INTEGER, b INTEGER)')
+    query_cache = {}
+
+    first = mut_help.insert_many_columns(conn, 't', ['a', 'b'],
+                                         [np.arange(5), np.arange(5) + 10],
+                                         query_cache)
+    assert first == 1
+    assert set(query_cache) == {('t', ('a', 'b'), 4), ('t', ('a', 'b'), 1)}
+
+    cached = dict(query_cache)
+    first = mut_help.insert_many_columns(conn, 't', ['a', 'b'],
+                                         [[5], [15]], query_cache)
+    assert first == 6
+    assert query_cache == cached
+
+    assert mut_help.insert_many_columns(conn, 't', ['a', 'b'],
+                                        [[], []], query_cache) is None
+
+    rows = mut_help.many_many(
+        mut_conn.atomic_transaction(conn, 'SELECT a, b FROM "t"'), 'a', 'b')
+    assert rows == [[i, i + 10] for i in range(6)]
+
+
 def test_get_metadata_raises(experiment):
     with pytest.raises(RuntimeError) as excinfo:
         mut_queries.get_metadata(experiment.conn, 'something', 'results')
@@ -279,6 +332,98 @@ def test_get_parameter_data_independent_parameters(
                      expected_shapes, expected_values)
 
 
+@pytest.mark.parametrize('chunk_size', [1, 3, 10000])
+def test_get_parameter_tree_arrays(dataset, chunk_size):
+    x = ParamSpecBase('x', 'numeric')
+    t = ParamSpecBase('t', 'text')
+    y = ParamSpecBase('y', 'array')
+    z = ParamSpecBase('z', 'numeric')
+    idps = InterDependencies_(dependencies={y: (x, t), z: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    dataset.add_results([{'x': xv, 't': f'text{xv}', 'y': np.arange(3) + xv}
+                         for xv in range(5)])
+    dataset.add_results([{'x': xv, 'z': xv + 0.5} for xv in range(5)])
+
+    data = mut_queries.get_parameter_tree_arrays(
+        dataset.conn, dataset.table_name, [y, x, t], chunk_size=chunk_size)
+    assert list(data.keys()) == ['y', 'x', 't']
+    expected_x = np.repeat(np.arange(5), 3).reshape(5, 3)
+    assert_array_equal(data['y'], np.arange(3) + expected_x)
+    assert_array_equal(data['x'], expected_x)
+    # numeric parameters are broadcast against arrays as floats
+    assert data['x'].dtype == np.float64
+    assert data['t'].shape == (5, 3)
+    assert_array_equal(data['t'][:, 0], [f'text{xv}' for xv in range(5)])
+
+    data = mut_queries.get_parameter_tree_arrays(
+        dataset.conn, dataset.table_name, [z, x], start=2, end=4,
+        chunk_size=chunk_size)
+    assert_array_equal(data['z'], [1.5, 2.5, 3.5])
+    assert data['z'].dtype == np.float64
+    assert_array_equal(data['x'], [1, 2, 3])
+
+    data = mut_queries.get_parameter_tree_arrays(
+        dataset.conn, dataset.table_name, [z, x], start=4, end=2)
+    assert data == {}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 10000])
+def test_get_parameter_tree_arrays_ragged(dataset, chunk_size):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'array')
+    idps = InterDependencies_(dependencies={y: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    arrays = [np.arange(2), np.arange(2) + 0.5, np.arange(3)]
+    dataset.add_results([{'x': xv, 'y': array}
+                         for xv, array in enumerate(arrays)])
+
+    data = mut_queries.get_parameter_tree_arrays(
+        dataset.conn, dataset.table_name, [y, x], chunk_size=chunk_size)
+    assert data['y'].dtype == np.dtype('O')
+    assert data['x'].dtype == np.dtype('O')
+    for row, array in enumerate(arrays):
+        assert_array_equal(data['y'][row], array)
+        assert_array_equal(data['x'][row], np.full_like(array, row))
+
+
+@pytest.mark.parametrize('array', [np.arange(5.0),
+                                   np.arange(12, dtype='>i2').reshape(3, 4),
+                                   np.zeros((0, 3), dtype=np.complex64),
+                                   np.array(1.5),
+                                   np.array(['a', 'bc']),
+                                   np.asfortranarray(np.eye(3))])
+def test_array_blob_roundtrip(array):
+    blob = bytes(mut_db._adapt_array(array))
+    assert blob.startswith(mut_db._ARRAY_BLOB_MAGIC)
+
+    loaded = mut_db._convert_array(blob)
+    assert loaded.dtype == array.dtype
+    assert loaded.flags.writeable
+    assert_array_equal(loaded, array)
+
+
+def test_convert_npy_array_blob():
+    array = np.arange(6).reshape(2, 3)
+    out = io.BytesIO()
+    np.save(out, array)
+
+    loaded = mut_db._convert_array(out.getvalue())
+    assert_array_equal(loaded, array)
+
+    out = io.BytesIO()
+    np.save(out, np.array([1 + 2j]))
+    assert mut_db._convert_complex(out.getvalue()) == 1 + 2j
+
+
+def test_convert_array_blob_unknown_version():
+    blob = bytearray(mut_db._adapt_array(np.arange(3)))
+    blob[len(mut_db._ARRAY_BLOB_MAGIC)] = 2
+    with pytest.raises(RuntimeError, match='format version 2'):
+        mut_db._convert_array(bytes(blob))
+
+
 def test_is_run_id_in_db(empty_temp_db):
     conn = mut_db.connect(get_DB_location())
     mut_queries.new_experiment(conn, 'test_exp', 'no_sample')
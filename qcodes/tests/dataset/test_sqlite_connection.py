@@ -1,11 +1,20 @@
+import gc
+import multiprocessing
 import re
 import sqlite3
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from qcodes.dataset.sqlite.connection import ConnectionPlus, \
     make_connection_plus_from, atomic, atomic_transaction
-from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.database import connect, connect_read_only, \
+    get_pooled_read_only_connection, close_pooled_connections
+from qcodes.dataset.sqlite.db_upgrades import _latest_available_version, \
+    get_user_version
 from qcodes.tests.common import error_caused_by
 
 
@@ -330,3 +339,119 @@ def test_connect():
     assert False is conn.atomic_in_progress
 
     assert sqlite3.Row is conn.row_factory
+
+
+@pytest.fixture
+def connection_pool():
+    try:
+        yield
+    finally:
+        close_pooled_connections()
+
+
+def test_connect_read_only(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    connect(dbfile).close()
+
+    conn = connect_read_only(dbfile)
+
+    assert isinstance(conn, ConnectionPlus)
+    assert sqlite3.Row is conn.row_factory
+    assert dbfile == conn.path_to_dbfile
+    assert [] == conn.execute('SELECT * FROM runs').fetchall()
+    with pytest.raises(RuntimeError,
+                       match='Rolling back due to unhandled exception') as e:
+        atomic_transaction(conn, "INSERT INTO experiments (name) "
+                                 "VALUES ('exp')")
+    assert error_caused_by(e, 'attempt to write a readonly database')
+    conn.close()
+
+
+def test_connect_read_only_requires_latest_version(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    connect(dbfile, version=_latest_available_version() - 1).close()
+
+    with pytest.raises(RuntimeError, match='read-only connections require'):
+        connect_read_only(dbfile)
+
+
+@pytest.mark.usefixtures('connection_pool')
+def test_pooled_read_only_connection(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    connect(dbfile, version=_latest_available_version() - 1).close()
+
+    conn = get_pooled_read_only_connection(dbfile)
+
+    # the database is upgraded before it is connected to read-only
+    assert _latest_available_version() == get_user_version(conn)
+    assert get_pooled_read_only_connection(dbfile) is conn
+    assert get_pooled_read_only_connection(str(tmp_path / 'other.db')) \
+        is not conn
+
+    # closed connections are replaced
+    conn.close()
+    new_conn = get_pooled_read_only_connection(dbfile)
+    assert new_conn is not conn
+    assert [] == new_conn.execute('SELECT * FROM runs').fetchall()
+
+    close_pooled_connections()
+    with pytest.raises(sqlite3.ProgrammingError):
+        new_conn.execute('SELECT * FROM runs')
+
+
+@pytest.mark.usefixtures('connection_pool')
+def test_pooled_read_only_connections_per_thread(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    n_threads = 4
+    # make sure that every call is made from a different thread
+    barrier = threading.Barrier(n_threads)
+
+    def get_connection(_):
+        barrier.wait()
+        conn = get_pooled_read_only_connection(dbfile)
+        assert get_pooled_read_only_connection(dbfile) is conn
+        return conn
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        conns = list(executor.map(get_connection, range(n_threads)))
+
+    assert n_threads == len({id(conn) for conn in conns})
+    assert get_pooled_read_only_connection(dbfile) not in conns
+    # the connections can be used by other threads than their own
+    for conn in conns:
+        assert [] == conn.execute('SELECT * FROM runs').fetchall()
+
+
+@pytest.mark.usefixtures('connection_pool')
+def test_pooled_read_only_connections_of_ended_threads(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+
+    def get_connection():
+        return weakref.ref(get_pooled_read_only_connection(dbfile))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        conn_ref = executor.submit(get_connection).result()
+    gc.collect()
+
+    # the pool of the thread is dropped along with the thread
+    assert conn_ref() is None
+
+
+def _assert_new_pooled_connection(conn, dbfile):
+    assert get_pooled_read_only_connection(dbfile) is not conn
+
+
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='processes can not be forked on Windows')
+@pytest.mark.usefixtures('connection_pool')
+def test_pooled_read_only_connections_of_forked_process(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    conn = get_pooled_read_only_connection(dbfile)
+
+    process = multiprocessing.get_context('fork').Process(
+        target=_assert_new_pooled_connection, args=(conn, dbfile))
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert get_pooled_read_only_connection(dbfile) is conn
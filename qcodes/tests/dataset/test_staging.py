@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from qcodes.dataset.data_set import DataSet, load_by_id
+from qcodes.dataset.measurements import Measurement
+from qcodes.dataset.staging import (StagedRun, merge_staged_run,
+                                    merge_staged_runs, wait_for_staged_runs)
+# pylint: disable=unused-import
+from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
+                                                      experiment)
+# pylint: disable=unused-import
+from qcodes.tests.dataset.test_dependencies import some_interdeps
+
+
+def _staged_files(staging_dir):
+    return sorted(os.listdir(staging_dir))
+
+
+@pytest.mark.parametrize('write_in_background', (False, True))
+def test_measurement_with_staging(experiment, tmp_path, write_in_background):
+    staging_dir = str(tmp_path / 'staging')
+
+    def collect_x(results, length, state):
+        state += [res[0] for res in results]
+
+    meas = Measurement(exp=experiment)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    collected_x = []
+    meas.add_subscriber(collect_x, state=collected_x)
+    xvals = np.linspace(0, 1, 50)
+
+    with meas.run(write_in_background=write_in_background,
+                  staging_dir=staging_dir) as datasaver:
+        for x in xvals:
+            datasaver.add_result(('x', x), ('y', 2 * x))
+        datasaver.flush_data_to_database(block=True)
+        assert datasaver.points_written == len(xvals)
+        # the results are not in the database while measuring, but they
+        # can be read from the staged run
+        assert datasaver.dataset.number_of_results == 0
+        assert datasaver.results_dataset is not datasaver.dataset
+        staged = datasaver.results_dataset.get_parameter_data()['y']
+        assert_allclose(staged['y'], 2 * xvals)
+
+    wait_for_staged_runs()
+    assert collected_x == list(xvals)
+    assert _staged_files(staging_dir) == []
+
+    dataset = datasaver.dataset
+    assert dataset.completed
+    loaded = load_by_id(datasaver.run_id)
+    assert loaded.completed
+    assert loaded.guid == dataset.guid
+    assert loaded.captured_run_id == loaded.run_id
+    assert loaded.completed_timestamp_raw >= loaded.run_timestamp_raw
+    data = loaded.get_parameter_data()['y']
+    assert_allclose(data['x'], xvals)
+    assert_allclose(data['y'], 2 * xvals)
+
+
+def _crashed_run(interdeps, staging_dir, n_results):
+    """
+    Stage a run and leave it behind as if the process had crashed
+    """
+    dataset = DataSet()
+    dataset.set_interdependencies(interdeps)
+    dataset.mark_started()
+    staged_run = StagedRun(dataset, staging_dir)
+    # let the recovery of the staging directory, which is started by the
+    # first staged run, pass before the run is left behind
+    wait_for_staged_runs()
+    staged_run.dataset.add_results([{'ps1': i, 'ps2': 2 * i}
+                                    for i in range(n_results)])
+    staged_run.dataset.conn.close()
+    return staged_run, dataset
+
+
+@pytest.mark.usefixtures('experiment')
+def test_merge_staged_runs_after_crash(some_interdeps, tmp_path):
+    staging_dir = str(tmp_path)
+    staged_run, dataset = _crashed_run(some_interdeps[1], staging_dir, 10)
+
+    # the run is still being measured as long as the lock is held
+    assert merge_staged_runs(staging_dir) == []
+    with pytest.raises(RuntimeError, match='still being measured'):
+        merge_staged_run(staged_run.path)
+
+    staged_run._lock.close()
+    assert merge_staged_runs(staging_dir) == [staged_run.path]
+    assert _staged_files(staging_dir) == []
+
+    loaded = load_by_id(dataset.run_id)
+    assert not loaded.completed
+    assert_array_equal(loaded.get_parameter_data()['ps2']['ps1'],
+                       np.arange(10))
+
+
+@pytest.mark.usefixtures('experiment')
+def test_leftover_runs_are_merged_when_staging(some_interdeps, tmp_path,
+                                               monkeypatch):
+    staging_dir = str(tmp_path)
+    staged_run, dataset = _crashed_run(some_interdeps[1], staging_dir, 10)
+    staged_run._lock.close()
+
+    # as if the process was restarted
+    monkeypatch.setattr('qcodes.dataset.staging._recovered_dirs', set())
+    new_dataset = DataSet()
+    new_dataset.set_interdependencies(some_interdeps[1])
+    new_dataset.mark_started()
+    new_staged_run = StagedRun(new_dataset, staging_dir)
+    wait_for_staged_runs()
+
+    assert load_by_id(dataset.run_id).number_of_results == 10
+    assert _staged_files(staging_dir) == [
+        os.path.basename(new_staged_run.path),
+        os.path.basename(new_staged_run.path) + '.lock']
+
+    new_staged_run.finish()
+    wait_for_staged_runs()
+    assert _staged_files(staging_dir) == []
+    assert load_by_id(new_dataset.run_id).completed
+
+
+@pytest.mark.usefixtures('experiment')
+def test_merge_staged_run_is_idempotent(some_interdeps, tmp_path):
+    staging_dir = str(tmp_path)
+    staged_run, dataset = _crashed_run(some_interdeps[1], staging_dir, 3)
+    staged_run._lock.close()
+    path = staged_run.path
+
+    with open(path, 'rb') as staging_db:
+        content = staging_db.read()
+    merge_staged_run(path)
+    with open(path, 'wb') as staging_db:
+        staging_db.write(content)
+    merge_staged_run(path)
+
+    assert not os.path.exists(path)
+    assert load_by_id(dataset.run_id).number_of_results == 3
+
+
+@pytest.mark.usefixtures('experiment')
+def test_staged_run_of_completed_run_is_kept(some_interdeps, tmp_path):
+    staging_dir = str(tmp_path)
+    staged_run, dataset = _crashed_run(some_interdeps[1], staging_dir, 3)
+    staged_run._lock.close()
+    dataset.mark_completed()
+
+    with pytest.raises(RuntimeError, match='without all of the staged'):
+        merge_staged_run(staged_run.path)
+    assert os.path.exists(staged_run.path)
+    assert load_by_id(dataset.run_id).number_of_results == 0
+
+
+@pytest.mark.usefixtures('experiment')
+def test_stage_run_raises(some_interdeps, tmp_path):
+    dataset = DataSet()
+    with pytest.raises(ValueError, match='not been started'):
+        StagedRun(dataset, str(tmp_path))
+    with pytest.raises(ValueError, match='No staging directory'):
+        merge_staged_runs()
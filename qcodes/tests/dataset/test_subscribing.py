@@ -2,6 +2,7 @@
 from typing import List, Tuple, Dict, Union
 from numbers import Number
 
+import numpy as np
 import pytest
 from numpy import ndarray
 import logging
@@ -111,6 +112,63 @@ def test_basic_subscription(dataset, basic_subscriber):
     assert len(triggers) == 0
 
 
+def test_subscription_batches(dataset):
+    xparam = ParamSpecBase(name='x', paramtype='numeric')
+    yparam = ParamSpecBase(name='y', paramtype='numeric')
+    zparam = ParamSpecBase(name='z', paramtype='array')
+    idps = InterDependencies_(dependencies={yparam: (xparam,)},
+                              standalones=(zparam,))
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+
+    def collect_results(results, length, state):
+        state.append((results, length))
+
+    state = []
+    dataset.subscribe(collect_results, min_wait=0, min_count=1, state=state)
+
+    # subscribers do not need triggers in the database
+    get_triggers_sql = "SELECT * FROM sqlite_master WHERE TYPE = 'trigger';"
+    triggers = atomic_transaction(
+        dataset.conn, get_triggers_sql).fetchall()
+    assert len(triggers) == 0
+
+    dataset.add_results([{'x': x, 'y': -x} for x in range(3)])
+    dataset.add_results_from_columns([{'x': np.arange(3, 5),
+                                       'y': np.array([-3.5, -4.5])},
+                                      {'z': [np.arange(2)]}])
+    dataset.mark_completed()
+    dataset.unsubscribe_all()
+
+    # the results are passed along with the length of the dataset after
+    # the results
+    assert state[-1][1] == 6
+    results = [row for rows, _ in state for row in rows]
+    assert results[:5] == [(0, 0, None), (1, -1, None), (2, -2, None),
+                           (3, -3.5, None), (4, -4.5, None)]
+    assert type(results[3][0]) is int
+    assert results[5][:2] == (None, None)
+    np.testing.assert_array_equal(results[5][2], np.arange(2))
+
+
+def test_unsubscribe_all_removes_stale_triggers(dataset):
+    xparam = ParamSpecBase(name='x', paramtype='numeric')
+    dataset.set_interdependencies(InterDependencies_(standalones=(xparam,)))
+    dataset.mark_started()
+
+    # a trigger left behind by an old style subscriber calls a function
+    # that is not registered on this connection
+    atomic_transaction(dataset.conn, f"""
+        CREATE TRIGGER substale AFTER INSERT ON '{dataset.table_name}'
+        BEGIN
+            SELECT callbackstale(NEW.x);
+        END;""")
+    dataset.unsubscribe_all()
+
+    dataset.add_result({'x': 1})
+    assert dataset.get_parameter_data()['x']['x'] == [1]
+
+
 def test_subscription_from_config(dataset, basic_subscriber):
     """
     This test is similar to `test_basic_subscription`, with the only
@@ -0,0 +1,149 @@
+"""
+Test suite for the async communication with instruments
+"""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from qcodes.instrument.base import Instrument
+from qcodes.instrument.channel import InstrumentChannel
+from qcodes.utils.validators import Numbers
+# pylint: disable=unused-import
+from qcodes.tests.test_ip import ip_instrument
+
+
+class SlowInstrument(Instrument):
+    """
+    Instrument that takes a while to respond, and keeps track of how many of
+    its commands are handled concurrently
+    """
+    delay = 0.2
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.commands = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._value = 0
+        self.add_parameter('value', get_cmd='VAL?', set_cmd='VAL {}',
+                           get_parser=float, vals=Numbers())
+        self.add_parameter('doubled', get_cmd=lambda: 2 * self._value)
+        self.add_submodule('channel', InstrumentChannel(self, 'channel'))
+        self.channel.add_parameter('value', get_cmd='VAL?', get_parser=float)
+
+    def _communicate(self, cmd):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.commands.append(cmd)
+
+    def write_raw(self, cmd):
+        self._communicate(cmd)
+        self._value = float(cmd.split(' ')[1])
+
+    def ask_raw(self, cmd):
+        self._communicate(cmd)
+        return str(self._value)
+
+
+@pytest.fixture
+def slow_instruments():
+    instruments = [SlowInstrument(f'slow{i}') for i in range(3)]
+    yield instruments
+    for instrument in instruments:
+        instrument.close()
+
+
+def test_get_and_set_async(slow_instruments):
+    instrument = slow_instruments[0]
+
+    async def set_and_get():
+        await instrument.value.set_async(3)
+        return (await instrument.value.get_async(),
+                await instrument.doubled.get_async(),
+                await instrument.channel.value.get_async())
+
+    assert asyncio.run(set_and_get()) == (3.0, 6.0, 3.0)
+    assert instrument.commands == ['VAL 3', 'VAL?', 'VAL?']
+    assert instrument.value.get_latest() == 3.0
+    assert instrument.value.raw_value == '3.0'
+
+
+def test_set_async_steps(slow_instruments):
+    instrument = slow_instruments[0]
+    instrument.delay = 0
+    instrument.value.step = 1
+    instrument.value.post_delay = 0.01
+
+    asyncio.run(instrument.value.set_async(3))
+    # the value is read to ramp from it
+    assert instrument.commands[0] == 'VAL?'
+    assert [float(cmd.split(' ')[1]) for cmd in instrument.commands[1:]] == \
+        [1, 2, 3]
+
+    with pytest.raises(TypeError, match='setting slow0_value to abc'):
+        asyncio.run(instrument.value.set_async('abc'))
+
+
+def test_set_async_steps_from_outdated_value(slow_instruments, monkeypatch):
+    instrument = slow_instruments[0]
+    instrument.delay = 0
+    instrument.value.set(1)
+    instrument.value.step = 1
+    instrument.value.get_latest.max_val_age = 60
+    instrument.value._latest['ts'] -= timedelta(seconds=120)
+    instrument._value = 2
+    instrument.commands.clear()
+
+    def blocking_get():
+        raise RuntimeError('the value must be gotten asynchronously')
+
+    monkeypatch.setattr(instrument.value, 'get', blocking_get)
+
+    asyncio.run(instrument.value.set_async(4))
+    assert instrument.commands == ['VAL?', 'VAL 3.0', 'VAL 4']
+
+
+def test_instruments_are_polled_concurrently(slow_instruments):
+    params = [param for instrument in slow_instruments
+              for param in (instrument.value, instrument.doubled,
+                            instrument.channel.value)]
+
+    async def poll():
+        return await asyncio.gather(*(param.get_async() for param in params))
+
+    t_start = time.perf_counter()
+    assert asyncio.run(poll()) == [0.0] * len(params)
+    duration = time.perf_counter() - t_start
+
+    # the instruments are read concurrently, but the communication with
+    # each instrument is not interleaved
+    assert duration < 2 * 3 * SlowInstrument.delay
+    for instrument in slow_instruments:
+        assert instrument.max_active == 1
+        assert instrument.commands == ['VAL?', 'VAL?']
+
+
+def test_ask_async_adds_context(slow_instruments):
+    instrument = slow_instruments[0]
+    with pytest.raises(IndexError, match="writing 'NOSPACE' to"):
+        asyncio.run(instrument.write_async('NOSPACE'))
+
+
+def test_ip_instrument_ask_async(ip_instrument):
+    queries = ['Q?' * n for n in range(1, 20)]
+
+    async def ask_all():
+        return await asyncio.gather(*(ip_instrument.ask_async(query)
+                                      for query in queries))
+
+    assert asyncio.run(ask_all()) == [f'{len(query)}\n' for query in queries]
+    # the blocking communication still works
+    assert ip_instrument.ask('Q?') == '2\n'
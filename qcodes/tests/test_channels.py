@@ -11,7 +11,8 @@ import pytest
 from qcodes.tests.instrument_mocks import DummyChannelInstrument, DummyChannel
 from qcodes.utils.validators import Numbers
 from qcodes.instrument.parameter import Parameter
-from qcodes.instrument.channel import ChannelList
+from qcodes.instrument.base import Instrument
+from qcodes.instrument.channel import ChannelList, InstrumentChannel
 from qcodes.loops import Loop
 
 
@@ -37,6 +38,74 @@ def test_channels_call_function(dci, caplog):
         assert mssgs == names
 
 
+class _BatchedReadChannel(InstrumentChannel):
+    def __init__(self, parent, name, channel):
+        super().__init__(parent, name)
+        self.channel = channel
+        self.add_parameter('voltage', get_cmd=f'VOLT? {channel}',
+                           get_parser=float, scale=10)
+
+
+class _BatchedReadInstrument(Instrument):
+    """
+    Instrument whose channels return 10 times their number as raw voltage,
+    and that can read the voltages of many channels with a single query
+    """
+    def __init__(self, name):
+        super().__init__(name)
+        self.queries = []
+        channels = ChannelList(self, 'channels', _BatchedReadChannel)
+        for i in range(6):
+            channels.append(_BatchedReadChannel(self, f'ch{i}', i))
+        channels.add_batched_get('voltage', self._get_voltages)
+        self.add_submodule('channels', channels)
+
+    def ask_raw(self, cmd):
+        self.queries.append(cmd)
+        channels = cmd.split(' ')[1].strip('()').split(',')
+        return ','.join(str(10 * int(channel)) for channel in channels)
+
+    def _get_voltages(self, channels):
+        numbers = ','.join(str(chan.channel) for chan in channels)
+        return self.ask(f'VOLT? ({numbers})').split(',')
+
+
+@pytest.fixture
+def batched_read_instrument():
+    instrument = _BatchedReadInstrument('batched')
+    yield instrument
+    instrument.close()
+
+
+def test_channels_batched_get(batched_read_instrument):
+    instrument = batched_read_instrument
+    channels = instrument.channels
+
+    assert channels.voltage() == (0, 1, 2, 3, 4, 5)
+    assert instrument.queries == ['VOLT? (0,1,2,3,4,5)']
+    # the parameters of the channels are updated
+    for i, chan in enumerate(channels):
+        assert chan.voltage.get_latest() == i
+        assert chan.voltage.raw_value == str(10 * i)
+
+    # sliced and combined lists read their channels in one query too
+    instrument.queries.clear()
+    assert channels[1:3].voltage() == (1, 2)
+    assert (channels[(0,)] + channels[4:]).voltage() == (0, 4, 5)
+    assert channels[2].voltage() == 2
+    assert instrument.queries == ['VOLT? (1,2)', 'VOLT? (0,4,5)', 'VOLT? 2']
+
+
+def test_channels_batched_get_raises(batched_read_instrument):
+    channels = batched_read_instrument.channels
+    with pytest.raises(ValueError, match='no parameter current'):
+        channels.add_batched_get('current', lambda chans: ())
+
+    channels.add_batched_get('voltage', lambda chans: ('1',))
+    with pytest.raises(RuntimeError, match='returned 1 values for 6'):
+        channels.voltage()
+
+
 class TestChannels(TestCase):
 
     def setUp(self):
@@ -1,6 +1,6 @@
 import re
 import pytest
-from typing import Optional
+from typing import List, Optional
 
 from qcodes.instrument.group_parameter import GroupParameter, Group
 from qcodes import Instrument
@@ -119,3 +119,32 @@ def test_raise_on_not_all_initial_values():
                         r'for \[.*\] but not for \[.*\].')
     with pytest.raises(ValueError, match=expected_err_msg):
         dummy = Dummy("dummy", initial_a=42)
+
+
+class PipeliningDummy(Instrument):
+    """
+    Instrument whose group parameters are read with a query each, which are
+    pipelined
+    """
+    max_pipelined_queries = 10
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.batches: List[List[str]] = []
+        for name in ('a', 'b', 'c'):
+            self.add_parameter(name, get_parser=int,
+                               parameter_class=GroupParameter)
+        Group([self.a, self.b, self.c], get_cmd=['A?', 'B?', 'C?'])
+
+    def ask_many_raw(self, cmds):
+        self.batches.append(list(cmds))
+        return [str(len(cmd) * (i + 1)) for i, cmd in enumerate(cmds)]
+
+
+def test_update_with_pipelined_get_cmds():
+    dummy = PipeliningDummy("dummy")
+
+    assert dummy.b() == 4
+    assert dummy.a.get_latest() == 2
+    assert dummy.c.get_latest() == 6
+    assert dummy.batches == [['A?', 'B?', 'C?']]
@@ -0,0 +1,43 @@
+import socket
+import threading
+
+import pytest
+
+from qcodes.instrument.ip import IPInstrument
+
+
+@pytest.fixture
+def ip_instrument():
+    """
+    An IPInstrument connected to a fake instrument that answers each query
+    with its length, and sends the responses in awkward chunks
+    """
+    instrument = IPInstrument('ip_instrument', persistent=False)
+    instrument_socket, instrument._socket = socket.socketpair()
+    instrument._persistent = True
+
+    def answer():
+        received = b''
+        while True:
+            data = instrument_socket.recv(1024)
+            if not data:
+                break
+            received += data
+            *queries, received = received.split(b'\n')
+            responses = b''.join(str(len(query)).encode() + b'\n'
+                                 for query in queries)
+            for i in range(0, len(responses), 3):
+                instrument_socket.sendall(responses[i:i + 3])
+
+    thread = threading.Thread(target=answer, daemon=True)
+    thread.start()
+    yield instrument
+    instrument.close()
+    instrument_socket.close()
+
+
+def test_ask_many_pipelined(ip_instrument):
+    ip_instrument.max_pipelined_queries = 10
+    queries = ['Q?' * n for n in range(1, 30)]
+    responses = ip_instrument.ask_many(queries)
+    assert responses == [f'{len(query)}\n' for query in queries]
@@ -1,6 +1,9 @@
+import json
+from copy import deepcopy
 from unittest import TestCase
 
-from qcodes.utils.metadata import Metadatable, diff_param_values
+from qcodes.utils.metadata import (Metadatable, apply_snapshot_diff,
+                                   diff_param_values, diff_snapshots)
 
 
 class TestMetadatable(TestCase):
@@ -110,3 +113,72 @@ class TestMetadatable(TestCase):
                 ("correct", "right"): "only"
             }
         )
+
+
+class TestSnapshotDiffs(TestCase):
+    base = {
+        "station": {
+            "instruments": {
+                "dac": {
+                    "parameters": {
+                        "ch1": {"value": 0.1, "unit": "V", "ts": "a"},
+                        "ch2": {"value": [1, 2], "unit": "V", "ts": "a"}
+                    }
+                },
+                "dmm": {"parameters": {"v1": {"value": 1}}}
+            },
+            "parameters": {"p": {"value": None}}
+        }
+    }
+
+    def assert_round_trip(self, base, snapshot):
+        base_copy = deepcopy(base)
+        diff = diff_snapshots(base, snapshot)
+        # the diff is stored as JSON
+        diff = json.loads(json.dumps(diff))
+        applied = apply_snapshot_diff(base, diff)
+        self.assertEqual(json.dumps(applied), json.dumps(snapshot))
+        self.assertEqual(base, base_copy)
+        return diff
+
+    def test_same_snapshot(self):
+        self.assertEqual(diff_snapshots(self.base, deepcopy(self.base)), {})
+
+    def test_changed_values(self):
+        snapshot = deepcopy(self.base)
+        dac = snapshot["station"]["instruments"]["dac"]["parameters"]
+        dac["ch1"]["value"] = 0.2
+        dac["ch2"]["value"] = [1, 2, 3]
+        dac["ch1"]["ts"] = dac["ch2"]["ts"] = "b"
+        diff = self.assert_round_trip(self.base, snapshot)
+        self.assertLess(len(json.dumps(diff)), len(json.dumps(snapshot)))
+
+    def test_added_and_removed_keys(self):
+        snapshot = deepcopy(self.base)
+        del snapshot["station"]["instruments"]["dmm"]
+        snapshot["station"]["instruments"]["awg"] = {"parameters": {}}
+        snapshot["station"]["parameters"]["p"]["label"] = "P"
+        self.assert_round_trip(self.base, snapshot)
+
+    def test_reordered_keys(self):
+        snapshot = deepcopy(self.base)
+        instruments = snapshot["station"]["instruments"]
+        snapshot["station"]["instruments"] = {
+            "dmm": instruments["dmm"], "dac": instruments["dac"]}
+        self.assert_round_trip(self.base, snapshot)
+
+    def test_changed_types(self):
+        snapshot = deepcopy(self.base)
+        snapshot["station"]["parameters"] = [1, 2]
+        snapshot["station"]["instruments"]["dmm"]["parameters"]["v1"] = 1
+        self.assert_round_trip(self.base, snapshot)
+        # True and 1 are equal in python, but not in JSON
+        self.assert_round_trip({"a": 1}, {"a": True})
+
+    def test_unchanged_subtrees_are_shared(self):
+        snapshot = deepcopy(self.base)
+        snapshot["station"]["parameters"]["p"]["value"] = 1
+        applied = apply_snapshot_diff(self.base,
+                                      diff_snapshots(self.base, snapshot))
+        self.assertIs(applied["station"]["instruments"],
+                      self.base["station"]["instruments"])
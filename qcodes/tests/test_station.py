@@ -1,6 +1,8 @@
 import pytest
 import tempfile
 import json
+import threading
+import time
 import warnings
 from pathlib import Path
 import os
@@ -200,6 +202,108 @@ def test_snapshot():
     assert [] == snapshot['default_measurement']
 
 
+class _ConcurrencyCounter:
+    """
+    Counts how many of the gets of the parameters made by ``parameter``
+    run at the same time
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = 0
+        self.max_running = 0
+
+    def parameter(self, instrument, name, release=None):
+        def get():
+            with self._lock:
+                self._running += 1
+                self.max_running = max(self.max_running, self._running)
+            if release is None:
+                time.sleep(0.1)
+            else:
+                release.wait(10)
+            with self._lock:
+                self._running -= 1
+            return 1
+
+        instrument.add_parameter(name, get_cmd=get, set_cmd=None)
+        return instrument.parameters[name]
+
+
+def test_snapshot_timing():
+    instrument = DummyInstrument('instrument', gates=['one'])
+    station = Station(instrument)
+
+    assert 'snapshot_timing' not in station.snapshot()
+    timing = station.snapshot(update=True)['snapshot_timing']
+    assert list(timing['components']) == ['instrument']
+    assert timing['components']['instrument']['timed_out'] is False
+    assert 0 <= timing['components']['instrument']['duration'] \
+        <= timing['duration']
+
+
+def test_concurrent_snapshot():
+    counter = _ConcurrencyCounter()
+    instruments = [DummyInstrument(f'instrument{i}', gates=['one'])
+                   for i in range(3)]
+    for instrument in instruments:
+        counter.parameter(instrument, 'slow')
+    station = Station(*instruments, update_snapshot=False)
+    serial_snapshot = station.snapshot(update=True)
+    assert counter.max_running == 1
+
+    station.snapshot_workers = 3
+    snapshot = station.snapshot(update=True)
+    assert counter.max_running == 3
+    assert list(snapshot['instruments']) == \
+        [instrument.name for instrument in instruments]
+    del serial_snapshot['snapshot_timing']
+    del snapshot['snapshot_timing']
+    for snap in (serial_snapshot, snapshot):
+        for instrument_snapshot in snap['instruments'].values():
+            for parameter_snapshot in \
+                    instrument_snapshot['parameters'].values():
+                parameter_snapshot.pop('ts')
+    assert snapshot == serial_snapshot
+
+
+def test_concurrent_snapshot_serializes_each_instrument():
+    counter = _ConcurrencyCounter()
+    instrument = DummyInstrument('instrument', gates=['one'])
+    slow = counter.parameter(instrument, 'slow')
+    also_slow = counter.parameter(instrument, 'also_slow')
+    station = Station(instrument, slow, also_slow, update_snapshot=False,
+                      snapshot_workers=3)
+
+    snapshot = station.snapshot(update=True)
+    assert counter.max_running == 1
+    assert list(snapshot['parameters']) == ['slow', 'also_slow']
+
+
+def test_concurrent_snapshot_timeout():
+    counter = _ConcurrencyCounter()
+    release = threading.Event()
+    stuck = DummyInstrument('stuck', gates=['one'])
+    counter.parameter(stuck, 'slow', release=release)
+    others = [DummyInstrument(f'other{i}', gates=['one']) for i in range(3)]
+    station = Station(stuck, *others, update_snapshot=False,
+                      snapshot_workers=2, snapshot_timeout=0.2)
+
+    try:
+        snapshot = station.snapshot(update=True)
+    finally:
+        release.set()
+
+    timing = snapshot['snapshot_timing']['components']
+    assert timing['stuck'] == {'duration': None, 'timed_out': True}
+    assert not any(timing[other.name]['timed_out'] for other in others)
+    assert snapshot['instruments']['stuck']['parameters']['slow'][
+        'value'] is None
+    for other in others:
+        assert snapshot['instruments'][other.name]['parameters']['one'][
+            'value'] == 0
+
+
 def test_station_after_instrument_is_closed():
     """
     Test that station is aware of the fact that its components could be
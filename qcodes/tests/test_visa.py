@@ -1,6 +1,8 @@
 from unittest import TestCase
 from unittest.mock import patch
+import pytest
 import visa
+import qcodes.instrument.sims as sims
 from qcodes.instrument.visa import VisaInstrument
 from qcodes.utils.validators import Numbers
 import warnings
@@ -170,3 +172,73 @@ def test_visa_instr_metadata():
     metadatadict = {'foo': 'bar'}
     mv = MockVisa('Joe', 'none_adress', metadata=metadatadict)
     assert mv.metadata == metadatadict
+
+
+class SimVisa(VisaInstrument):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ('f1', 'f2', 'f3'):
+            self.add_parameter(name, get_cmd='FREQ?', get_parser=float)
+
+
+@pytest.fixture
+def sim_visa():
+    visalib = sims.__file__.replace('__init__.py', 'dummy.yaml@sim')
+    instrument = SimVisa('sim_visa', address='GPIB::8::INSTR',
+                         visalib=visalib, terminator='\n',
+                         device_clear=False)
+    yield instrument
+    instrument.close()
+
+
+@pytest.mark.parametrize('max_pipelined_queries', (1, 2, 10))
+def test_ask_many(sim_visa, max_pipelined_queries):
+    sim_visa.max_pipelined_queries = max_pipelined_queries
+    idn = 'QCoDeS, m0d3l, 1337, 0.0.01'
+    assert sim_visa.ask_many(['FREQ?', '*IDN?', 'FREQ?']) == \
+        ['100.0', idn, '100.0']
+    # the responses are not mixed up by later queries
+    assert sim_visa.ask('*IDN?') == idn
+
+
+def test_snapshot_asks_parameters_pipelined(sim_visa):
+    batches = []
+    ask_many_raw = sim_visa.ask_many_raw
+
+    def spy(cmds):
+        batches.append(list(cmds))
+        return ask_many_raw(cmds)
+
+    sim_visa.ask_many_raw = spy
+    snapshot = sim_visa.snapshot(update=True)
+    assert batches == []
+
+    sim_visa.max_pipelined_queries = 8
+    snapshot = sim_visa.snapshot(update=True)
+    assert batches == [['FREQ?', 'FREQ?', 'FREQ?']]
+    for name in ('f1', 'f2', 'f3'):
+        assert snapshot['parameters'][name]['value'] == 100.0
+        assert sim_visa.parameters[name].get_latest() == 100.0
+
+
+class JoiningVisaHandle(MockVisaHandle):
+    def query(self, cmd):
+        return ';'.join(str(len(query)) for query in cmd.split(';'))
+
+
+@pytest.fixture
+def joining_visa():
+    instrument = MockVisa('joining_visa', 'none_adress')
+    instrument.visa_handle = JoiningVisaHandle()
+    yield instrument
+    instrument.close()
+
+
+def test_ask_many_joined(joining_visa):
+    joining_visa.max_pipelined_queries = 2
+    joining_visa.query_separator = ';'
+    assert joining_visa.ask_many(['A?', 'BB?', 'CCC?']) == ['2', '3', '4']
+
+    joining_visa.visa_handle.query = lambda cmd: '1'
+    with pytest.raises(RuntimeError, match='Expected 2 responses'):
+        joining_visa.ask_many(['A?', 'BB?'])
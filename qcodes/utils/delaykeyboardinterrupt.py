@@ -1,5 +1,6 @@
 import signal
 import logging
+import threading
 
 log = logging.getLogger(__name__)
 
@@ -11,12 +12,17 @@ class DelayedKeyboardInterrupt:
     this context. A second SIGINT will trigger the KeyboardInterrupt
     immediately.
 
+    Signals are only delivered to the main thread, so outside of the main
+    thread this context manager does nothing.
+
     Inspired by https://stackoverflow.com/questions/842557/how-to-prevent-a-block-of-code-from-being-interrupted-by-keyboardinterrupt-in-py
     """
     signal_received = None
     old_handler = None
 
     def __enter__(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
         if signal.getsignal(signal.SIGINT) is signal.default_int_handler:
             self.old_handler = signal.signal(signal.SIGINT, self.handler)
 
@@ -141,3 +141,95 @@ def diff_param_values_by_id(left_id: RunId, right_id: RunId) -> ParameterDiff:
                            f"is empty.")
 
     return diff_param_values(left_snapshot, right_snapshot)
+
+
+def _same_json(left: Any, right: Any) -> bool:
+    """
+    Whether two JSON values are the same, also in type (such that e.g. 1
+    and 1.0, which compare equal, are not the same)
+    """
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, list):
+        return len(left) == len(right) and all(
+            _same_json(left_item, right_item)
+            for left_item, right_item in zip(left, right))
+    if isinstance(left, dict):
+        return list(left) == list(right) and all(
+            _same_json(value, right[key]) for key, value in left.items())
+    return left == right
+
+
+def diff_snapshots(base: Snapshot, snapshot: Snapshot) -> Dict[str, Any]:
+    """
+    Given two snapshots (as loaded from JSON), returns the structural
+    difference between them, such that
+    ``apply_snapshot_diff(base, diff_snapshots(base, snapshot))`` is
+    ``snapshot``. The difference is a JSON-compatible dictionary, which is
+    empty if the snapshots are the same.
+
+    Nested dictionaries are compared key by key; any other value that
+    differs, including lists, is stored as a whole. The difference holds
+    the keys that are set (``'set'``), removed (``'delete'``) or whose
+    nested dictionaries differ (``'update'``), and the order of the keys
+    (``'order'``) if that can not be inferred from the base.
+    """
+    to_set = {}
+    to_update = {}
+    to_delete = [key for key in base if key not in snapshot]
+    for key, value in snapshot.items():
+        if key not in base:
+            to_set[key] = value
+            continue
+        base_value = base[key]
+        if isinstance(value, dict) and isinstance(base_value, dict):
+            nested_diff = diff_snapshots(base_value, value)
+            if nested_diff:
+                to_update[key] = nested_diff
+        elif not _same_json(base_value, value):
+            to_set[key] = value
+
+    diff: Dict[str, Any] = {}
+    if to_set:
+        diff['set'] = to_set
+    if to_update:
+        diff['update'] = to_update
+    if to_delete:
+        diff['delete'] = to_delete
+    # the keys of the base come first, followed by the new keys
+    inferred_order = [key for key in base if key in snapshot] + \
+        [key for key in snapshot if key not in base]
+    if inferred_order != list(snapshot):
+        diff['order'] = list(snapshot)
+    return diff
+
+
+def apply_snapshot_diff(base: Snapshot, diff: Dict[str, Any]) -> Snapshot:
+    """
+    Returns the snapshot that differs from the base snapshot by the given
+    difference, see :func:`diff_snapshots`. The base snapshot is not
+    modified, but the returned snapshot shares the values that did not
+    change with it.
+    """
+    if not diff:
+        return base
+    to_set = diff.get('set', {})
+    to_update = diff.get('update', {})
+    to_delete = set(diff.get('delete', ()))
+
+    snapshot = {}
+    for key, value in base.items():
+        if key in to_delete:
+            continue
+        if key in to_update:
+            snapshot[key] = apply_snapshot_diff(value, to_update[key])
+        elif key in to_set:
+            snapshot[key] = to_set[key]
+        else:
+            snapshot[key] = value
+    for key, value in to_set.items():
+        if key not in base:
+            snapshot[key] = value
+    if 'order' in diff:
+        snapshot = {key: snapshot[key] for key in diff['order']}
+    return snapshot
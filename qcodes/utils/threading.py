@@ -3,6 +3,8 @@
 # several parameters in parallel), we can parallelize them with threads.
 # That way the things we call need not be rewritten explicitly async.
 
+import asyncio
+import functools
 import threading
 
 
@@ -72,3 +74,20 @@ def thread_map(callables, args=None, kwargs=None):
         t.start()
 
     return [t.output() for t in threads]
+
+
+async def to_thread(func, *args, **kwargs):
+    """
+    Call a blocking function in a thread of the default executor of the
+    running event loop, such that the loop can go on while it runs, and
+    return its return value. This is what :func:`asyncio.to_thread` does
+    from python 3.9 on.
+
+    Args:
+        func: The callable.
+        *args: The positional arguments of the callable.
+        **kwargs: The keyword arguments of the callable.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args,
+                                                              **kwargs))